@@ -25,5 +25,11 @@ setup(
     url='http://www.konradrkludwig.com/',
     packages=['stackcite.api'],
     namespace_packages=['stackcite'],
-    install_requires=requires
+    install_requires=requires,
+    entry_points={
+        'console_scripts': [
+            'stackcite-benchmark = stackcite.api.testing.benchmark:main',
+            'stackcite-indexes = stackcite.api.indexes:main'
+        ]
+    }
 )
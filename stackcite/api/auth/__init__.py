@@ -1,6 +1,6 @@
 from stackcite.api.config import auth as _auth
 
-from .utils import gen_key, get_user
+from .utils import clear_user_cache, gen_key, get_user
 from .policies import AuthTokenAuthenticationPolicy
 
 
@@ -9,3 +9,11 @@ GROUPS = _auth.GROUPS
 USERS = _auth.USERS
 STAFF = _auth.STAFF
 ADMIN = _auth.ADMIN
+
+
+def includeme(config):
+    """
+    Adds a reified ``request.user`` (see :func:`get_user`), so each request
+    parses its ``Authorization`` header at most once.
+    """
+    config.add_request_method(get_user, 'user', reify=True)
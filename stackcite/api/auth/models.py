@@ -1,5 +1,16 @@
+from pyramid.authentication import Everyone, Authenticated
+from pyramid.decorator import reify
+
+
 class SessionUser(object):
 
     def __init__(self, id, groups):
         self.id = id
-        self.groups = groups
+        self.groups = tuple(groups)
+
+    @reify
+    def principals(self):
+        """
+        A frozen tuple of this user's effective principals, computed once.
+        """
+        return (Everyone, Authenticated, str(self.id)) + self.groups
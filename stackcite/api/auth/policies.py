@@ -3,13 +3,16 @@ from zope.interface import implementer
 from pyramid.interfaces import IAuthenticationPolicy
 from pyramid.authentication import (
     CallbackAuthenticationPolicy,
-    Everyone,
-    Authenticated
+    Everyone
 )
 
 from . import utils
 
 
+# The effective principals of an unauthenticated request:
+_ANONYMOUS_PRINCIPALS = (Everyone,)
+
+
 @implementer(IAuthenticationPolicy)
 class AuthTokenAuthenticationPolicy(CallbackAuthenticationPolicy):
     """
@@ -32,12 +35,11 @@ class AuthTokenAuthenticationPolicy(CallbackAuthenticationPolicy):
 
     def effective_principals(self, request):
         """
-        Resolves the effective principles of a :class:`stackcite.User`.
+        Resolves the effective principles of a :class:`stackcite.User`. The
+        principals of an authenticated user are computed once and shared by
+        every permission check.
         """
-        principals = [Everyone]
         user = request.user
-        if user is not None:
-            principals.append(Authenticated)
-            principals.append(str(user.id))
-            principals.extend(user.groups)
-        return principals
+        if user is None:
+            return _ANONYMOUS_PRINCIPALS
+        return user.principals
@@ -82,3 +82,14 @@ class AuthPolicyIntegrationTestCase(unittest.TestCase):
         result = self.auth_pol.effective_principals(request)
         for expected in self.user.groups:
             self.assertIn(expected, result)
+
+    def test_effective_principals_are_computed_once_per_user(self):
+        """AuthTokenAuthenticationPolicy.effective_principals() returns the same principals for every check
+        """
+        from pyramid.testing import DummyRequest
+        request = DummyRequest()
+        request.user = self.user
+        expected = self.auth_pol.effective_principals(request)
+        result = self.auth_pol.effective_principals(request)
+        self.assertIs(expected, result)
+        self.assertIsInstance(result, tuple)
@@ -40,7 +40,7 @@ class GetUserTests(unittest.TestCase):
         from bson import ObjectId
         import json
         from stackcite.api import auth
-        expected = auth.GROUPS
+        expected = tuple(auth.GROUPS)
         data = {'id': str(ObjectId()), 'groups': auth.GROUPS}
         self.request.authorization = ('user', json.dumps(data))
         from .. import utils
@@ -76,3 +76,62 @@ class GetUserTests(unittest.TestCase):
         from .. import utils
         result = utils.get_user(self.request)
         self.assertEqual(None, result)
+
+    def test_missing_authorization_header_returns_none(self):
+        """get_user() returns None if there is no authorization header
+        """
+        from .. import utils
+        self.request.authorization = None
+        result = utils.get_user(self.request)
+        self.assertEqual(None, result)
+
+    def test_caches_users_by_header_value(self):
+        """get_user() parses each header value once
+        """
+        from bson import ObjectId
+        import json
+        from unittest.mock import patch
+        from stackcite.api import auth
+        from .. import utils
+        utils.clear_user_cache()
+        data = {'id': str(ObjectId()), 'groups': auth.GROUPS}
+        self.request.authorization = ('user', json.dumps(data))
+        with patch.object(utils.renderers, 'loads', wraps=json.loads) as loads:
+            expected = utils.get_user(self.request)
+            from pyramid.testing import DummyRequest
+            request = DummyRequest()
+            request.authorization = ('User', json.dumps(data))
+            result = utils.get_user(request)
+        self.assertEqual(1, loads.call_count)
+        self.assertEqual(expected.id, result.id)
+        self.assertEqual(expected.groups, result.groups)
+
+    def test_does_not_share_users_between_requests(self):
+        """get_user() returns a new SessionUser with immutable groups for each call
+        """
+        from bson import ObjectId
+        import json
+        from stackcite.api import auth
+        from .. import utils
+        data = {'id': str(ObjectId()), 'groups': auth.GROUPS}
+        self.request.authorization = ('user', json.dumps(data))
+        expected = utils.get_user(self.request)
+        result = utils.get_user(self.request)
+        self.assertIsNot(expected, result)
+        self.assertIsInstance(result.groups, tuple)
+
+    def test_clear_user_cache_parses_headers_again(self):
+        """clear_user_cache() discards cached users
+        """
+        from bson import ObjectId
+        import json
+        from unittest.mock import patch
+        from stackcite.api import auth
+        from .. import utils
+        data = {'id': str(ObjectId()), 'groups': auth.GROUPS}
+        self.request.authorization = ('user', json.dumps(data))
+        utils.get_user(self.request)
+        utils.clear_user_cache()
+        with patch.object(utils.renderers, 'loads', wraps=json.loads) as loads:
+            utils.get_user(self.request)
+        self.assertEqual(1, loads.call_count)
@@ -1,13 +1,18 @@
 import os
+import functools
 import hashlib
-import json
 
+from stackcite.api import renderers
 from stackcite.api.validators.oids import validate_objectid
-from stackcite.api.validators.groups import validate_group
+from stackcite.api.validators.groups import validate_group_many
 
 from . import models
 
 
+# The maximum number of parsed users cached by header value:
+_USER_CACHE_SIZE = 1024
+
+
 def gen_key():
     """
     Generates a cryptographic key used for API Tokens and account confirmation.
@@ -18,15 +23,41 @@ def gen_key():
 def get_user(request):
     """
     Returns a user based on an API key located in the request header.
+
+    Parsed users are cached by header value, so each distinct token is only
+    parsed and validated once, but every call returns a new
+    :class:`.SessionUser`. Register this function as a reified request method
+    (see :func:`stackcite.api.auth.includeme`) to resolve it once per request.
+    """
+    if request.authorization:
+        auth_type, auth_data = request.authorization
+        if auth_type.lower() == 'user':
+            user = _load_user(auth_data)
+            if user is not None:
+                return models.SessionUser(*user)
+
+
+@functools.lru_cache(maxsize=_USER_CACHE_SIZE)
+def _load_user(auth_data):
+    """
+    Parses and validates the ``Authorization`` data of a ``user`` header.
+    Returns an immutable ``(id, groups)`` tuple or ``None`` if validation
+    fails.
     """
+    auth_data = renderers.loads(auth_data)
+    valid_id = validate_objectid(auth_data['id'])
+    valid_groups = all(validate_group_many(auth_data['groups']))
+    if valid_id and valid_groups:
+        return auth_data['id'], tuple(auth_data['groups'])
+
 
-    auth_type, auth_data = request.authorization
-    if auth_type.lower() == 'user':
-        auth_data = json.loads(auth_data)
-        valid_id = validate_objectid(auth_data['id'])
-        valid_groups = [g for g in auth_data['groups'] if validate_group(g)] == auth_data['groups']
-        if valid_id and valid_groups:
-            return models.SessionUser(**auth_data)
+def clear_user_cache():
+    """
+    Discards every cached user. Call this function whenever tokens are
+    revoked (e.g. on logout) or the groups of a user change, so that cached
+    headers are validated again.
+    """
+    _load_user.cache_clear()
 
 
 def get_groups(user_id, request):
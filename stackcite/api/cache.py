@@ -0,0 +1,112 @@
+"""
+Response caching for API resources. Cached responses are keyed on a
+resource's lineage, the normalized request query, the requesting principals
+and a per-collection generation counter. Writes increment the counter, so
+stale entries are never read again and simply age out of the cache.
+"""
+
+import collections
+import hashlib
+import json
+import threading
+import time
+
+
+def make_key(namespace, generation, lineage, query, principals):
+    """
+    Builds a response cache key. Queries are normalized so that the order of
+    query parameters does not matter.
+
+    :param namespace: The namespace of a collection (e.g. its name)
+    :param generation: The namespace's current generation
+    :param lineage: The lineage of a resource (see :class:`.IndexResource`)
+    :param query: A dictionary (or multi-dictionary) of query parameters
+    :param principals: The effective principals of the request
+    :return str: A cache key
+    """
+    items = query.items() if query else ()
+    data = [
+        list(lineage),
+        sorted([str(k), str(v)] for k, v in items),
+        sorted(str(p) for p in principals or ())]
+    digest = hashlib.sha1(json.dumps(data).encode()).hexdigest()
+    return '{}:{}:{}'.format(namespace, generation, digest)
+
+
+class ICacheBackend(object):
+    """
+    A common interface for response cache backends. Backends store values by
+    key for a limited time and keep a generation counter per namespace.
+    """
+
+    def get(self, key):
+        """
+        Returns a cached value or ``None`` if there is no live entry.
+        """
+        raise NotImplementedError()
+
+    def set(self, key, value, ttl=None):
+        """
+        Caches a value for ``ttl`` seconds (or the backend's default).
+        """
+        raise NotImplementedError()
+
+    def generation(self, namespace):
+        """
+        Returns the current generation of a namespace (``0`` by default).
+        """
+        raise NotImplementedError()
+
+    def incr(self, namespace):
+        """
+        Increments the generation of a namespace, invalidating every entry
+        keyed on an earlier generation.
+        """
+        raise NotImplementedError()
+
+
+class MemoryCache(ICacheBackend):
+    """
+    An in-process, thread-safe LRU cache with per-entry expiry.
+
+    :param maxsize: The maximum number of cached entries
+    :param ttl: The default number of seconds entries remain valid
+    """
+
+    def __init__(self, maxsize=1024, ttl=60):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries = collections.OrderedDict()
+        self._generations = {}
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires, value = entry
+            if expires <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value, ttl=None):
+        expires = time.monotonic() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            self._entries[key] = (expires, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def generation(self, namespace):
+        return self._generations.get(namespace, 0)
+
+    def incr(self, namespace):
+        with self._lock:
+            self._generations[namespace] = self.generation(namespace) + 1
+            return self._generations[namespace]
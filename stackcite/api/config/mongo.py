@@ -0,0 +1,135 @@
+"""
+Settings-driven MongoDB connections. Applications can either include this
+module (``config.include('stackcite.api.config.mongo')``) or call
+:func:`connect` with their settings. Recognized settings include:
+
+    * ``mongo.db``: The database name
+    * ``mongo.host``: A host name or ``mongodb://`` URI
+    * ``mongo.max_pool_size`` and ``mongo.min_pool_size``
+    * ``mongo.max_idle_time_ms`` and ``mongo.wait_queue_timeout_ms``
+    * ``mongo.connect_timeout_ms``, ``mongo.socket_timeout_ms`` and
+      ``mongo.server_selection_timeout_ms``
+    * ``mongo.compressors``: e.g. ``zstd,snappy,zlib``
+    * ``mongo.read_preference``: e.g. ``secondaryPreferred``
+    * ``mongo.read_concern``: e.g. ``majority``
+
+Including this module also validates the ``_READ_PREFERENCE`` of every
+collection resource class once the application is created (see
+:func:`validate_read_preferences`), so that invalid modes fail at startup
+rather than on the first request.
+"""
+
+import mongoengine
+
+from pymongo import ReadPreference
+from pyramid.events import ApplicationCreated
+
+
+# The prefix of MongoDB settings:
+PREFIX = 'mongo.'
+
+# Read preferences by mode name:
+READ_PREFERENCES = {
+    'primary': ReadPreference.PRIMARY,
+    'primaryPreferred': ReadPreference.PRIMARY_PREFERRED,
+    'secondary': ReadPreference.SECONDARY,
+    'secondaryPreferred': ReadPreference.SECONDARY_PREFERRED,
+    'nearest': ReadPreference.NEAREST
+}
+
+
+def read_preference(value):
+    """
+    Resolves a read preference mode name (e.g. ``'secondaryPreferred'``) into
+    a ``pymongo`` read preference. Other values are returned as they are.
+    Raises :class:`ValueError` if the mode name is unknown.
+    """
+    if not isinstance(value, str):
+        return value
+    try:
+        return READ_PREFERENCES[value]
+    except KeyError:
+        raise ValueError('Invalid read preference: {}'.format(value))
+
+
+def read_concern(value):
+    """
+    Resolves a read concern level (e.g. ``'majority'``) into a read concern
+    dictionary. Other values are returned as they are.
+    """
+    if isinstance(value, str):
+        return {'level': value}
+    return value
+
+
+# Settings mapped to ``pymongo.MongoClient`` options and their converters:
+_OPTIONS = {
+    'max_pool_size': ('maxPoolSize', int),
+    'min_pool_size': ('minPoolSize', int),
+    'max_idle_time_ms': ('maxIdleTimeMS', int),
+    'wait_queue_timeout_ms': ('waitQueueTimeoutMS', int),
+    'connect_timeout_ms': ('connectTimeoutMS', int),
+    'socket_timeout_ms': ('socketTimeoutMS', int),
+    'server_selection_timeout_ms': ('serverSelectionTimeoutMS', int),
+    'compressors': ('compressors', str),
+    'read_preference': ('read_preference', read_preference),
+    'read_concern': ('readConcernLevel', str)
+}
+
+
+def connection_options(settings):
+    """
+    Converts application settings into keyword arguments for
+    :func:`mongoengine.connect`. Settings without the ``mongo.`` prefix are
+    ignored.
+
+    :param settings: A dictionary of application settings
+    :return dict: Keyword arguments for :func:`mongoengine.connect`
+    """
+    options = {}
+    for key in ('db', 'host'):
+        if PREFIX + key in settings:
+            options[key] = settings[PREFIX + key]
+    for key, (option, convert) in _OPTIONS.items():
+        value = settings.get(PREFIX + key)
+        if value not in (None, ''):
+            options[option] = convert(value)
+    return options
+
+
+def connect(settings, **kwargs):
+    """
+    Connects ``mongoengine`` to MongoDB using application settings. Keyword
+    arguments override settings.
+
+    :param settings: A dictionary of application settings
+    :return: A :class:`pymongo.MongoClient`
+    """
+    options = connection_options(settings)
+    options.update(kwargs)
+    return mongoengine.connect(**options)
+
+
+def validate_read_preferences():
+    """
+    Resolves the ``_READ_PREFERENCE`` of every imported collection resource
+    class. Raises :class:`ValueError` if any mode name is unknown.
+    """
+    from stackcite.api.resources import mongo as mongo_resources
+    stack = [mongo_resources.CollectionResource]
+    while stack:
+        cls = stack.pop()
+        stack.extend(cls.__subclasses__())
+        try:
+            read_preference(cls._READ_PREFERENCE)
+        except ValueError as err:
+            raise ValueError('{}: {}'.format(cls.__name__, err))
+
+
+def includeme(config):
+    connect(config.get_settings())
+
+    def check_read_preferences(event):
+        validate_read_preferences()
+
+    config.add_subscriber(check_read_preferences, ApplicationCreated)
@@ -0,0 +1,105 @@
+import unittest
+
+from stackcite.api import testing
+
+
+class ConnectionOptionsTests(unittest.TestCase):
+
+    layer = testing.layers.UnitTestLayer
+
+    def test_converts_prefixed_settings(self):
+        """connection_options() converts prefixed settings into client options
+        """
+        settings = {
+            'mongo.db': 'stackcite',
+            'mongo.host': 'mongodb://db.example.com/',
+            'mongo.max_pool_size': '50',
+            'mongo.server_selection_timeout_ms': '2000',
+            'mongo.compressors': 'zstd,zlib',
+            'mongo.read_concern': 'majority'}
+        from ..mongo import connection_options
+        expected = {
+            'db': 'stackcite',
+            'host': 'mongodb://db.example.com/',
+            'maxPoolSize': 50,
+            'serverSelectionTimeoutMS': 2000,
+            'compressors': 'zstd,zlib',
+            'readConcernLevel': 'majority'}
+        result = connection_options(settings)
+        self.assertEqual(expected, result)
+
+    def test_resolves_read_preference(self):
+        """connection_options() resolves the read preference by mode name
+        """
+        from pymongo import ReadPreference
+        from ..mongo import connection_options
+        settings = {'mongo.read_preference': 'secondaryPreferred'}
+        result = connection_options(settings)['read_preference']
+        self.assertEqual(ReadPreference.SECONDARY_PREFERRED, result)
+
+    def test_ignores_unprefixed_and_empty_settings(self):
+        """connection_options() ignores unprefixed and empty settings
+        """
+        settings = {'max_pool_size': '50', 'mongo.min_pool_size': ''}
+        from ..mongo import connection_options
+        result = connection_options(settings)
+        self.assertEqual({}, result)
+
+    def test_invalid_number_raises_exception(self):
+        """connection_options() raises ValueError for an invalid number
+        """
+        settings = {'mongo.max_pool_size': 'many'}
+        from ..mongo import connection_options
+        with self.assertRaises(ValueError):
+            connection_options(settings)
+
+
+class ReadPreferenceTests(unittest.TestCase):
+
+    layer = testing.layers.UnitTestLayer
+
+    def test_resolves_mode_names(self):
+        """read_preference() resolves every mode name
+        """
+        from ..mongo import read_preference, READ_PREFERENCES
+        for name, expected in READ_PREFERENCES.items():
+            self.assertEqual(expected, read_preference(name))
+
+    def test_returns_other_values(self):
+        """read_preference() returns read preference instances and None as they are
+        """
+        from pymongo import ReadPreference
+        from ..mongo import read_preference
+        self.assertIs(ReadPreference.NEAREST,
+                      read_preference(ReadPreference.NEAREST))
+        self.assertIsNone(read_preference(None))
+
+    def test_invalid_mode_name_raises_exception(self):
+        """read_preference() raises ValueError for an unknown mode name
+        """
+        from ..mongo import read_preference
+        with self.assertRaises(ValueError):
+            read_preference('fastest')
+
+    def test_validate_read_preferences_accepts_valid_modes(self):
+        """validate_read_preferences() accepts the read preferences of collection resources
+        """
+        from ..mongo import validate_read_preferences
+        validate_read_preferences()
+
+    def test_validate_read_preferences_rejects_invalid_modes(self):
+        """validate_read_preferences() raises ValueError for a collection resource with an unknown mode name
+        """
+        from ..mongo import validate_read_preferences
+        resource_class = testing.mock.MockCollectionResource
+        self.addCleanup(delattr, resource_class, '_READ_PREFERENCE')
+        resource_class._READ_PREFERENCE = 'fastest'
+        with self.assertRaises(ValueError) as cm:
+            validate_read_preferences()
+        self.assertIn('MockCollectionResource', str(cm.exception))
+
+    def test_read_concern_converts_level(self):
+        """read_concern() converts a level into a read concern dictionary
+        """
+        from ..mongo import read_concern
+        self.assertEqual({'level': 'majority'}, read_concern('majority'))
@@ -1,6 +1,7 @@
 from .base import StackciteError
 from .api import (
     APINoContent,
+    APINotModified,
     APIBadRequest,
     APIDecodingError,
     APIValidationError,
@@ -9,5 +10,6 @@ from .api import (
     APINotFound,
     APIConflict,
     APINotUniqueError,
+    APIPreconditionFailed,
     APIInternalServerError
 )
\ No newline at end of file
@@ -21,6 +21,16 @@ class APINoContent(httpexceptions.HTTPNoContent):
     """
 
 
+class APINotModified(httpexceptions.HTTPNotModified):
+    """
+    Subclass of :class:`~HTTPNotModified` used to raise HTTP exceptions within
+    the API instead of forwarding the user to a front-end styled exception
+    page.
+
+    code: 304, title: Not Modified
+    """
+
+
 class APIBadRequest(httpexceptions.HTTPBadRequest):
     """
     Subclass of :class:`~HTTPBadRequest` used to raise HTTP exceptions within
@@ -97,6 +107,16 @@ class APINotUniqueError(APIConflict):
                   'contains insufficiently unique models.'
 
 
+class APIPreconditionFailed(httpexceptions.HTTPPreconditionFailed):
+    """
+    Subclass of :class:`~HTTPPreconditionFailed` used to raise HTTP exceptions
+    within the API instead of forwarding the user to a front-end styled
+    exception page.
+
+    code: 412, title: Precondition Failed
+    """
+
+
 class APIInternalServerError(httpexceptions.HTTPInternalServerError):
     """
     Subclass of :class:`~HTTPInternalServerError` used to raise HTTP exceptions
@@ -0,0 +1,304 @@
+"""
+Index management and query plan verification for collection resources.
+
+Collection resources accept filters on their schema fields and sorting by
+their sort keys (see :meth:`.CollectionResource.sort_spec`), which MongoDB
+can only serve efficiently from indexes. :func:`ensure_indexes` creates the
+indexes declared in a collection's ``meta`` and compound indexes backing each
+sort key (i.e. the sort key followed by ``_id``). :func:`verify` explains
+representative queries (an ``$exists`` filter on every filterable field and
+every single-key sort) and reports those whose winning plan scans the
+collection (``COLLSCAN``). Fields listed in a resource's
+``_UNINDEXED_OPERATORS`` are allowed to scan and are not verified.
+
+Indexes are created with the ``stackcite-indexes`` command (e.g. as a
+deployment step), which also verifies query plans. Applications can include
+this module (``config.include('stackcite.api.indexes')``) to verify
+collection resources once the application is created. Recognized settings
+include:
+
+    * ``indexes.root``: The dotted name of a root :class:`.IndexResource`
+      whose traversal tree holds the checked resources (defaults to every
+      imported collection resource class)
+    * ``indexes.verify``: ``warn`` (default) logs collection scans, ``fail``
+      raises :class:`CollectionScanError` and ``off`` skips verification
+    * ``indexes.ensure``: Also creates missing indexes at startup (``false``
+      by default). Building indexes can block startup and every worker
+      process would attempt it, so prefer the ``stackcite-indexes`` command.
+"""
+
+import argparse
+import importlib
+import logging
+import sys
+
+from mongoengine.errors import LookUpError
+from pyramid.events import ApplicationCreated
+from pyramid.path import DottedNameResolver
+from pyramid.settings import asbool
+
+from stackcite.api.config import mongo as mongo_config
+from stackcite.api.resources import api, mongo
+
+
+logger = logging.getLogger(__name__)
+
+# Verification modes:
+VERIFY_OFF = 'off'
+VERIFY_WARN = 'warn'
+VERIFY_FAIL = 'fail'
+VERIFY_MODES = (VERIFY_OFF, VERIFY_WARN, VERIFY_FAIL)
+
+
+class CollectionScanError(Exception):
+    """
+    Raised if representative queries of collection resources scan their
+    collections.
+    """
+
+
+def collection_resources(root=None):
+    """
+    Returns the collection resources found in the traversal tree of ``root``,
+    or an instance of every imported collection resource class with a
+    collection if ``root`` is ``None``.
+
+    :param root: A root :class:`.IndexResource` (or ``None``)
+    :return list: A list of :class:`.CollectionResource` instances
+    """
+    resources = []
+    if root is not None:
+        stack = [root]
+        while stack:
+            node = stack.pop()
+            if isinstance(node, mongo.CollectionResource):
+                resources.append(node)
+            stack.extend(reversed(list(node._items.values())))
+        return resources
+    seen, stack = set(), [mongo.CollectionResource]
+    while stack:
+        cls = stack.pop(0)
+        if cls in seen:
+            continue
+        seen.add(cls)
+        stack.extend(cls.__subclasses__())
+        if cls._COLLECTION is not NotImplemented:
+            resources.append(cls(None, None))
+    return resources
+
+
+def _sort_paths(resource):
+    """
+    Returns the raw paths of the fields a resource may sort results by
+    (excluding ``_id``).
+    """
+    collection = resource.collection
+    if resource.sort_keys is None:
+        return sorted(mongo._indexed_paths(collection) - {'_id'})
+    return [mongo._db_path(collection, name)
+            for name in resource.sort_keys if name != 'id']
+
+
+def _filter_paths(resource):
+    """
+    Returns the raw paths of the document fields a resource may filter
+    results by (i.e. its schema's document fields), excluding fields that are
+    allowed to scan the collection.
+    """
+    if not isinstance(resource, api.SerializableResource):
+        return []
+    allowed = set(getattr(resource, 'unindexed_operators', ()))
+    paths = []
+    for name, field in resource.schema().fields.items():
+        if field.load_only or field.dump_only or name in allowed:
+            continue
+        try:
+            paths.append(mongo._db_path(resource.collection, name))
+        except LookUpError:
+            continue
+    return paths
+
+
+def required_indexes(resource):
+    """
+    Returns the keys of the indexes backing a resource's sort keys that are
+    not declared in its collection's ``meta``. Each sort key requires an index
+    on the sort key followed by ``_id``, which serves both sort directions.
+    Sorting by several keys at once is not covered.
+
+    :param resource: A :class:`.CollectionResource`
+    :return list: Index keys as lists of (``path``, ``direction``) tuples
+    """
+    declared = [
+        [tuple(key) for key in spec['fields']]
+        for spec in resource.collection._meta.get('index_specs') or ()]
+    keys = []
+    for path in _sort_paths(resource):
+        key = [(path, 1), ('_id', 1)]
+        reverse = [(path, -1), ('_id', -1)]
+        if not any(spec[:2] in (key, reverse) for spec in declared):
+            keys.append(key)
+    return keys
+
+
+def ensure_indexes(resource):
+    """
+    Creates the indexes declared in a resource's collection ``meta`` and its
+    required indexes (see :func:`required_indexes`). Existing indexes are
+    left as they are.
+
+    :param resource: A :class:`.CollectionResource`
+    :return list: The names of the required indexes
+    """
+    resource.collection.ensure_indexes()
+    collection = resource.collection._get_collection()
+    return [collection.create_index(key)
+            for key in required_indexes(resource)]
+
+
+def representative_queries(resource):
+    """
+    Returns representative queries of a resource: an ``$exists`` filter on
+    every filterable field and an unfiltered query sorted by each sort key
+    (then ``_id``).
+
+    :param resource: A :class:`.CollectionResource`
+    :return list: Three-tuples in the form of (``description``, ``query``,
+        ``sort``)
+    """
+    queries = [
+        ('filter on {!r}'.format(path), {path: {'$exists': True}}, None)
+        for path in _filter_paths(resource)]
+    queries.extend(
+        ('sort by {!r}'.format(path), {}, [(path, 1), ('_id', 1)])
+        for path in _sort_paths(resource))
+    return queries
+
+
+def explain(resource, query, sort=None):
+    """
+    Returns MongoDB's query plan of a raw query.
+
+    :param resource: A :class:`.CollectionResource`
+    :param query: A raw dictionary-styled ``pymongo`` query
+    :param sort: A list of (``path``, ``direction``) tuples
+    :return dict: The output of :meth:`pymongo.cursor.Cursor.explain`
+    """
+    cursor = resource.collection._get_collection().find(query)
+    if sort:
+        cursor = cursor.sort(sort)
+    return cursor.explain()
+
+
+def _has_stage(plan, stage):
+    if isinstance(plan, dict):
+        return plan.get('stage') == stage or \
+            any(_has_stage(value, stage) for value in plan.values())
+    if isinstance(plan, list):
+        return any(_has_stage(value, stage) for value in plan)
+    return False
+
+
+def scans_collection(plan):
+    """
+    Checks whether any stage of the winning plan of :func:`explain` output
+    (including the plans of individual shards) is a collection scan.
+    """
+    planner = plan.get('queryPlanner', {})
+    return _has_stage(planner.get('winningPlan', {}), 'COLLSCAN')
+
+
+def verify(resource):
+    """
+    Explains the representative queries of a resource (see
+    :func:`representative_queries`).
+
+    :param resource: A :class:`.CollectionResource`
+    :return list: Descriptions of the queries that scan the collection
+    """
+    name = resource.collection.__name__
+    return ['{}: {} scans the collection (COLLSCAN)'.format(name, description)
+            for description, query, sort in representative_queries(resource)
+            if scans_collection(explain(resource, query, sort))]
+
+
+def check(resources, ensure=False, mode=VERIFY_WARN):
+    """
+    Ensures and verifies the indexes of collection resources. Logs a warning
+    for every query that scans a collection and raises
+    :class:`CollectionScanError` if there are any and ``mode`` is ``'fail'``.
+    Raises :class:`ValueError` if ``mode`` is unknown.
+
+    :param resources: A list of :class:`.CollectionResource` instances
+    :param ensure: Creates missing indexes if ``True`` (default ``False``)
+    :param mode: A verification mode (default ``'warn'``)
+    :return list: Descriptions of the queries that scan their collection
+    """
+    if mode not in VERIFY_MODES:
+        raise ValueError('Invalid verification mode: {}'.format(mode))
+    problems = []
+    for resource in resources:
+        if ensure:
+            ensure_indexes(resource)
+        if mode != VERIFY_OFF:
+            problems.extend(verify(resource))
+    for problem in problems:
+        logger.warning(problem)
+    if problems and mode == VERIFY_FAIL:
+        raise CollectionScanError('\n'.join(problems))
+    return problems
+
+
+def _resolve_root(value):
+    value = DottedNameResolver().maybe_resolve(value) if value else None
+    return value() if isinstance(value, type) else value
+
+
+def includeme(config):
+    settings = config.get_settings()
+    root = settings.get('indexes.root')
+    ensure = asbool(settings.get('indexes.ensure', False))
+    mode = settings.get('indexes.verify', VERIFY_WARN)
+
+    def check_indexes(event):
+        check(collection_resources(_resolve_root(root)), ensure, mode)
+
+    config.add_subscriber(check_indexes, ApplicationCreated)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        prog='stackcite-indexes',
+        description='Creates the indexes of Stackcite API collection '
+                    'resources and verifies their query plans.')
+    parser.add_argument('--host', help='A MongoDB host name or URI')
+    parser.add_argument('--db', required=True)
+    parser.add_argument(
+        '--root', help='The dotted name of a root resource (defaults to '
+                       'every imported collection resource)')
+    parser.add_argument(
+        '--import', dest='modules', action='append', default=[],
+        help='Imports a module defining collection resources')
+    parser.add_argument(
+        '--no-ensure', dest='ensure', action='store_false',
+        help='Verifies query plans without creating indexes')
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    settings = {'mongo.db': args.db}
+    if args.host:
+        settings['mongo.host'] = args.host
+    mongo_config.connect(settings)
+    for module in args.modules:
+        importlib.import_module(module)
+    resources = collection_resources(_resolve_root(args.root))
+    problems = check(resources, args.ensure, VERIFY_WARN)
+    for problem in problems:
+        print(problem)
+    return 1 if problems else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,3 +1,3 @@
-from .mongo import IDocument
+from .mongo import IDocument, IEmbeddedDocument
 
 from . import validators
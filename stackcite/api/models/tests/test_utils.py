@@ -1,10 +1,77 @@
 import unittest
 
+import mongoengine
+
 from stackcite.api import testing
 
+from .. import mongo
+
+
+class _MockName(mongo.IEmbeddedDocument):
+
+    first = mongoengine.StringField()
+    last = mongoengine.StringField()
+
+
+class _MockPerson(mongo.IDocument):
+
+    name = mongoengine.EmbeddedDocumentField(_MockName)
+    tags = mongoengine.ListField(mongoengine.StringField())
+    age = mongoengine.IntField()
+
 
 class IDeserializableTests(unittest.TestCase):
 
     layer = testing.layers.UnitTestLayer
 
-    pass
+    def test_deserialize_assigns_scalar_fields(self):
+        """IDeserializable.deserialize() assigns scalar fields
+        """
+        person = _MockPerson()
+        person.deserialize({'age': 42, 'tags': ['author']})
+        self.assertEqual(42, person.age)
+        self.assertEqual(['author'], person.tags)
+
+    def test_deserialize_updates_embedded_documents(self):
+        """IDeserializable.deserialize() updates existing embedded documents in place
+        """
+        person = _MockPerson(name=_MockName(first='Nancy', last='Drew'))
+        expected = person.name
+        person.deserialize({'name': {'first': 'Ned'}})
+        self.assertIs(expected, person.name)
+        self.assertEqual('Ned', person.name.first)
+        self.assertEqual('Drew', person.name.last)
+
+    def test_deserialize_assigns_embedded_document_instances(self):
+        """IDeserializable.deserialize() assigns embedded document instances directly
+        """
+        person = _MockPerson(name=_MockName(first='Nancy'))
+        expected = _MockName(first='Ned')
+        person.deserialize({'name': expected})
+        self.assertIs(expected, person.name)
+
+    def test_deserialize_does_not_swallow_attribute_errors(self):
+        """IDeserializable.deserialize() raises AttributeErrors from setting attributes
+        """
+        class ReadOnly(mongo.IDocument):
+            @property
+            def locked(self):
+                return True
+
+        with self.assertRaises(AttributeError):
+            ReadOnly().deserialize({'locked': False})
+
+    def test_deserialize_recurses_into_plain_objects(self):
+        """IDeserializable.deserialize() recurses into deserializable attributes of plain objects
+        """
+        from ..utils import IDeserializable
+
+        class Node(IDeserializable):
+            def __init__(self, child=None):
+                self.child = child
+                self.value = None
+
+        node = Node(Node())
+        node.deserialize({'value': 1, 'child': {'value': 2}})
+        self.assertEqual(1, node.value)
+        self.assertEqual(2, node.child.value)
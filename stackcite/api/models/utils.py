@@ -1,3 +1,7 @@
+import functools
+import mongoengine
+
+
 class IDeserializable(object):
     """
     Provides a simple interface for deserializing data through an object's
@@ -10,8 +14,45 @@ class IDeserializable(object):
 
         :param data: A dictionary of values.
         """
+        _compile_deserializer(type(self))(self, data)
+
+
+@functools.lru_cache(maxsize=None)
+def _compile_deserializer(cls):
+    """
+    Builds a deserializer for instances of ``cls``. For documents, keys of
+    embedded :class:`IDeserializable` documents are read from the field map
+    once, so every other key is assigned directly. Other classes check each
+    attribute for a ``deserialize()`` method instead.
+
+    :param cls: An :class:`IDeserializable` class
+    :return: A function that deserializes a dictionary onto an instance
+    """
+    fields = getattr(cls, '_fields', None)
+    if fields is None:
+        return _deserialize_attributes
+
+    embedded = frozenset(
+        name for name, field in fields.items()
+        if isinstance(field, mongoengine.EmbeddedDocumentField) and
+        issubclass(field.document_type, IDeserializable))
+
+    def deserialize(obj, data):
         for key, value in data.items():
-            try:
-                getattr(self, key).deserialize(value)
-            except AttributeError:
-                setattr(self, key, value)
+            if key in embedded and isinstance(value, dict):
+                child = getattr(obj, key)
+                if child is not None:
+                    child.deserialize(value)
+                    continue
+            setattr(obj, key, value)
+
+    return deserialize
+
+
+def _deserialize_attributes(obj, data):
+    for key, value in data.items():
+        child = getattr(obj, key, None)
+        if isinstance(child, IDeserializable) and isinstance(value, dict):
+            child.deserialize(value)
+        else:
+            setattr(obj, key, value)
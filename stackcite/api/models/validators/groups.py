@@ -6,7 +6,7 @@ from . import exceptions
 class GroupValidator(object):
     """
     A `mongoengine` style group validator. Raises :class:`.ValidationError`
-    if the group provided is invalid.
+    if the group (or any group in the list) provided is invalid.
     """
     def __init__(self, msg=None):
         if msg is None:
@@ -15,5 +15,10 @@ class GroupValidator(object):
             self.msg = msg
 
     def __call__(self, group):
-        if not (isinstance(group, str) and validators.validate_group(group)):
+        if isinstance(group, (list, tuple)):
+            mask = validators.validate_group_many(group)
+            invalid = [str(v) for v, ok in zip(group, mask) if not ok]
+            if invalid:
+                raise exceptions.ValidationError(self.msg.format(', '.join(invalid)))
+        elif not (isinstance(group, str) and validators.validate_group(group)):
             raise exceptions.ValidationError(self.msg.format(group))
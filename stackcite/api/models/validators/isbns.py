@@ -6,8 +6,8 @@ from stackcite.api import validators
 class ISBNValidator(object):
     """
     A `mongoengine` style ISBN validator. Raises :class:`.ValidationError` if
-    the ISBN provided is invalid. Automatically detects the difference between
-    ISBN-10 and ISBN-13 formatted strings.
+    the ISBN (or any ISBN in the list) provided is invalid. Automatically
+    detects the difference between ISBN-10 and ISBN-13 formatted strings.
     """
     def __init__(self, msg=None):
         if msg is None:
@@ -16,5 +16,10 @@ class ISBNValidator(object):
             self.msg = msg
 
     def __call__(self, isbn):
-        if not (isinstance(isbn, str) and validators.validate_isbn(isbn)):
+        if isinstance(isbn, (list, tuple)):
+            mask = validators.validate_isbn_many(isbn)
+            invalid = [str(v) for v, ok in zip(isbn, mask) if not ok]
+            if invalid:
+                raise ValidationError(self.msg.format(', '.join(invalid)))
+        elif not (isinstance(isbn, str) and validators.validate_isbn(isbn)):
             raise ValidationError(self.msg.format(isbn))
@@ -6,7 +6,7 @@ from . import exceptions
 class KeyValidator(object):
     """
     A `mongoengine` style key validator. Raises :class:`.ValidationError`
-    if the key provided is invalid.
+    if the key (or any key in the list) provided is invalid.
     """
     def __init__(self, msg=None):
         if msg is None:
@@ -15,5 +15,10 @@ class KeyValidator(object):
             self.msg = msg
 
     def __call__(self, key):
-        if not (isinstance(key, str) and validators.validate_key(key)):
+        if isinstance(key, (list, tuple)):
+            mask = validators.validate_key_many(key)
+            invalid = [str(v) for v, ok in zip(key, mask) if not ok]
+            if invalid:
+                raise exceptions.ValidationError(self.msg.format(', '.join(invalid)))
+        elif not (isinstance(key, str) and validators.validate_key(key)):
             raise exceptions.ValidationError(self.msg.format(key))
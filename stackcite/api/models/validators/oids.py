@@ -17,5 +17,10 @@ class ObjectIdValidator(object):
             self.msg = msg
 
     def __call__(self, object_id):
-        if not (isinstance(object_id, str) and validators.validate_objectid(object_id)):
+        if isinstance(object_id, (list, tuple)):
+            mask = validators.validate_objectid_many(object_id)
+            invalid = [str(v) for v, ok in zip(object_id, mask) if not ok]
+            if invalid:
+                raise exceptions.ValidationError(self.msg.format(', '.join(invalid)))
+        elif not (isinstance(object_id, str) and validators.validate_objectid(object_id)):
             raise exceptions.ValidationError(self.msg.format(object_id))
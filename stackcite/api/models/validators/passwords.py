@@ -6,7 +6,7 @@ from . import exceptions
 class PasswordValidator(object):
     """
     A `mongoengine` style password validator. Raises :class:`.ValidationError`
-    if the password provided is invalid.
+    if the password (or any password in the list) provided is invalid.
     """
     def __init__(self, msg=None):
         if msg is None:
@@ -15,5 +15,10 @@ class PasswordValidator(object):
             self.msg = msg
 
     def __call__(self, password):
-        if not (isinstance(password, str) and validators.validate_password(password)):
+        if isinstance(password, (list, tuple)):
+            mask = validators.validate_password_many(password)
+            invalid = [str(v) for v, ok in zip(password, mask) if not ok]
+            if invalid:
+                raise exceptions.ValidationError(self.msg.format(', '.join(invalid)))
+        elif not (isinstance(password, str) and validators.validate_password(password)):
             raise exceptions.ValidationError(self.msg.format(password))
@@ -45,6 +45,22 @@ class GroupValidatorUnitTests(unittest.TestCase):
         with self.assertRaises(ValidationError):
             self.validator('invalid')
 
+    def test_valid_group_list_passes(self):
+        """GroupValidator accepts a list of valid groups
+        """
+        from ..exceptions import ValidationError
+        try:
+            self.validator(['users', 'staff', 'admin'])
+        except ValidationError as err:
+            self.fail(err)
+
+    def test_invalid_group_list_fails(self):
+        """GroupValidator rejects a list containing an invalid group
+        """
+        from ..exceptions import ValidationError
+        with self.assertRaises(ValidationError):
+            self.validator(['users', 'invalid'])
+
     def test_default_msg(self):
         """GroupValidator sets a default message
         """
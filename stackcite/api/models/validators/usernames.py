@@ -6,7 +6,7 @@ from . import exceptions
 class UsernameValidator(object):
     """
     A `mongoengine` style username validator. Raises :class:`.ValidationError`
-    if the username provided is invalid.
+    if the username (or any username in the list) provided is invalid.
     """
     def __init__(self, msg=None):
         if msg is None:
@@ -15,5 +15,10 @@ class UsernameValidator(object):
             self.msg = msg
 
     def __call__(self, username):
-        if not (isinstance(username, str) and validators.validate_username(username)):
+        if isinstance(username, (list, tuple)):
+            mask = validators.validate_username_many(username)
+            invalid = [str(v) for v, ok in zip(username, mask) if not ok]
+            if invalid:
+                raise exceptions.ValidationError(self.msg.format(', '.join(invalid)))
+        elif not (isinstance(username, str) and validators.validate_username(username)):
             raise exceptions.ValidationError(self.msg.format(username))
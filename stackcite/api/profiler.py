@@ -0,0 +1,384 @@
+"""
+An in-process query profiler for MongoDB commands issued by resources,
+without MongoDB's own profiler. Every command is fingerprinted by its shape
+(see :func:`fingerprint`), so queries that only differ in their values share
+a fingerprint, and its latency is recorded in histograms per fingerprint and
+per lineage of the requested resource (see :func:`resource_lineage`).
+Commands slower than a threshold are logged with the requested view and the
+authenticated principal.
+
+Applications can include this module (``config.include(
+'stackcite.api.profiler')``) to profile every MongoDB command, which
+registers a :class:`ProfilerListener` (only clients created afterwards are
+monitored). Recognized settings include:
+
+    * ``profiler.threshold``: The duration (in milliseconds) of queries
+      logged as slow (``100`` by default, empty to disable the log)
+    * ``profiler.endpoint``: The path of a JSON endpoint listing the top
+      fingerprints and lineages by total time, e.g. ``/_debug/queries``
+      (disabled by default). The endpoint requires the ``debug`` permission,
+      which is granted to admins.
+    * ``profiler.top``: The default number of entries listed by the endpoint
+      (``20`` by default)
+"""
+
+import collections
+import logging
+import threading
+
+from pymongo import monitoring
+
+from pyramid import location, security as psec
+from pyramid.httpexceptions import HTTPBadRequest
+from pyramid.threadlocal import get_current_request
+
+from stackcite.api import auth, renderers
+from stackcite.api.resources import mongo
+
+
+# Upper bounds (in milliseconds) of the buckets of latency histograms:
+BUCKETS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000,
+           float('inf'))
+
+# Profiled commands and the keys of their query shapes. Values of "shaped"
+# keys are replaced by placeholders, other keys are kept as they are:
+_COMMANDS = {
+    'find': (('filter', 'projection', 'sort'), ('filter',)),
+    'aggregate': (('pipeline',), ('pipeline',)),
+    'count': (('query',), ('query',)),
+    'distinct': (('key', 'query'), ('query',)),
+    'findAndModify': (('query', 'fields', 'sort', 'update'),
+                      ('query', 'update')),
+    'update': (('updates',), ('updates',)),
+    'delete': (('deletes',), ('deletes',)),
+    'insert': ((), ())
+}
+
+# The maximum number of open cursors tracked to attribute getMore commands:
+_MAX_CURSORS = 10000
+
+# The fingerprint that collects commands past the maximum number of
+# fingerprints:
+OTHER = '<other>'
+
+# The profiler registered by :func:`includeme`:
+_profiler = None
+_listener = None
+
+
+def shape(value):
+    """
+    Replaces the values of a raw query with ``'?'`` placeholders, keeping
+    field names and operators. Lists are reduced to their distinct shapes.
+    """
+    if isinstance(value, dict):
+        return {key: shape(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        shapes = []
+        for item in value:
+            item = shape(item)
+            if item not in shapes:
+                shapes.append(item)
+        return shapes
+    return '?'
+
+
+def fingerprint(command_name, command):
+    """
+    Returns the fingerprint of a MongoDB command, e.g. ``find mock_document
+    {"filter":{"name":"?"},"sort":[["_id",1]]}``, or ``None`` if commands of
+    this type are not profiled.
+
+    :param command_name: The name of the command (e.g. ``'find'``)
+    :param command: The command document
+    :return str: A fingerprint or ``None``
+    """
+    if command_name not in _COMMANDS:
+        return None
+    keys, shaped = _COMMANDS[command_name]
+    parts = {}
+    for key in keys:
+        if key not in command:
+            continue
+        value = command[key]
+        if key in shaped:
+            value = shape(value)
+        elif key == 'sort' and isinstance(value, dict):
+            value = [list(item) for item in value.items()]
+        parts[key] = value
+    collection = command.get(command_name)
+    data = renderers.dumps(parts, sort_keys=True).decode('utf-8')
+    return '{} {} {}'.format(command_name, collection, data)
+
+
+def resource_lineage(context):
+    """
+    Returns the lineage of a traversal resource as a path, replacing the
+    names of document resources with ``*`` (e.g. ``/v1/books/*``).
+    """
+    names = []
+    for resource in location.lineage(context):
+        if isinstance(resource, mongo.DocumentResource):
+            names.append('*')
+        elif getattr(resource, '__name__', None):
+            names.append(resource.__name__)
+    return '/' + '/'.join(reversed(names))
+
+
+class Histogram(object):
+    """
+    A latency histogram with fixed buckets (see ``BUCKETS``).
+    """
+
+    __slots__ = ('counts', 'count', 'total', 'max')
+
+    def __init__(self):
+        self.counts = [0] * len(BUCKETS)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def observe(self, duration):
+        """
+        Records a duration (in milliseconds).
+        """
+        for idx, bound in enumerate(BUCKETS):
+            if duration <= bound:
+                self.counts[idx] += 1
+                break
+        self.count += 1
+        self.total += duration
+        self.max = max(self.max, duration)
+
+    def percentile(self, p):
+        """
+        Returns an upper bound of the ``p``-th percentile (i.e. the upper
+        bound of its bucket, or the maximum duration if lower).
+        """
+        if not self.count:
+            return 0.0
+        rank, seen = p / 100 * self.count, 0
+        for bound, count in zip(BUCKETS, self.counts):
+            seen += count
+            if count and seen >= rank:
+                return min(bound, self.max)
+        return self.max
+
+    def as_dict(self):
+        return {
+            'count': self.count,
+            'total': self.total,
+            'mean': self.total / self.count if self.count else 0.0,
+            'max': self.max,
+            'p50': self.percentile(50),
+            'p95': self.percentile(95),
+            'p99': self.percentile(99),
+            'buckets': {
+                '+Inf' if bound == float('inf') else str(bound): count
+                for bound, count in zip(BUCKETS, self.counts)}
+        }
+
+
+class Profiler(object):
+    """
+    Records latency histograms of fingerprinted queries, per fingerprint and
+    per resource lineage, and logs slow queries.
+
+    :param threshold: The duration (in milliseconds) of queries logged as
+        slow, or ``None`` to disable the log
+    :param logger: A logger (or the ``stackcite.api.profiler`` logger)
+    :param max_fingerprints: The maximum number of distinct fingerprints;
+        further fingerprints are recorded as ``OTHER``
+    """
+
+    def __init__(self, threshold=100.0, logger=None, max_fingerprints=1000):
+        self.threshold = threshold
+        self.logger = logger or logging.getLogger(__name__)
+        self.max_fingerprints = max_fingerprints
+        self.fingerprints = {}
+        self.lineages = {}
+        self._lock = threading.Lock()
+
+    def record(self, fingerprint, duration, request=None):
+        """
+        Records a query of ``duration`` milliseconds, issued while handling
+        ``request`` (if any).
+        """
+        context = getattr(request, 'context', None)
+        lineage = resource_lineage(context) if context is not None else None
+        with self._lock:
+            if fingerprint not in self.fingerprints and \
+                    len(self.fingerprints) >= self.max_fingerprints:
+                fingerprint = OTHER
+            self._histogram(self.fingerprints, fingerprint).observe(duration)
+            if lineage is not None:
+                self._histogram(self.lineages, lineage).observe(duration)
+        if self.threshold is not None and duration >= self.threshold:
+            self._log(fingerprint, duration, request, lineage)
+
+    @staticmethod
+    def _histogram(histograms, key):
+        histogram = histograms.get(key)
+        if histogram is None:
+            histogram = histograms[key] = Histogram()
+        return histogram
+
+    def _log(self, fingerprint, duration, request, lineage):
+        view = principal = None
+        if request is not None:
+            view = '{} {}'.format(request.method, request.path)
+            if getattr(request, 'view_name', None):
+                view += ' ({})'.format(request.view_name)
+            principal = getattr(request, 'authenticated_userid', None)
+        self.logger.warning(
+            'Slow query (%.1f ms): %s [view: %s, principal: %s, lineage: %s]',
+            duration, fingerprint, view, principal, lineage)
+
+    def top(self, n=20, by='fingerprint'):
+        """
+        Returns the ``n`` fingerprints (or lineages if ``by`` is
+        ``'lineage'``) with the highest total duration.
+
+        :return list: Dictionaries of histogram statistics
+        """
+        histograms = self.lineages if by == 'lineage' else self.fingerprints
+        with self._lock:
+            items = sorted(histograms.items(),
+                           key=lambda item: item[1].total, reverse=True)[:n]
+            return [dict(histogram.as_dict(), **{by: key})
+                    for key, histogram in items]
+
+    def reset(self):
+        """
+        Discards every recorded histogram.
+        """
+        with self._lock:
+            self.fingerprints.clear()
+            self.lineages.clear()
+
+
+class ProfilerListener(monitoring.CommandListener):
+    """
+    A ``pymongo`` command listener that fingerprints profiled commands and
+    records their durations with a :class:`Profiler`. ``getMore`` commands
+    are recorded with the fingerprint of the command that opened their
+    cursor. Pending commands and open cursors are tracked under a lock, so a
+    listener can be shared by every thread.
+    """
+
+    def __init__(self, profiler):
+        self.profiler = profiler
+        self._pending = {}
+        self._cursors = collections.OrderedDict()
+        # Events are published by every thread that uses a monitored client:
+        self._lock = threading.Lock()
+
+    def started(self, event):
+        command = event.command
+        key = None
+        if event.command_name not in ('getMore', 'killCursors'):
+            key = fingerprint(event.command_name, command)
+            if key is None:
+                return
+        with self._lock:
+            if event.command_name == 'killCursors':
+                for cursor_id in command.get('cursors', ()):
+                    self._cursors.pop(cursor_id, None)
+                return
+            if event.command_name == 'getMore':
+                key = self._cursors.get(command['getMore'])
+            if key is not None:
+                self._pending[(event.connection_id, event.request_id)] = key
+
+    def succeeded(self, event):
+        cursor = event.reply.get('cursor') if event.reply else None
+        with self._lock:
+            key = self._pending.pop(
+                (event.connection_id, event.request_id), None)
+            if key is None:
+                return
+            if isinstance(cursor, dict):
+                self._track_cursor(cursor.get('id'), key)
+        self.profiler.record(
+            key, event.duration_micros / 1000, get_current_request())
+
+    def failed(self, event):
+        with self._lock:
+            key = self._pending.pop(
+                (event.connection_id, event.request_id), None)
+        if key is not None:
+            self.profiler.record(
+                key, event.duration_micros / 1000, get_current_request())
+
+    def _track_cursor(self, cursor_id, key):
+        """
+        Tracks the fingerprint of an open cursor, evicting the oldest cursor
+        past ``_MAX_CURSORS``. Must be called with the lock held.
+        """
+        if not cursor_id:
+            return
+        if len(self._cursors) >= _MAX_CURSORS:
+            self._cursors.popitem(last=False)
+        self._cursors[cursor_id] = key
+
+
+def get_profiler():
+    """
+    Returns the profiler registered by :func:`includeme` (or ``None``).
+    """
+    return _profiler
+
+
+class ProfilerResource(object):
+    """
+    The context of the profiler endpoint, which grants the ``debug``
+    permission to admins.
+    """
+
+    __acl__ = [
+        (psec.Allow, auth.ADMIN, 'debug'),
+        psec.DENY_ALL
+    ]
+
+    def __init__(self, request):
+        self.request = request
+
+
+def profiler_view(request):
+    """
+    Lists the top ``n`` fingerprints and lineages by total duration.
+    """
+    settings = request.registry.settings or {}
+    try:
+        n = int(request.params.get('n', settings.get('profiler.top', 20)))
+    except ValueError:
+        raise HTTPBadRequest('Invalid n: {}'.format(request.params['n']))
+    return {
+        'fingerprints': _profiler.top(n),
+        'lineages': _profiler.top(n, by='lineage')
+    }
+
+
+def _threshold(value):
+    if value is None:
+        return 100.0
+    return float(value) if str(value).strip() else None
+
+
+def includeme(config):
+    global _profiler, _listener
+    settings = config.get_settings()
+    threshold = _threshold(settings.get('profiler.threshold'))
+    if _profiler is None:
+        _profiler = Profiler(threshold)
+        _listener = ProfilerListener(_profiler)
+        monitoring.register(_listener)
+    else:
+        _profiler.threshold = threshold
+    endpoint = settings.get('profiler.endpoint')
+    if endpoint:
+        config.add_route(
+            'stackcite.api.profiler', endpoint, factory=ProfilerResource)
+        config.add_view(
+            profiler_view, route_name='stackcite.api.profiler',
+            renderer='json', permission='debug')
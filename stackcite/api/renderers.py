@@ -0,0 +1,128 @@
+"""
+Fast JSON encoding and decoding for the Stackcite API. Uses ``orjson`` or
+``ujson`` if either is installed and falls back to the standard library.
+Applications can include this module (``config.include(
+'stackcite.api.renderers')``) to replace Pyramid's ``json`` renderer and
+``request.json_body`` with versions that use the fastest available encoder.
+"""
+
+import datetime
+import json
+
+import mongoengine
+
+from bson import ObjectId
+
+from stackcite.api import timing
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import ujson
+except ImportError:
+    ujson = None
+
+
+def default(obj):
+    """
+    Adapts values that JSON encoders do not support natively:
+
+        * :class:`bson.ObjectId` becomes a string
+        * ``datetime`` and ``date`` become ISO 8601 strings
+        * ``mongoengine`` documents become dictionaries keyed by field names
+          (``None`` values are omitted)
+
+    Raises :class:`TypeError` for any other value.
+    """
+    if isinstance(obj, ObjectId):
+        return str(obj)
+    if isinstance(obj, (datetime.datetime, datetime.date)):
+        return obj.isoformat()
+    if isinstance(obj, mongoengine.base.BaseDocument):
+        return {name: obj[name] for name in obj._fields_ordered
+                if obj[name] is not None}
+    raise TypeError('Object of type {} is not JSON serializable'.format(
+        type(obj).__name__))
+
+
+def _dumps_orjson(obj, sort_keys=False):
+    option = orjson.OPT_NON_STR_KEYS
+    if sort_keys:
+        option |= orjson.OPT_SORT_KEYS
+    return orjson.dumps(obj, default=default, option=option)
+
+
+def _dumps_ujson(obj, sort_keys=False):
+    return ujson.dumps(
+        obj, default=default, sort_keys=sort_keys,
+        ensure_ascii=False, escape_forward_slashes=False).encode()
+
+
+def _dumps_stdlib(obj, sort_keys=False):
+    return json.dumps(
+        obj, default=default, sort_keys=sort_keys, ensure_ascii=False,
+        separators=(',', ':')).encode()
+
+
+if orjson is not None:
+    _dumps, _loads = _dumps_orjson, orjson.loads
+elif ujson is not None:
+    _dumps, _loads = _dumps_ujson, ujson.loads
+else:
+    _dumps, _loads = _dumps_stdlib, json.loads
+
+
+def dumps(obj, sort_keys=False):
+    """
+    Encodes a value as UTF-8 JSON using the fastest available encoder.
+
+    :param obj: A JSON serializable value (see :func:`default`)
+    :param sort_keys: Sorts dictionary keys if ``True``
+    :return bytes: A UTF-8 encoded JSON document
+    """
+    return _dumps(obj, sort_keys)
+
+
+def loads(data):
+    """
+    Decodes a JSON document using the fastest available decoder. Raises
+    :class:`ValueError` if ``data`` is not valid JSON.
+
+    :param data: A JSON document (``str`` or ``bytes``)
+    :return: The decoded value
+    """
+    return _loads(data)
+
+
+class JSONRenderer(object):
+    """
+    A Pyramid renderer factory that encodes view results with :func:`dumps`.
+    Rendering is timed as the ``render`` stage of the request.
+    """
+
+    def __init__(self, info=None):
+        self.info = info
+
+    def __call__(self, value, system):
+        request = system.get('request')
+        if request is not None:
+            response = request.response
+            if response.content_type == response.default_content_type:
+                response.content_type = 'application/json'
+        with timing.stage('render'):
+            return dumps(value)
+
+
+def json_body(request):
+    """
+    Decodes the body of a request with :func:`loads`.
+    """
+    return loads(request.body)
+
+
+def includeme(config):
+    config.add_renderer('json', JSONRenderer)
+    config.add_request_method(json_body, 'json_body', reify=True)
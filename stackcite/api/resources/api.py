@@ -1,12 +1,72 @@
 import bson
+import functools
+import marshmallow
+import re
+
+from mongoengine.errors import LookUpError
 
 from pyramid import security as psec
 
-from stackcite.api import schema
+from stackcite.api import cache, schema, timing, utils
 
 from . import index, mongo
 
 
+# The maximum number of cached schema instances:
+_SCHEMA_CACHE_SIZE = 256
+
+
+@functools.lru_cache(maxsize=_SCHEMA_CACHE_SIZE)
+def _cached_schema(schema_class, strict, exclude, only, method=None):
+    """
+    Returns a shared schema instance for a given schema class and set of
+    options. Instances of :class:`.APISchema` are given their ``method`` and
+    frozen before they are shared.
+
+    Raises :class:`marshmallow.ValidationError` if ``only`` includes a
+    dot-notation field path that the schema cannot serialize.
+    """
+    if only:
+        full_schema = _cached_schema(schema_class, strict, exclude, None)
+        invalid = [path for path in only
+                   if not schema.is_dumpable_path(full_schema, path)]
+        if invalid:
+            msg = 'Invalid field names: {}'.format(', '.join(invalid))
+            raise marshmallow.ValidationError(msg, 'fields')
+    schm = schema_class(strict=strict, exclude=exclude, only=only)
+    if isinstance(schm, schema.APISchema):
+        schm.method = method
+        schm.freeze()
+    return schm
+
+
+def _operator(field, op, value):
+    """
+    Compiles a loaded query operator value into a ``pymongo`` operator.
+
+    :param field: The queried :class:`mongoengine.fields.BaseField`
+    :param op: An operator name (see :mod:`stackcite.api.schema.operators`)
+    :param value: The operator's value
+    :return dict: A ``pymongo`` operator
+    """
+    if op == 'exists':
+        return {'$exists': bool(value)}
+    if op == 'prefix':
+        return {'$regex': '^' + re.escape(value)}
+    if op == 'in':
+        return {'$in': [field.prepare_query_value(op, v) for v in value]}
+    return {'$' + op: field.prepare_query_value(op, value)}
+
+
+def _is_operator(condition):
+    """
+    Checks whether a raw query condition is a dictionary of operators rather
+    than a value to test for equality.
+    """
+    return isinstance(condition, dict) and \
+        all(key.startswith('$') for key in condition)
+
+
 class SerializableResource(object):
     """
     An abstract class used to define a serializable resource.
@@ -16,12 +76,26 @@ class SerializableResource(object):
 
     def schema(self, *args, **kwargs):
         """
-        Instantiates a schema. Accepts the same arguments as
+        Returns a schema instance. Accepts the same arguments as
         :class:`marshmallow.Schema`.
+
+        If only ``strict``, ``exclude``, ``only`` and/or ``method`` are
+        provided (as keyword arguments), returns a shared, frozen instance
+        from a bounded cache instead of instantiating a new schema. An empty
+        ``only`` is treated as ``None`` (i.e. all fields) and a non-empty
+        ``only`` may include dot-notation paths into nested schemas. The
+        ``method`` (e.g. ``'POST'``) is set as the schema's
+        :attr:`.APISchema.method` context.
         """
         if self._SCHEMA is NotImplemented:
             raise NotImplementedError()
-        return self._SCHEMA(*args, **kwargs)
+        if args or set(kwargs) - {'strict', 'exclude', 'only', 'method'}:
+            return self._SCHEMA(*args, **kwargs)
+        strict = kwargs.get('strict', False)
+        exclude = tuple(kwargs.get('exclude') or ())
+        only = tuple(kwargs.get('only') or ()) or None
+        method = kwargs.get('method')
+        return _cached_schema(self._SCHEMA, strict, exclude, only, method)
 
 
 class APIIndexResource(index.IndexResource):
@@ -84,6 +158,39 @@ class APIDocumentResource(
         """
         return self.parent.schema(*args, **kwargs)
 
+    @property
+    def cache(self):
+        """
+        The response cache of the parent resource (a collection).
+        """
+        return self.parent.cache
+
+    @property
+    def cache_ttl(self):
+        """
+        The number of seconds responses remain cached.
+        """
+        return self.parent.cache_ttl
+
+    def cache_key(self, query, principals):
+        """
+        Returns a response cache key for this document (see
+        :meth:`APICollectionResource.cache_key`).
+        """
+        return self.parent.cache_key(query, principals, self.lineage)
+
+    def update(self, data, atomic=None, version=None):
+        try:
+            return super().update(data, atomic, version)
+        finally:
+            self.parent.invalidate()
+
+    def delete(self, version=None):
+        try:
+            return super().delete(version)
+        finally:
+            self.parent.invalidate()
+
 
 class APICollectionResource(
         mongo.CollectionResource, SerializableResource):
@@ -92,7 +199,7 @@ class APICollectionResource(
     """
 
     __acl__ = [
-        (psec.Allow, psec.Authenticated, 'create'),
+        (psec.Allow, psec.Authenticated, ('create', 'update', 'delete')),
         (psec.Allow, psec.Everyone, 'retrieve'),
         psec.DENY_ALL
     ]
@@ -100,15 +207,141 @@ class APICollectionResource(
     _SCHEMA = schema.APICollectionSchema
     _DOCUMENT_RESOURCE = APIDocumentResource
 
+    # A response cache backend (e.g. cache.MemoryCache()) shared by this
+    # collection and its documents, or None to disable response caching:
+    _CACHE = None
+
+    # The number of seconds responses remain cached (None for the backend's
+    # default):
+    _CACHE_TTL = None
+
+    # Fields that accept query operators (e.g. "number__gt") even though no
+    # index starts with them, i.e. fields whose operator queries are allowed
+    # to scan the collection:
+    _UNINDEXED_OPERATORS = ()
+
+    @property
+    def cache(self):
+        """
+        This collection's response cache backend (``None`` if disabled).
+        """
+        return self._CACHE
+
+    @property
+    def cache_ttl(self):
+        """
+        The number of seconds responses remain cached.
+        """
+        return self._CACHE_TTL
+
+    @property
+    def unindexed_operators(self):
+        """
+        Fields that accept query operators without an index.
+        """
+        return self._UNINDEXED_OPERATORS
+
+    def cache_key(self, query, principals, lineage=None):
+        """
+        Returns a response cache key for a request, based on the lineage of
+        the requested resource (defaults to this collection), its query
+        parameters, the requesting principals and the current generation of
+        this collection.
+
+        :param query: A dictionary of request query parameters
+        :param principals: The effective principals of the request
+        :param lineage: The lineage of the requested resource
+        :return str: A cache key
+        """
+        namespace = self.collection._get_collection_name()
+        generation = self.cache.generation(namespace)
+        return cache.make_key(
+            namespace, generation, lineage or self.lineage, query, principals)
+
+    def invalidate(self):
+        """
+        Invalidates every cached response of this collection and its
+        documents by incrementing the collection's generation.
+        """
+        if self.cache is not None:
+            self.cache.incr(self.collection._get_collection_name())
+
+    def create(self, data):
+        try:
+            return super().create(data)
+        finally:
+            self.invalidate()
+
+    def create_many(self, data, ordered=False):
+        try:
+            return super().create_many(data, ordered)
+        finally:
+            self.invalidate()
+
     # TODO: Find a better pattern to inject custom raw queries (use schemas)
-    def retrieve(self, query=None, fields=None, limit=100, skip=0):
-        raw_query = self._raw_query(query)
+    def retrieve(self, query=None, fields=None, limit=100, skip=0,
+                 after=None, raw=None, sort=None):
+        query = dict(query or {})
+        with timing.stage('query'):
+            text = self._text_search(query)
+            self._operator_query(query)
+            raw_query = self._raw_query(query)
+            self._sort_spec(sort)
+        self._retrieve(query)
+        return super().retrieve(
+            raw_query, fields, limit, skip, after, raw, text, sort)
+
+    def iterate(self, query=None, fields=None, limit=100, skip=0,
+                after=None, raw=None, sort=None):
+        query = dict(query or {})
+        with timing.stage('query'):
+            text = self._text_search(query)
+            self._operator_query(query)
+            raw_query = self._raw_query(query)
+            self._sort_spec(sort)
         self._retrieve(query)
-        return super().retrieve(raw_query, fields, limit, skip)
+        return super().iterate(
+            raw_query, fields, limit, skip, after, raw, text, sort)
 
     def _retrieve(self, query):
         pass
 
+    def count(self, query=None, mode='exact'):
+        query = dict(query or {})
+        with timing.stage('query'):
+            text = self._text_search(query)
+            self._operator_query(query)
+            raw_query = self._raw_query(query)
+        return super().count(raw_query, mode, text)
+
+    def update_many(self, query, data):
+        raw_query = self._bulk_raw_query(query)
+        try:
+            return super().update_many(raw_query, data)
+        finally:
+            self.invalidate()
+
+    def delete_many(self, query):
+        raw_query = self._bulk_raw_query(query)
+        try:
+            return super().delete_many(raw_query)
+        finally:
+            self.invalidate()
+
+    def _bulk_raw_query(self, query):
+        """
+        Builds a raw query for a bulk operation, resolving any text search
+        into a filter.
+        """
+        query = dict(query)
+        with timing.stage('query'):
+            text = self._text_search(query)
+            self._operator_query(query)
+            raw_query = self._raw_query(query)
+            if text is not None:
+                raw_query = self.text_query(raw_query, text)
+        return raw_query
+
     @staticmethod
     def get_params(query):
         """
@@ -118,6 +351,10 @@ class APICollectionResource(
             * ``fields``
             * ``limit``
             * ``skip``
+            * ``after``
+            * ``count``
+            * ``stream``
+            * ``sort``
 
         :param query: A dictionary of document-level query parameters
         :return: A two-tuple in the form of (``query``, ``params``)
@@ -125,10 +362,88 @@ class APICollectionResource(
         params = {
             'fields': (),
             'limit': 100,
-            'skip': 0
+            'skip': 0,
+            'after': None,
+            'count': schema.COUNT_EXACT,
+            'stream': False,
+            'sort': ()
         }
         return _get_params(query, params)
 
+    def next_cursor(self, documents, limit, query=None, sort=None):
+        """
+        Returns an opaque cursor pointing past the last document of a full page
+        of results, or ``None`` if the page is the last one. Text searches
+        (``q``) are ordered by relevance and paged with ``skip`` instead, so
+        they never return a cursor.
+
+        :param documents: A list of retrieved documents
+        :param limit: The maximum number of documents in a page
+        :param query: The query the documents were retrieved with
+        :param sort: The sort keys the documents were retrieved with
+        :return str: An opaque cursor string or ``None``
+        """
+        if query and query.get('q'):
+            return None
+        if documents and len(documents) >= limit:
+            values = self.cursor_values(documents[-1], sort)
+            return utils.encode_cursor(values)
+
+    @staticmethod
+    def _text_search(query):
+        """
+        A hook to extract a text search string from a query (removing it from
+        the query).
+
+        :param query: The output of `self._retrieve_schema`.
+        :return str: A text search string or ``None``
+        """
+        return query.pop('q', None) or None
+
+    def _operator_query(self, query):
+        """
+        Compiles query operators (e.g. ``number__gt``) into ``pymongo``
+        operators on the field's raw path, merging operators on the same field
+        (and any equality test, as ``$eq``). Operators are only accepted on
+        fields that prefix an index, unless listed in ``_UNINDEXED_OPERATORS``.
+
+        :param query: The output of `self._retrieve_schema`.
+        :raises marshmallow.ValidationError: If an operator is not allowed
+        """
+        indexed = None
+        for key in list(query):
+            name, op = schema.operators.split_operator(key)
+            if op is None:
+                continue
+            try:
+                field = self.collection._lookup_field(name.split('.'))[-1]
+                path = mongo._db_path(self.collection, name)
+            except LookUpError:
+                raise marshmallow.ValidationError(
+                    {key: ['Unknown field.']})
+            if indexed is None:
+                indexed = mongo._indexed_paths(self.collection)
+            if path not in indexed and name not in self.unindexed_operators:
+                raise marshmallow.ValidationError(
+                    {key: ['Operators require an indexed field.']})
+            condition = query.get(path, {})
+            if not _is_operator(condition):
+                condition = {'$eq': condition}
+            condition.update(_operator(field, op, query.pop(key)))
+            query[path] = condition
+        return query
+
+    def _sort_spec(self, sort):
+        """
+        Validates a list of sort keys (see :meth:`sort_spec`).
+
+        :raises marshmallow.ValidationError: If a sort key is not allowed
+        """
+        try:
+            return self.sort_spec(sort)
+        except ValueError as err:
+            raise marshmallow.ValidationError({'sort': [str(err)]})
+
     @staticmethod
     def _raw_query(query):
         """
@@ -1,9 +1,239 @@
+import functools
+import mongoengine
+
+from mongoengine.errors import LookUpError, SaveConditionError
 from bson import ObjectId
 from bson.errors import InvalidId
+from pymongo import ReturnDocument, TEXT
+from pymongo.errors import BulkWriteError, DuplicateKeyError
+
+from stackcite.api import search, timing
+from stackcite.api.config import mongo as mongo_config
 
 from . import index
 
 
+def _from_pymongo(document_class, data):
+    """
+    Converts a raw ``pymongo`` dictionary into a dictionary keyed by the field
+    names of ``document_class`` (e.g. ``_id`` becomes ``id``), recursing into
+    embedded documents. Drops the ``_cls`` inheritance marker.
+
+    :param document_class: A :class:`mongoengine.Document` class
+    :param data: A raw dictionary returned by ``pymongo``
+    :return: A dictionary keyed by field names
+    """
+    names = document_class._reverse_db_field_map
+    result = {}
+    for key, value in data.items():
+        if key == '_cls':
+            continue
+        name = names.get(key, key)
+        field = document_class._fields.get(name)
+        result[name] = _from_pymongo_value(field, value)
+    return result
+
+
+def _from_pymongo_value(field, value):
+    """
+    Converts a raw ``pymongo`` value according to its ``mongoengine`` field.
+    """
+    if isinstance(field, mongoengine.EmbeddedDocumentField) \
+            and isinstance(value, dict):
+        return _from_pymongo(field.document_type, value)
+    if isinstance(field, mongoengine.ListField) and isinstance(value, list):
+        return [_from_pymongo_value(field.field, v) for v in value]
+    return value
+
+
+def _projection(document_class, fields):
+    """
+    Plans a database projection for a list of dot-notation field paths. If
+    any path does not resolve to a field of ``document_class`` (e.g. a
+    computed value), returns an empty tuple so the whole document is loaded.
+
+    :param document_class: A :class:`mongoengine.Document` class
+    :param fields: A list or tuple of dot-notation field paths
+    :return tuple: The field paths to project
+    """
+    for path in fields:
+        try:
+            document_class._lookup_field(path.split('.'))
+        except LookUpError:
+            return ()
+    return tuple(fields)
+
+
+def _compile_update(document_class, data):
+    """
+    Compiles a nested dictionary of models into a single ``pymongo`` update
+    using dot-notation for embedded documents (e.g. ``{'name': {'first':
+    'Kim'}}`` becomes ``{'$set': {'name.first': 'Kim'}}``). Values of ``None``
+    are compiled into ``$unset`` operations. Keys that are not fields of
+    ``document_class`` are ignored.
+
+    Raises :class:`mongoengine.ValidationError` if any value fails field-level
+    validation, if a required field is unset or if the primary key is changed.
+
+    :param document_class: A :class:`mongoengine.Document` class
+    :param data: A dictionary of values for the document's interface
+    :return: A raw ``pymongo`` update
+    """
+    update = {'$set': {}, '$unset': {}}
+    errors = {}
+    _compile_update_fields(document_class, data, '', update, errors)
+    if errors:
+        msg = 'ValidationError ({})'.format(document_class.__name__)
+        raise mongoengine.ValidationError(msg, errors=errors)
+    return {op: values for op, values in update.items() if values}
+
+
+def _compile_update_fields(document_class, data, prefix, update, errors):
+    """
+    Recursively compiles the fields of ``data`` into ``update`` and records
+    field-level validation errors in ``errors``.
+    """
+    for name, value in data.items():
+        field = document_class._fields.get(name)
+        if field is None:
+            continue
+        path = prefix + field.db_field
+        if path == '_id':
+            errors[name] = mongoengine.ValidationError(
+                'Primary key cannot be updated', field_name=name)
+        elif value is None:
+            if field.required:
+                errors[name] = mongoengine.ValidationError(
+                    'Field is required', field_name=name)
+            else:
+                update['$unset'][path] = ''
+        elif isinstance(field, mongoengine.EmbeddedDocumentField) \
+                and isinstance(value, dict):
+            embedded_errors = {}
+            _compile_update_fields(
+                field.document_type, value, path + '.', update,
+                embedded_errors)
+            if embedded_errors:
+                errors[name] = mongoengine.ValidationError(
+                    errors=embedded_errors, field_name=name)
+        else:
+            try:
+                value = field.to_python(value)
+                field.validate(value)
+            except mongoengine.ValidationError as err:
+                errors[name] = err
+            else:
+                update['$set'][path] = field.to_mongo(value)
+
+
+def _db_path(document_class, name):
+    """
+    Converts a dot-notation field name into a raw ``pymongo`` path (e.g.
+    ``id`` becomes ``_id``).
+    """
+    fields = document_class._lookup_field(name.split('.'))
+    return '.'.join(field.db_field for field in fields)
+
+
+def _indexed_paths(document_class):
+    """
+    Returns the raw paths that prefix an index declared in a document's
+    ``meta`` (i.e. the first key of each index that is not a text index),
+    including ``_id``.
+    """
+    paths = {'_id'}
+    for spec in document_class._meta.get('index_specs') or ():
+        key, kind = spec['fields'][0]
+        if kind != TEXT:
+            paths.add(key)
+    return paths
+
+
+def _text_index_fields(document_class):
+    """
+    Returns the weights of the text index declared in a document's ``meta``
+    (if any), keyed by field names.
+    """
+    names = document_class._reverse_db_field_map
+    fields = {}
+    for spec in document_class._meta.get('index_specs') or ():
+        weights = spec.get('weights') or {}
+        for key, kind in spec['fields']:
+            if kind == TEXT:
+                fields[names.get(key, key)] = weights.get(key, 1)
+    return fields
+
+
+def _sort_key(key):
+    """
+    Splits a sort key (e.g. ``'-year'``) into a two-tuple of (``name``,
+    ``direction``), where ``direction`` is ``1`` (ascending) or ``-1``
+    (descending).
+    """
+    if key.startswith('-'):
+        return key[1:], -1
+    return key.lstrip('+'), 1
+
+
+def _path_value(document, name):
+    """
+    Returns the value at a dot-notation path of a document or of a dictionary
+    returned by raw reads (``None`` if missing).
+    """
+    value = document
+    for part in name.split('.'):
+        if value is None:
+            return None
+        if isinstance(value, dict):
+            value = value.get(part)
+        else:
+            value = getattr(value, part, None)
+    return value
+
+
+def _after(path, direction, value):
+    """
+    Returns a raw condition matching the values of ``path`` sorted after
+    ``value`` in a given direction, or ``None`` if there are none. Like
+    MongoDB, sorts null (and missing) values before any other value.
+    """
+    if direction > 0:
+        if value is None:
+            return {path: {'$ne': None}}
+        return {path: {'$gt': value}}
+    if value is None:
+        return None
+    return {'$or': [{path: {'$lt': value}}, {path: {'$eq': None}}]}
+
+
+def _ranked(documents, ranking):
+    """
+    Orders documents (or raw dictionaries) by their position in a list of
+    ids. Returns ``documents`` unchanged if ``ranking`` is ``None``.
+    """
+    if ranking is None:
+        return documents
+    position = {doc_id: idx for idx, doc_id in enumerate(ranking)}
+    return sorted(documents, key=lambda doc: position[
+        doc['id'] if isinstance(doc, dict) else doc.id])
+
+
+def _writes(method):
+    """
+    Discards the local text indexes of a resource's collection (see
+    :mod:`stackcite.api.search`) after calls to a write method.
+    """
+
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        try:
+            return method(self, *args, **kwargs)
+        finally:
+            search.invalidate(self.collection)
+
+    return wrapper
+
+
 class DocumentResource(index.IndexResource):
     """
     A modified version of :class:`.IndexResource` providing generalized
@@ -45,25 +275,59 @@ class DocumentResource(index.IndexResource):
         """
         return self.__parent__.collection
 
-    def retrieve(self, fields=None):
+    @property
+    def version_field(self):
+        """
+        The version field of the parent collection (``None`` if unset).
+        """
+        return self.__parent__.version_field
+
+    def version(self):
+        """
+        Returns the value of the target document's version field (see
+        ``_VERSION_FIELD``) by projecting only that field, without loading
+        the document. Raises :class:`mongoengine.DoesNotExist` exception if
+        nothing is found.
+        """
+        assert self.version_field
+        return self.collection.objects(id=self.id).scalar(
+            self.version_field).get()
+
+    @timing.timed('retrieve')
+    def retrieve(self, fields=None, raw=None):
         """
         Retrieves the target :class:`mongoengine.Document` from the collection.
-        If ``fields`` is set, will only load models for those fields. Raises
+        If ``fields`` is set (in dot-notation), will only load models for those
+        fields unless one of them is not a document field. Raises
         :class:`mongoengine.DoesNotExist` exception if nothing is found.
 
+        If ``raw`` is set (defaults to the parent's ``_RAW_READS``), returns
+        a dictionary keyed by field names instead of instantiating a
+        :class:`mongoengine.Document`.
+
         :param fields: A list or tuple of explicitly desired field names
-        :return: A :class:`mongoengine.Document`
+        :param raw: Returns a dictionary instead of a document if ``True``
+        :return: A :class:`mongoengine.Document` or a dictionary
         """
         fields = fields or ()
+        if raw is None:
+            raw = self.__parent__.raw_reads
 
         assert not isinstance(fields, str)
 
         results = self.collection.objects
+        fields = _projection(self.collection, fields)
         if fields:
             results = results.only(*fields)
+        if raw:
+            result = results.as_pymongo().get(id=self.id)
+            with timing.stage('build'):
+                return _from_pymongo(self.collection, result)
         return results.get(id=self.id)
 
-    def update(self, data):
+    @_writes
+    @timing.timed('update')
+    def update(self, data, atomic=None, version=None):
         """
         Updates the target :class:`mongoengine.Document` according to a nested
         dictionary of models and returns the newly updated document. Raises
@@ -71,26 +335,139 @@ class DocumentResource(index.IndexResource):
         :class:`mongoengine.ValidationError` exceptions if the document cannot
         be found or if the provided models fails back-end validation.
 
+        If ``atomic`` is set (defaults to the parent's ``_ATOMIC_UPDATES``),
+        compiles ``data`` into a single ``$set``/``$unset`` operation instead
+        of loading, modifying and saving the whole document. Atomic updates
+        only validate the fields being changed and do not trigger document
+        signals or ``clean()``.
+
+        If the parent sets ``_VERSION_FIELD``, every update increments that
+        field and the field cannot be set through ``data``. If ``version`` is
+        set, only updates the document if its version still matches and
+        raises :class:`mongoengine.errors.SaveConditionError` otherwise.
+
         :param data: A dictionary of values for the document's interface
+        :param atomic: Updates in a single operation if ``True``
+        :param version: The expected value of the document's version field
         :return: An updated :class:`mongoengine.Document`
         """
         assert isinstance(data, dict)
 
-        document = DocumentResource.retrieve(self)
+        field = self.version_field
+        if field:
+            data = {k: v for k, v in data.items() if k != field}
+        if atomic is None:
+            atomic = self.__parent__.atomic_updates
+        if atomic:
+            return self._update_atomic(data, version)
+
+        document = DocumentResource.retrieve(self, raw=False)
+        condition = None
+        if field:
+            current = getattr(document, field)
+            if version is not None and current != version:
+                raise self._version_conflict()
+            # Guards against concurrent writes between loading and saving:
+            condition = {field: current}
         document.deserialize(data)
-        document.save()
+        if field:
+            setattr(document, field, (getattr(document, field) or 0) + 1)
+        document.save(save_condition=condition)
         return document
 
-    def delete(self):
+    def _update_atomic(self, data, version=None):
         """
-        Deletes the target :class:`mongoengine.Document`. Returns an integer
-        representing the number of documents deleted (should always be "1").
-        Raises :class:`mongoengine.DoesNotExist` exception if the document
-        cannot be found.
+        Updates the target document with a single ``find_one_and_update``
+        and returns the post-image as a :class:`mongoengine.Document`.
+        """
+        update = _compile_update(self.collection, data)
+        if self.version_field:
+            db_field = self.collection._fields[self.version_field].db_field
+            update['$inc'] = {db_field: 1}
+        query = self._objects(version)._query
+        collection = self.collection._get_collection()
+        try:
+            if update:
+                result = collection.find_one_and_update(
+                    query, update, return_document=ReturnDocument.AFTER)
+            else:
+                result = collection.find_one(query)
+        except DuplicateKeyError as err:
+            raise mongoengine.NotUniqueError(str(err))
+        if result is None:
+            raise self._missing_or_conflict(version)
+        return self.collection._from_son(result)
+
+    @_writes
+    @timing.timed('delete')
+    def delete(self, version=None):
+        """
+        Deletes the target :class:`mongoengine.Document`. Returns ``True`` if
+        successful. Raises :class:`mongoengine.DoesNotExist` exception if the
+        document cannot be found.
+
+        Deletes by ``_id`` in a single operation without loading the document.
+        Delete rules and delete signals registered with ``mongoengine`` are
+        still honored. If the parent sets ``_DOCUMENT_DELETES`` (e.g. because
+        the document overrides :meth:`mongoengine.Document.delete`), loads
+        the document and deletes it through its own interface instead.
+
+        If ``version`` is set, only deletes the document if its version field
+        (see ``_VERSION_FIELD``) still matches and raises
+        :class:`mongoengine.errors.SaveConditionError` otherwise.
+
+        :param version: The expected value of the document's version field
         """
-        self.collection.objects.get(id=self.id).delete()
+        if self.__parent__.document_deletes:
+            document = self.collection.objects.get(id=self.id)
+            if (version is not None and
+                    getattr(document, self.version_field) != version):
+                raise self._version_conflict()
+            document.delete()
+            return True
+
+        if not self._objects(version).delete():
+            raise self._missing_or_conflict(version)
         return True
 
+    def _objects(self, version=None):
+        """
+        Returns a query object matching the target document and, if
+        ``version`` is set, its expected version.
+        """
+        if version is None:
+            return self.collection.objects(id=self.id)
+        assert self.version_field
+        return self.collection.objects(
+            id=self.id, **{self.version_field: version})
+
+    def _missing_or_conflict(self, version=None):
+        """
+        Returns the exception raised when a (conditional) write matched
+        nothing: a version conflict if the document still exists, or
+        :meth:`_does_not_exist` otherwise.
+        """
+        if version is not None and self._objects().count():
+            return self._version_conflict()
+        return self._does_not_exist()
+
+    def _version_conflict(self):
+        """
+        Returns a :class:`mongoengine.errors.SaveConditionError` exception for
+        the target document.
+        """
+        msg = '{} version does not match.'
+        return SaveConditionError(msg.format(self.collection.__name__))
+
+    def _does_not_exist(self):
+        """
+        Returns a :class:`mongoengine.DoesNotExist` exception for the target
+        document.
+        """
+        msg = '{} matching query does not exist.'
+        return self.collection.DoesNotExist(
+            msg.format(self.collection.__name__))
+
 
 class CollectionResource(index.IndexResource):
     """
@@ -124,6 +501,44 @@ class CollectionResource(index.IndexResource):
     # The designated child resource:
     _DOCUMENT_RESOURCE = DocumentResource
 
+    # The maximum number of documents counted in "capped" count mode:
+    _COUNT_CAP = 1000
+
+    # Read raw dictionaries instead of instantiating documents:
+    _RAW_READS = False
+
+    # The number of documents fetched per round trip by iterate():
+    _BATCH_SIZE = 100
+
+    # The read preference (e.g. 'secondaryPreferred') and read concern (e.g.
+    # 'majority') of collection reads, or None to use the connection's:
+    _READ_PREFERENCE = None
+    _READ_CONCERN = None
+
+    # Update documents with a single $set/$unset instead of saving them:
+    _ATOMIC_UPDATES = False
+
+    # Load documents and call their own delete() instead of deleting by id:
+    _DOCUMENT_DELETES = False
+
+    # A numeric field incremented by every document update (e.g. 'version'),
+    # used for ETags and conditional writes (If-Match requires it):
+    _VERSION_FIELD = None
+
+    # Weights of text-indexed fields (e.g. {'title': 10, 'abstract': 2}), or
+    # None to use the text index declared in the collection's meta:
+    _TEXT_FIELDS = None
+
+    # How text searches are performed: 'text' uses MongoDB's $text operator
+    # (which requires a text index), 'local' uses an in-process inverted index
+    # (see stackcite.api.search):
+    _TEXT_SEARCH = 'text'
+
+    # Fields that results may be sorted by (e.g. ('year', 'title')), or None
+    # to allow fields that prefix an index. Results are sorted by _id last so
+    # their order is stable and can be paged with cursors:
+    _SORT_KEYS = None
+
     def __getitem__(self, key):
         """
         Attempts to cast ``name`` into a :class:`bson.ObjectId` so it can be
@@ -145,6 +560,120 @@ class CollectionResource(index.IndexResource):
         """
         return self._COLLECTION
 
+    @property
+    def raw_reads(self):
+        """
+        Whether reads return raw dictionaries instead of documents by default.
+        """
+        return self._RAW_READS
+
+    @property
+    def read_preference(self):
+        """
+        The read preference of collection reads (``None`` if unset).
+        """
+        return mongo_config.read_preference(self._READ_PREFERENCE)
+
+    @property
+    def read_concern(self):
+        """
+        The read concern of collection reads (``None`` if unset).
+        """
+        return mongo_config.read_concern(self._READ_CONCERN)
+
+    @property
+    def atomic_updates(self):
+        """
+        Whether documents are updated atomically by default.
+        """
+        return self._ATOMIC_UPDATES
+
+    @property
+    def version_field(self):
+        """
+        The name of the documents' version field (``None`` if unset).
+        """
+        return self._VERSION_FIELD
+
+    @property
+    def document_deletes(self):
+        """
+        Whether documents are loaded and deleted through their own interface.
+        """
+        return self._DOCUMENT_DELETES
+
+    @property
+    def text_fields(self):
+        """
+        The weights of text-indexed fields, keyed by field names.
+        """
+        if self._TEXT_FIELDS is not None:
+            return dict(self._TEXT_FIELDS)
+        return _text_index_fields(self.collection)
+
+    @property
+    def text_search(self):
+        """
+        How text searches are performed (``'text'`` or ``'local'``).
+        """
+        return self._TEXT_SEARCH
+
+    @property
+    def sort_keys(self):
+        """
+        Fields that results may be sorted by (``None`` for indexed fields).
+        """
+        return self._SORT_KEYS
+
+    def sort_spec(self, sort=None):
+        """
+        Validates a list of sort keys (e.g. ``['-year', 'title']``) against
+        ``_SORT_KEYS`` (or against indexed fields if unset). Sorting by ``id``
+        is always allowed, and ``id`` is appended if missing so the order is
+        total. Raises :class:`ValueError` if a key is not allowed or repeated.
+
+        :param sort: A list of field names (in dot-notation), prefixed with
+            ``-`` for descending order
+        :return: A list of two-tuples in the form of (``name``,
+            ``direction``)
+        """
+        spec, names, indexed = [], set(), None
+        for key in sort or ():
+            name, direction = _sort_key(key)
+            if name in names:
+                raise ValueError('Duplicate sort key: {}'.format(name))
+            if name == 'id':
+                allowed = True
+            elif self.sort_keys is not None:
+                allowed = name in self.sort_keys
+            else:
+                if indexed is None:
+                    indexed = _indexed_paths(self.collection)
+                try:
+                    allowed = _db_path(self.collection, name) in indexed
+                except LookUpError:
+                    allowed = False
+            if not allowed:
+                raise ValueError('Invalid sort key: {}'.format(name))
+            spec.append((name, direction))
+            names.add(name)
+        if 'id' not in names:
+            spec.append(('id', 1))
+        return spec
+
+    def ensure_text_index(self):
+        """
+        Creates a weighted MongoDB text index over ``_TEXT_FIELDS``. Note that
+        a collection can only have a single text index.
+
+        :return str: The name of the index
+        """
+        weights = self._text_weights()
+        return self.collection._get_collection().create_index(
+            [(path, TEXT) for path in weights], weights=weights)
+
+    @_writes
+    @timing.timed('create')
     def create(self, data):
         """
         Creates a new :class:`mongoengine.Document` in the target collection
@@ -162,18 +691,230 @@ class CollectionResource(index.IndexResource):
         document.save()
         return document
 
-    def retrieve(self, query=None, fields=None, limit=100, skip=0):
+    @_writes
+    @timing.timed('create_many')
+    def create_many(self, data, ordered=False):
+        """
+        Creates new :class:`mongoengine.Document` objects in the target
+        collection from a list of nested dictionaries of models. Documents
+        that pass back-end validation are written with a single
+        ``insert_many``.
+
+        Returns a list with one entry per item in ``data``. Each entry is
+        either the newly created document or the exception for that item:
+        :class:`mongoengine.ValidationError` if it fails back-end validation,
+        :class:`mongoengine.NotUniqueError` if it duplicates a unique field or
+        :class:`mongoengine.OperationError` for any other write error. If
+        ``ordered`` is set, stops at the first failed item and returns
+        ``None`` for every item after it.
+
+        :param data: A list of dictionaries of values for the document's
+            interface
+        :param ordered: Stops at the first failed item if ``True``
+        :return: A list of documents, exceptions or ``None``
+        """
+        assert isinstance(data, (list, tuple))
+
+        results = [None] * len(data)
+        # Build and validate documents:
+        documents = []
+        for idx, item in enumerate(data):
+            assert isinstance(item, dict)
+            document = self.collection()
+            document.deserialize(item)
+            try:
+                document.validate()
+            except mongoengine.ValidationError as err:
+                results[idx] = err
+                if ordered:
+                    break
+            else:
+                documents.append((idx, document))
+        if not documents:
+            return results
+
+        # Insert documents:
+        sons = [document.to_mongo() for idx, document in documents]
+        write_errors = {}
+        try:
+            self.collection._get_collection().insert_many(
+                sons, ordered=ordered)
+        except BulkWriteError as err:
+            write_errors = {e['index']: e for e in err.details['writeErrors']}
+        first_error = min(write_errors) if write_errors else None
+        for pos, (idx, document) in enumerate(documents):
+            if pos in write_errors:
+                results[idx] = self._write_error(write_errors[pos])
+            elif ordered and first_error is not None and pos > first_error:
+                results[idx] = None
+            else:
+                document.pk = sons[pos]['_id']
+                results[idx] = document
+        return results
+
+    @_writes
+    @timing.timed('update_many')
+    def update_many(self, query, data):
+        """
+        Updates every document matching a dictionary-styled ``pymongo``
+        query according to a nested dictionary of models, using a single
+        ``$set``/``$unset`` operation. Raises corresponding
+        :class:`mongoengine.ValidationError` and
+        :class:`mongoengine.NotUniqueError` exceptions if the provided models
+        fails back-end validation or duplicates a unique field.
+
+        If ``_VERSION_FIELD`` is set, the update increments that field of
+        every modified document and the field cannot be set through ``data``.
+
+        :param query: A raw dictionary-styled ``pymongo`` query
+        :param data: A dictionary of values for the document's interface
+        :return dict: The number of ``matched`` and ``modified`` documents
+        """
+        assert isinstance(query, dict)
+        assert isinstance(data, dict)
+
+        field = self.version_field
+        if field:
+            data = {k: v for k, v in data.items() if k != field}
+        update = _compile_update(self.collection, data)
+        if not update:
+            matched = self.collection.objects(__raw__=query).count()
+            return {'matched': matched, 'modified': 0}
+        if field:
+            db_field = self.collection._fields[field].db_field
+            update['$inc'] = {db_field: 1}
+        query = self.collection.objects(__raw__=query)._query
+        try:
+            result = self.collection._get_collection().update_many(
+                query, update)
+        except DuplicateKeyError as err:
+            raise mongoengine.NotUniqueError(str(err))
+        return {
+            'matched': result.matched_count,
+            'modified': result.modified_count
+        }
+
+    @_writes
+    @timing.timed('delete_many')
+    def delete_many(self, query):
+        """
+        Deletes every document matching a dictionary-styled ``pymongo`` query.
+        Delete rules and delete signals are honored in the same way as
+        :meth:`DocumentResource.delete`.
+
+        :param query: A raw dictionary-styled ``pymongo`` query
+        :return dict: The number of ``deleted`` documents
+        """
+        assert isinstance(query, dict)
+
+        results = self.collection.objects(__raw__=query)
+        if self.document_deletes:
+            deleted = 0
+            for document in results:
+                document.delete()
+                deleted += 1
+        else:
+            deleted = results.delete()
+        return {'deleted': deleted}
+
+    @staticmethod
+    def _write_error(error):
+        """
+        Converts a ``pymongo`` bulk write error into a ``mongoengine``
+        exception.
+        """
+        if error.get('code') in (11000, 11001):
+            return mongoengine.NotUniqueError(error.get('errmsg'))
+        return mongoengine.OperationError(error.get('errmsg'))
+
+    @timing.timed('retrieve')
+    def retrieve(self, query=None, fields=None, limit=100, skip=0,
+                 after=None, raw=None, text=None, sort=None):
         """
         Retrieves a list of documents from the requested collection. Accepts a
         dictionary-styled ``pymongo`` query, a list of explicitly desired
         ``fields``, a ``limit`` of the maximum number of documents to return
-        (default 100) and a number of documents to ``skip`` (default 0).
+        (default 100), a number of documents to ``skip`` (default 0) and a
+        list of sort key values to seek ``after`` (default ``None``).
+
+        Results are ordered by ``sort`` keys (see :meth:`sort_spec`), then by
+        ``_id``. Seeking ``after`` the sort key values of a known document
+        (see :meth:`cursor_values`) uses indexes instead of walking and
+        discarding skipped documents, so deep pages cost the same as the
+        first one. Raises :class:`ValueError` if ``after`` does not match the
+        sort keys.
+
+        If ``text`` is set, only returns documents matching that search
+        string, ordered by relevance (see ``_TEXT_SEARCH``). Text searches
+        are paged with ``skip`` and raise :class:`ValueError` if ``after`` or
+        ``sort`` is set.
+
+        If ``raw`` is set (defaults to ``_RAW_READS``), returns a list of
+        dictionaries keyed by field names instead of a query object. Raw reads
+        skip :class:`mongoengine.Document` instantiation entirely.
 
         :param query: A raw dictionary-styled ``pymongo`` query
-        :param fields: A list or tuple of explicitly desired fields
+        :param fields: A list or tuple of explicitly desired fields (in
+            dot-notation)
         :param limit: The maximum number of documents to return
         :param skip: The number of documents to skip
-        :return: A MongoEngine query object
+        :param after: A list of sort key values (e.g. ``[ObjectId(...)]``)
+        :param raw: Returns dictionaries instead of documents if ``True``
+        :param text: A text search string
+        :param sort: A list of sort keys (e.g. ``['-year', 'title']``)
+        :return: A MongoEngine query object or a list of dictionaries
+        """
+        if raw is None:
+            raw = self._RAW_READS
+        results, ranking = self._queryset(
+            query, fields, limit, skip, after, text=text, sort=sort)
+        if raw:
+            results = list(results.as_pymongo())
+            with timing.stage('build'):
+                results = [_from_pymongo(self.collection, r) for r in results]
+            return _ranked(results, ranking)
+        return _ranked(results.all(), ranking)
+
+    @timing.timed('iterate')
+    def iterate(self, query=None, fields=None, limit=100, skip=0,
+                after=None, raw=None, text=None, sort=None):
+        """
+        Iterates over documents from the requested collection. Accepts the
+        same arguments as :meth:`retrieve`, but returns a generator that reads
+        the cursor in batches of ``_BATCH_SIZE`` documents without caching
+        them, so memory use does not grow with ``limit``. Local text searches
+        read their page of documents at once.
+
+        :return: A generator of documents or dictionaries
+        """
+        if raw is None:
+            raw = self._RAW_READS
+        results, ranking = self._queryset(
+            query, fields, limit, skip, after, cache=False, text=text,
+            sort=sort)
+        if raw:
+            results = (_from_pymongo(self.collection, r)
+                       for r in results.as_pymongo())
+        if ranking is not None:
+            results = _ranked(list(results), ranking)
+        return (doc for doc in results)
+
+    def _queryset(self, query=None, fields=None, limit=100, skip=0,
+                  after=None, cache=True, text=None, sort=None):
+        """
+        Builds a sliced query object ordered by ``sort`` keys (then ``_id``)
+        for :meth:`retrieve` and :meth:`iterate`. Fields are filtered before the query object is
+        sliced, since slicing builds the cursor, and always include the sort
+        keys (see :meth:`cursor_values`). If ``cache`` is not set,
+        results are read in batches of ``_BATCH_SIZE`` and not cached.
+
+        Text searches are ordered by text score (then ``_id``) instead. Local
+        text searches rank and slice matching ids in-process, then read the
+        page of documents by id.
+
+        :return: A two-tuple in the form of (``results``, ``ranking``), where
+            ``ranking`` lists the ids of a local text search in order (or is
+            ``None``)
         """
         query = query or {}
         fields = fields or ()
@@ -182,12 +923,182 @@ class CollectionResource(index.IndexResource):
         assert not isinstance(fields, str)
         assert isinstance(limit, int)
         assert isinstance(skip, int)
+        assert after is None or isinstance(after, (list, tuple))
 
-        # Process query:
-        limit += skip
-        results = self.collection.objects(__raw__=query)[skip:limit]
-        # Filter fields:
+        if text is not None and after:
+            raise ValueError('Text searches cannot be paged with cursors.')
+        if text is not None and sort:
+            raise ValueError('Text searches are ordered by relevance.')
+
+        spec = self.sort_spec(sort)
+        ranking = None
+        if text is not None and self.text_search == 'local':
+            ranking = self._local_search(query, text)[skip:skip + limit]
+            query, skip = {'_id': {'$in': ranking}}, 0
+        elif after:
+            query = self._seek_query(query, after, spec)
+        results = self._objects(query)
+        if text is None:
+            results = results.order_by(*(
+                ('-' if direction < 0 else '+') + name
+                for name, direction in spec))
+        elif ranking is None:
+            results = results.search_text(text).order_by('$text_score', 'id')
+        fields = _projection(self.collection, fields)
         if fields:
+            # Sort keys are projected too, so cursors can seek past results:
+            fields += tuple(name for name, _ in spec if name not in fields)
             results = results.only(*fields)
-        # Return results:
-        return results.all()
+        if not cache:
+            results = results.no_cache().batch_size(self._BATCH_SIZE)
+        return results[skip:skip + limit], ranking
+
+    @timing.timed('count')
+    def count(self, query=None, mode='exact', text=None):
+        """
+        Counts the documents matching a dictionary-styled ``pymongo`` query.
+        The counting strategy depends on ``mode``:
+
+            * ``exact``: Counts every matching document
+            * ``estimated``: Reads the document count from collection
+              metadata if there is no query (note that this includes any
+              other document classes stored in the same collection),
+              otherwise falls back to ``exact``
+            * ``capped``: Counts up to ``_COUNT_CAP`` documents and returns a
+              string in the form of ``'N+'`` if there are more
+            * ``none``: Skips counting and returns ``None``
+
+        If ``text`` is set, only counts documents matching that search string.
+        Raises :class:`ValueError` if ``mode`` is unknown.
+
+        :param query: A raw dictionary-styled ``pymongo`` query
+        :param mode: A count mode (default ``'exact'``)
+        :param text: A text search string
+        :return: An integer, a ``'N+'`` string or ``None``
+        """
+        query = query or {}
+
+        assert isinstance(query, dict)
+
+        if mode == 'none':
+            return None
+        if text is not None:
+            query = self.text_query(query, text)
+        if mode == 'estimated' and not query:
+            collection = self.collection._get_collection()
+            if self.read_preference is not None:
+                collection = collection.with_options(
+                    read_preference=self.read_preference)
+            return collection.estimated_document_count()
+        elif mode in ('exact', 'estimated'):
+            return self._objects(query).count()
+        elif mode == 'capped':
+            cap = self._COUNT_CAP
+            results = self._objects(query).limit(cap + 1)
+            count = results.count(with_limit_and_skip=True)
+            return count if count <= cap else '{}+'.format(cap)
+        raise ValueError('Invalid count mode: {}'.format(mode))
+
+    def text_query(self, query, text):
+        """
+        Combines a raw query with a text search (without ordering results by
+        relevance), e.g. for counts and bulk writes. Local text searches are
+        resolved into a list of matching ids.
+
+        :param query: A raw dictionary-styled ``pymongo`` query
+        :param text: A text search string
+        :return: A raw dictionary-styled ``pymongo`` query
+        """
+        if self.text_search == 'local':
+            return {'_id': {'$in': self._local_search(query, text)}}
+        query = dict(query or {})
+        query['$text'] = {'$search': text}
+        return query
+
+    def _local_search(self, query, text):
+        """
+        Returns the ids of documents matching a raw query and a text search
+        string, ranked by an in-process inverted index of the collection.
+        """
+        index = search.get_index(self.collection, self._text_weights())
+        ids = index.search(text)
+        if query and ids:
+            query = {'$and': [query, {'_id': {'$in': ids}}]}
+            matching = set(self._objects(query).scalar('id'))
+            ids = [doc_id for doc_id in ids if doc_id in matching]
+        return ids
+
+    def _text_weights(self):
+        """
+        Returns the weights of text fields keyed by raw ``pymongo`` paths.
+        Raises :class:`ValueError` if the collection has no text fields.
+        """
+        fields = self.text_fields
+        if not fields:
+            msg = '{} has no text fields.'.format(self.collection.__name__)
+            raise ValueError(msg)
+        return {_db_path(self.collection, name): weight
+                for name, weight in fields.items()}
+
+    def _objects(self, query):
+        """
+        Returns a query object for collection reads (i.e. :meth:`retrieve`,
+        :meth:`iterate` and :meth:`count`), using this resource's read
+        preference and read concern. Writes and individual document reads
+        always use the connection's settings.
+
+        :param query: A raw dictionary-styled ``pymongo`` query
+        :return: A MongoEngine query object
+        """
+        results = self.collection.objects(__raw__=query)
+        if self.read_preference is not None:
+            results = results.read_preference(self.read_preference)
+        if self.read_concern is not None:
+            results = results.read_concern(self.read_concern)
+        return results
+
+    def _seek_query(self, query, after, spec):
+        """
+        Combines a raw query with a condition that seeks past the sort key
+        values of the last document of a previous page, i.e. documents sorted
+        after the first key's value, or equal to it and sorted after the
+        second key's value, and so on. Raises :class:`ValueError` if the
+        values do not match the sort keys. Values are always compared with
+        explicit operators, so they are never interpreted as operators.
+
+        :param query: A raw dictionary-styled ``pymongo`` query
+        :param after: A list of sort key values ending with an ``_id``
+        :param spec: The output of :meth:`sort_spec`
+        :return: A raw dictionary-styled ``pymongo`` query
+        """
+        if len(after) != len(spec):
+            raise ValueError('Cursor does not match the sort keys.')
+        clauses, equal = [], {}
+        for (name, direction), value in zip(spec, after):
+            path = _db_path(self.collection, name)
+            condition = _after(path, direction, value)
+            if condition is not None:
+                clauses.append(dict(equal, **condition))
+            equal[path] = {'$eq': value}
+        seek = clauses[0] if len(clauses) == 1 else {'$or': clauses}
+        if query:
+            return {'$and': [query, seek]}
+        return seek
+
+    def cursor_values(self, document, sort=None):
+        """
+        Returns the sort key values used to seek past ``document`` when
+        retrieving the next page of results.
+
+        :param document: A :class:`mongoengine.Document` or a raw dictionary
+        :param sort: The sort keys of the retrieved results
+        :return: A list of sort key values
+        """
+        values = []
+        for name, _ in self.sort_spec(sort):
+            value = _path_value(document, name)
+            if value is not None:
+                field = self.collection._lookup_field(name.split('.'))[-1]
+                value = field.to_mongo(value)
+            values.append(value)
+        return values
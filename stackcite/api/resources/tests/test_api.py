@@ -24,6 +24,66 @@ class SerializableResourceTests(unittest.TestCase):
         self.assertIsInstance(result, Schema)
 
 
+    def test_schema_returns_cached_instance(self):
+        """SerializableResource.schema() returns the same instance for the same options
+        """
+        resource = testing.mock.MockAPICollectionResource()
+        expected = resource.schema(strict=True, exclude=('limit',))
+        result = resource.schema(strict=True, exclude=['limit'])
+        self.assertIs(expected, result)
+
+    def test_schema_returns_new_instance_for_different_options(self):
+        """SerializableResource.schema() returns different instances for different options
+        """
+        resource = testing.mock.MockAPICollectionResource()
+        schm = resource.schema(strict=True)
+        result = resource.schema(strict=True, only=('name',))
+        self.assertIsNot(schm, result)
+
+    def test_schema_returns_cached_instance_by_method(self):
+        """SerializableResource.schema() returns a frozen instance with the requested method
+        """
+        resource = testing.mock.MockAPICollectionResource()
+        schm = resource.schema(strict=True)
+        result = resource.schema(strict=True, method='POST')
+        self.assertIsNot(schm, result)
+        self.assertEqual('POST', result.method)
+        self.assertIs(result, resource.schema(strict=True, method='POST'))
+
+    def test_schema_treats_empty_only_as_all_fields(self):
+        """SerializableResource.schema() treats an empty `only` as all fields
+        """
+        resource = testing.mock.MockAPICollectionResource()
+        expected = resource.schema(strict=True)
+        result = resource.schema(strict=True, only=())
+        self.assertIs(expected, result)
+
+    def test_schema_raises_exception_for_invalid_only(self):
+        """SerializableResource.schema() raises ValidationError for unknown field names in `only`
+        """
+        resource = testing.mock.MockAPICollectionResource()
+        from marshmallow import ValidationError
+        with self.assertRaises(ValidationError):
+            resource.schema(strict=True, only=('name', 'unknown'))
+
+    def test_schema_returns_frozen_instance(self):
+        """SerializableResource.schema() returns a schema that cannot be modified
+        """
+        resource = testing.mock.MockAPICollectionResource()
+        schm = resource.schema(strict=True)
+        with self.assertRaises(AttributeError):
+            schm.only = ('name',)
+
+    def test_schema_does_not_cache_other_options(self):
+        """SerializableResource.schema() returns a new instance for other options
+        """
+        resource = testing.mock.MockAPICollectionResource()
+        schm = resource.schema(context={'method': 'POST'})
+        result = resource.schema(context={'method': 'POST'})
+        self.assertIsNot(schm, result)
+        schm.only = ('name',)
+
+
 class APIResourceTests(unittest.TestCase):
 
     layer = testing.layers.MongoTestLayer
@@ -251,7 +311,11 @@ class APICollectionTests(APIResourceTests):
         expected = {
             'fields': (),
             'limit': 100,
-            'skip': 0}
+            'skip': 0,
+            'after': None,
+            'count': 'exact',
+            'stream': False,
+            'sort': ()}
         query, results = self.col_resource.get_params({})
         self.assertEqual(expected, results)
 
@@ -298,3 +362,216 @@ class APICollectionTests(APIResourceTests):
             'skip': 13}
         query, result = self.col_resource.get_params(source)
         self.assertEqual(13, result['skip'])
+
+    def test_after_set(self):
+        """APICollection.get_params() extracts a value for after
+        """
+        from bson import ObjectId
+        source = {
+            'name': 'Document 0',
+            'after': [ObjectId()]}
+        query, result = self.col_resource.get_params(source)
+        self.assertEqual(source['after'], result['after'])
+
+    def test_retrieve_after_returns_next_page(self):
+        """APICollection.retrieve() returns documents following the `after` cursor
+        """
+        docs = testing.mock.utils.create_mock_data(save=True)
+        results = self.col_resource.retrieve({}, limit=4, after=[docs[3].id])
+        self.assertEqual([4, 5, 6, 7], [d.number for d in results])
+
+    def test_next_cursor_points_past_last_document(self):
+        """APICollection.next_cursor() encodes the last document of a full page
+        """
+        docs = testing.mock.utils.create_mock_data(4, save=True)
+        cursor = self.col_resource.next_cursor(docs, 4)
+        from stackcite.api import utils
+        self.assertEqual([docs[-1].id], utils.decode_cursor(cursor))
+
+    def test_next_cursor_returns_none_for_last_page(self):
+        """APICollection.next_cursor() returns None if the page is not full
+        """
+        docs = testing.mock.utils.create_mock_data(3, save=True)
+        result = self.col_resource.next_cursor(docs, 4)
+        self.assertIsNone(result)
+
+    def test_next_cursor_encodes_sort_key_values(self):
+        """APICollection.next_cursor() encodes the sort key values of the last document
+        """
+        from stackcite.api import utils
+        docs = testing.mock.utils.create_mock_data(4, save=True)
+        cursor = self.col_resource.next_cursor(docs, 4, sort=['-name'])
+        expected = [docs[-1].name, docs[-1].id]
+        self.assertEqual(expected, utils.decode_cursor(cursor))
+
+    def test_retrieve_rejects_invalid_sort_keys(self):
+        """APICollection.retrieve() raises ValidationError for keys that cannot be sorted by
+        """
+        from marshmallow import ValidationError
+        with self.assertRaises(ValidationError) as cm:
+            self.col_resource.retrieve(sort=['number'])
+        self.assertIn('sort', cm.exception.messages)
+
+    def test_next_cursor_returns_none_for_text_searches(self):
+        """APICollection.next_cursor() returns None for text searches
+        """
+        docs = testing.mock.utils.create_mock_data(4, save=True)
+        result = self.col_resource.next_cursor(docs, 4, {'q': 'document'})
+        self.assertIsNone(result)
+
+    def test_retrieve_searches_text_with_q(self):
+        """APICollection.retrieve() compiles `q` into a text search
+        """
+        from unittest.mock import patch
+        from stackcite.api.resources import mongo
+        with patch.object(mongo.CollectionResource, 'retrieve') as retrieve:
+            self.col_resource.retrieve({'q': 'notes', 'fact': True})
+        retrieve.assert_called_once_with(
+            {'fact': True}, None, 100, 0, None, None, 'notes', None)
+
+    def test_retrieve_does_not_modify_query(self):
+        """APICollection.retrieve() does not remove `q` or `ids` from the query
+        """
+        from bson import ObjectId
+        query = {'q': 'notes', 'ids': [str(ObjectId())]}
+        expected = dict(query)
+        self.col_resource._TEXT_SEARCH = 'local'
+        self.col_resource.retrieve(query)
+        self.assertEqual(expected, query)
+
+    def test_count_searches_text_with_q(self):
+        """APICollection.count() counts documents matching `q`
+        """
+        from stackcite.api import search
+        search.invalidate(testing.mock.MockDocument)
+        testing.mock.utils.create_mock_data(4, save=True)
+        testing.mock.MockDocument(name='Some notes').save()
+        self.col_resource._TEXT_SEARCH = 'local'
+        self.assertEqual(1, self.col_resource.count({'q': 'notes'}))
+
+    def test_delete_many_searches_text_with_q(self):
+        """APICollection.delete_many() deletes documents matching `q`
+        """
+        from stackcite.api import search
+        search.invalidate(testing.mock.MockDocument)
+        testing.mock.utils.create_mock_data(4, save=True)
+        testing.mock.MockDocument(name='Some notes').save()
+        self.col_resource._TEXT_SEARCH = 'local'
+        result = self.col_resource.delete_many({'q': 'notes'})
+        self.assertEqual({'deleted': 1}, result)
+        self.assertEqual(4, testing.mock.MockDocument.objects.count())
+
+    def test_count_counts_matching_ids(self):
+        """APICollection.count() counts documents listed in ids
+        """
+        docs = testing.mock.utils.create_mock_data(count=8, save=True)
+        query = {'ids': [str(d.id) for d in docs[:3]]}
+        result = self.col_resource.count(query)
+        self.assertEqual(3, result)
+
+    def test_count_does_not_modify_query(self):
+        """APICollection.count() does not modify the source query
+        """
+        docs = testing.mock.utils.create_mock_data(count=8, save=True)
+        query = {'ids': [str(d.id) for d in docs[:3]]}
+        self.col_resource.count(query)
+        self.assertIn('ids', query)
+
+    def test_update_many_updates_matching_ids(self):
+        """APICollection.update_many() updates documents listed in ids
+        """
+        docs = testing.mock.utils.create_mock_data(count=8, save=True)
+        query = {'ids': [str(d.id) for d in docs[:3]]}
+        result = self.col_resource.update_many(query, {'number': 42})
+        self.assertEqual(3, result['matched'])
+        self.assertEqual(
+            3, testing.mock.MockDocument.objects(number=42).count())
+
+    def test_delete_many_deletes_matching_ids(self):
+        """APICollection.delete_many() deletes documents listed in ids
+        """
+        docs = testing.mock.utils.create_mock_data(count=8, save=True)
+        query = {'ids': [str(d.id) for d in docs[:3]]}
+        result = self.col_resource.delete_many(query)
+        self.assertEqual({'deleted': 3}, result)
+        self.assertEqual(5, testing.mock.MockDocument.objects.count())
+
+
+class APICollectionOperatorTests(APIResourceTests):
+
+    def setUp(self):
+        super().setUp()
+        testing.mock.utils.create_mock_data(count=8, save=True)
+        self.col_resource._UNINDEXED_OPERATORS = ('number', 'fact')
+
+    def test_operator_query_compiles_operators(self):
+        """APICollection._operator_query() compiles operators into pymongo operators
+        """
+        query = {
+            'number__gte': 2, 'number__lt': 5, 'name__prefix': 'Doc.',
+            'fact__exists': True, 'name__in': ['a', 'b']}
+        result = self.col_resource._operator_query(query)
+        expected = {
+            'number': {'$gte': 2, '$lt': 5},
+            'name': {'$regex': r'^Doc\.', '$in': ['a', 'b']},
+            'fact': {'$exists': True}}
+        self.assertEqual(expected, result)
+
+    def test_operator_query_merges_equality(self):
+        """APICollection._operator_query() merges equality tests as $eq
+        """
+        query = {'number': 3, 'number__exists': True}
+        result = self.col_resource._operator_query(query)
+        self.assertEqual({'number': {'$eq': 3, '$exists': True}}, result)
+
+    def test_operator_query_rejects_unindexed_fields(self):
+        """APICollection._operator_query() rejects operators on unindexed fields
+        """
+        from marshmallow import ValidationError
+        self.col_resource._UNINDEXED_OPERATORS = ()
+        with self.assertRaises(ValidationError) as cm:
+            self.col_resource._operator_query({'number__gt': 3})
+        self.assertIn('number__gt', cm.exception.messages)
+
+    def test_operator_query_accepts_indexed_fields(self):
+        """APICollection._operator_query() accepts operators on indexed fields
+        """
+        self.col_resource._UNINDEXED_OPERATORS = ()
+        result = self.col_resource._operator_query({'name__in': ['a']})
+        self.assertEqual({'name': {'$in': ['a']}}, result)
+
+    def test_retrieve_filters_with_operators(self):
+        """APICollection.retrieve() filters documents with query operators
+        """
+        query = {'number__gt': 2, 'number__lte': 5}
+        results = self.col_resource.retrieve(query)
+        self.assertEqual([3, 4, 5], sorted(d.number for d in results))
+
+    def test_retrieve_does_not_modify_query(self):
+        """APICollection.retrieve() does not remove operators from the query
+        """
+        query = {'number__gt': 2}
+        self.col_resource.retrieve(query)
+        self.assertEqual({'number__gt': 2}, query)
+
+    def test_count_counts_with_operators(self):
+        """APICollection.count() counts documents matching query operators
+        """
+        query = {'number__in': [1, 2, 30], 'fact': False}
+        self.assertEqual(1, self.col_resource.count(query))
+
+    def test_update_many_updates_with_operators(self):
+        """APICollection.update_many() updates documents matching query operators
+        """
+        result = self.col_resource.update_many(
+            {'number__lt': 3}, {'fact': True})
+        self.assertEqual(3, result['matched'])
+        self.assertEqual(
+            6, testing.mock.MockDocument.objects(fact=True).count())
+
+    def test_delete_many_deletes_with_operators(self):
+        """APICollection.delete_many() deletes documents matching query operators
+        """
+        result = self.col_resource.delete_many({'name__prefix': 'Document #1'})
+        self.assertEqual({'deleted': 1}, result)
+        self.assertEqual(7, testing.mock.MockDocument.objects.count())
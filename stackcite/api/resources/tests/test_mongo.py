@@ -129,6 +129,128 @@ class CollectionResourceTestCase(MockResourceTestCase):
         with self.assertRaises(NotUniqueError):
             self.col_rec.create(data)
 
+    def test_create_many_returns_documents(self):
+        """CollectionResource.create_many() returns a new document for each item
+        """
+        data = [{'name': 'doc {}'.format(n)} for n in range(4)]
+        results = self.col_rec.create_many(data)
+        for item, doc in zip(data, results):
+            self.assertIsInstance(doc, testing.mock.MockDocument)
+            self.assertEqual(item['name'], doc.name)
+
+    def test_create_many_saves_to_mongo(self):
+        """CollectionResource.create_many() saves new documents to MongoDB
+        """
+        data = [{'name': 'doc {}'.format(n)} for n in range(4)]
+        results = self.col_rec.create_many(data)
+        for doc in results:
+            result = testing.mock.MockDocument.objects.get(id=doc.id)
+            self.assertEqual(result.name, doc.name)
+
+    def test_create_many_returns_validation_errors_per_item(self):
+        """CollectionResource.create_many() returns ValidationError for invalid items
+        """
+        data = [{'name': 'doc 0'}, {'number': 'invalid'}, {'name': 'doc 2'}]
+        results = self.col_rec.create_many(data)
+        from mongoengine import ValidationError
+        self.assertIsInstance(results[1], ValidationError)
+        self.assertEqual(2, testing.mock.MockDocument.objects.count())
+
+    def test_create_many_returns_unique_errors_per_item(self):
+        """CollectionResource.create_many() returns NotUniqueError for duplicate items
+        """
+        self.make_data(3, save=True)
+        data = [{'name': 'doc 0'}, {'name': 'document 1'}, {'name': 'doc 2'}]
+        results = self.col_rec.create_many(data)
+        from mongoengine import NotUniqueError
+        self.assertIsInstance(results[1], NotUniqueError)
+        self.assertIsInstance(results[2], testing.mock.MockDocument)
+
+    def test_create_many_ordered_stops_at_first_error(self):
+        """CollectionResource.create_many() stops at the first failed item if ordered
+        """
+        self.make_data(3, save=True)
+        data = [{'name': 'doc 0'}, {'name': 'document 1'}, {'name': 'doc 2'}]
+        results = self.col_rec.create_many(data, ordered=True)
+        self.assertIsInstance(results[0], testing.mock.MockDocument)
+        self.assertIsNone(results[2])
+        self.assertEqual(4, testing.mock.MockDocument.objects.count())
+
+    def test_create_many_ordered_stops_at_first_invalid_item(self):
+        """CollectionResource.create_many() stops at the first invalid item if ordered
+        """
+        data = [{'name': 'doc 0'}, {'number': 'invalid'}, {'name': 'doc 2'}]
+        results = self.col_rec.create_many(data, ordered=True)
+        self.assertIsNone(results[2])
+        self.assertEqual(1, testing.mock.MockDocument.objects.count())
+
+    def test_update_many_updates_matching_docs(self):
+        """CollectionResource.update_many() updates all documents matching query
+        """
+        self.make_data(save=True)
+        self.col_rec.update_many({'fact': True}, {'number': 42})
+        results = testing.mock.MockDocument.objects(number=42)
+        self.assertEqual(8, results.count())
+        for doc in results:
+            self.assertTrue(doc.fact)
+
+    def test_update_many_returns_counts(self):
+        """CollectionResource.update_many() returns matched and modified counts
+        """
+        self.make_data(save=True)
+        result = self.col_rec.update_many({'fact': True}, {'fact': True})
+        expected = {'matched': 8, 'modified': 0}
+        self.assertEqual(expected, result)
+
+    def test_update_many_increments_version(self):
+        """CollectionResource.update_many() increments the version field of modified docs if _VERSION_FIELD is set
+        """
+        docs = self.make_data(save=True)
+        self.col_rec._VERSION_FIELD = 'number'
+        self.col_rec.update_many(
+            {'_id': docs[0].id}, {'name': 'Changed', 'number': -1})
+        result = testing.mock.MockDocument.objects.get(id=docs[0].id)
+        self.assertEqual('Changed', result.name)
+        self.assertEqual(docs[0].number + 1, result.number)
+
+    def test_update_many_raises_exception_if_data_is_invalid(self):
+        """CollectionResource.update_many() raises ValidationError if models is invalid
+        """
+        self.make_data(save=True)
+        from mongoengine import ValidationError
+        with self.assertRaises(ValidationError):
+            self.col_rec.update_many({'fact': True}, {'number': 'invalid'})
+
+    def test_update_many_raises_exception_if_unique_field_already_exists(self):
+        """CollectionResource.update_many() raises NotUniqueError if unique field already exists
+        """
+        self.make_data(save=True)
+        from mongoengine import NotUniqueError
+        with self.assertRaises(NotUniqueError):
+            self.col_rec.update_many({'fact': True}, {'name': 'document 0'})
+
+    def test_delete_many_deletes_matching_docs(self):
+        """CollectionResource.delete_many() deletes all documents matching query
+        """
+        self.make_data(save=True)
+        result = self.col_rec.delete_many({'fact': True})
+        self.assertEqual({'deleted': 8}, result)
+        remaining = testing.mock.MockDocument.objects
+        self.assertEqual(8, remaining.count())
+        for doc in remaining:
+            self.assertFalse(doc.fact)
+
+    def test_delete_many_calls_document_delete_if_document_deletes_is_set(self):
+        """CollectionResource.delete_many() calls each document's delete() if _DOCUMENT_DELETES is set
+        """
+        self.make_data(4, save=True)
+        self.col_rec._DOCUMENT_DELETES = True
+        from unittest import mock
+        with mock.patch.object(testing.mock.MockDocument, 'delete') as delete:
+            result = self.col_rec.delete_many({})
+        self.assertEqual(4, delete.call_count)
+        self.assertEqual({'deleted': 4}, result)
+
     def test_retrieve_accepts_valid_query_types(self):
         """CollectionResource.retrieve() does not raise TypeError if query is a dict or None
         """
@@ -169,6 +291,14 @@ class CollectionResourceTestCase(MockResourceTestCase):
         for doc in results:
             self.assertIsNone(doc.name)
 
+    def test_retrieve_loads_all_fields_if_a_field_is_not_a_document_field(self):
+        """CollectionResource.retrieve() loads whole documents if a field cannot be projected
+        """
+        self.make_data(3, save=True)
+        results = self.col_rec.retrieve(fields=['number', 'computed'])
+        for doc in results:
+            self.assertIsNotNone(doc.name)
+
     def test_retrieve_limit_default_100(self):
         """CollectionResource.retrieve() limits 100 results by default
         """
@@ -202,6 +332,192 @@ class CollectionResourceTestCase(MockResourceTestCase):
         self.assertEqual(results[0], 'document 42')
         self.assertEqual(results[-1], 'document 141')
 
+    def test_retrieve_after_seeks_past_cursor(self):
+        """CollectionResource.retrieve() returns documents following the `after` cursor
+        """
+        docs = self.make_data(20, save=True)
+        results = self.col_rec.retrieve(limit=5, after=[docs[9].id])
+        results = [x.name for x in results]
+        expected = ['document {}'.format(n) for n in range(10, 15)]
+        self.assertEqual(expected, results)
+
+    def test_retrieve_after_applies_query(self):
+        """CollectionResource.retrieve() combines the `after` cursor with a query
+        """
+        docs = self.make_data(20, save=True)
+        query = {'fact': True}
+        results = self.col_rec.retrieve(query, after=[docs[9].id])
+        results = [x.number for x in results]
+        expected = [11, 13, 15, 17, 19]
+        self.assertEqual(expected, results)
+
+    def test_retrieve_after_last_document_returns_nothing(self):
+        """CollectionResource.retrieve() returns nothing after the last document
+        """
+        docs = self.make_data(5, save=True)
+        results = self.col_rec.retrieve(after=[docs[-1].id])
+        self.assertEqual([], [x for x in results])
+
+    def test_count_exact_counts_matching_docs(self):
+        """CollectionResource.count() counts all documents matching query
+        """
+        self.make_data(save=True)
+        result = self.col_rec.count({'fact': True})
+        self.assertEqual(8, result)
+
+    def test_count_estimated_counts_all_docs_without_query(self):
+        """CollectionResource.count() estimates the number of documents without a query
+        """
+        self.make_data(save=True)
+        result = self.col_rec.count(mode='estimated')
+        self.assertEqual(16, result)
+
+    def test_count_estimated_counts_matching_docs_with_query(self):
+        """CollectionResource.count() counts matching documents if 'estimated' with a query
+        """
+        self.make_data(save=True)
+        result = self.col_rec.count({'fact': True}, mode='estimated')
+        self.assertEqual(8, result)
+
+    def test_count_estimated_honors_read_preference(self):
+        """CollectionResource.count() estimates the number of documents with a read preference
+        """
+        self.make_data(save=True)
+        self.col_rec._READ_PREFERENCE = 'secondaryPreferred'
+        result = self.col_rec.count(mode='estimated')
+        self.assertEqual(16, result)
+
+    def test_retrieve_uses_read_preference(self):
+        """CollectionResource.retrieve() reads with the resource's read preference
+        """
+        self.make_data(3, save=True)
+        self.col_rec._READ_PREFERENCE = 'secondaryPreferred'
+        results = self.col_rec.retrieve()
+        from pymongo import ReadPreference
+        expected = ReadPreference.SECONDARY_PREFERRED
+        self.assertEqual(expected, results._read_preference)
+        self.assertEqual(3, len(list(results)))
+
+    def test_retrieve_uses_read_concern(self):
+        """CollectionResource.retrieve() reads with the resource's read concern
+        """
+        self.col_rec._READ_CONCERN = 'majority'
+        results = self.col_rec.retrieve()
+        self.assertEqual('majority', results._read_concern.level)
+
+    def test_read_preference_defaults_to_connection(self):
+        """CollectionResource.read_preference is None unless _READ_PREFERENCE is set
+        """
+        self.assertIsNone(self.col_rec.read_preference)
+        self.assertIsNone(self.col_rec.read_concern)
+
+    def test_count_capped_counts_docs_below_cap(self):
+        """CollectionResource.count() returns an exact count below the cap
+        """
+        self.make_data(save=True)
+        result = self.col_rec.count(mode='capped')
+        self.assertEqual(16, result)
+
+    def test_count_capped_reports_cap_above_cap(self):
+        """CollectionResource.count() returns 'N+' above the cap
+        """
+        self.make_data(save=True)
+        self.col_rec._COUNT_CAP = 10
+        result = self.col_rec.count(mode='capped')
+        self.assertEqual('10+', result)
+
+    def test_count_none_returns_none(self):
+        """CollectionResource.count() returns None if mode is 'none'
+        """
+        self.make_data(save=True)
+        result = self.col_rec.count(mode='none')
+        self.assertIsNone(result)
+
+    def test_count_raises_exception_for_invalid_mode(self):
+        """CollectionResource.count() raises ValueError for an invalid mode
+        """
+        with self.assertRaises(ValueError):
+            self.col_rec.count(mode='invalid')
+
+    def test_retrieve_raw_returns_dicts(self):
+        """CollectionResource.retrieve() returns dictionaries if raw is set
+        """
+        self.make_data(3, save=True)
+        results = self.col_rec.retrieve(raw=True)
+        for result in results:
+            self.assertIsInstance(result, dict)
+
+    def test_retrieve_raw_returns_field_names(self):
+        """CollectionResource.retrieve() returns dictionaries keyed by field names if raw is set
+        """
+        docs = self.make_data(3, save=True)
+        results = self.col_rec.retrieve(raw=True)
+        for doc, result in zip(docs, results):
+            expected = {
+                'id': doc.id,
+                'name': doc.name,
+                'number': doc.number,
+                'fact': doc.fact}
+            self.assertEqual(expected, result)
+
+    def test_retrieve_raw_only_returns_explicitly_named_fields(self):
+        """CollectionResource.retrieve() only returns explicitly named fields if raw is set
+        """
+        self.make_data(3, save=True)
+        results = self.col_rec.retrieve(fields=['number'], raw=True)
+        for result in results:
+            self.assertCountEqual(['id', 'number'], result.keys())
+
+    def test_retrieve_raw_defaults_to_raw_reads(self):
+        """CollectionResource.retrieve() returns dictionaries if _RAW_READS is set
+        """
+        self.make_data(3, save=True)
+        self.col_rec._RAW_READS = True
+        results = self.col_rec.retrieve()
+        for result in results:
+            self.assertIsInstance(result, dict)
+
+    def test_iterate_returns_matching_docs(self):
+        """CollectionResource.iterate() yields the same documents as retrieve()
+        """
+        self.make_data(5, save=True)
+        query = {'number': {'$gt': 1}}
+        expected = list(self.col_rec.retrieve(query))
+        result = list(self.col_rec.iterate(query))
+        self.assertEqual(expected, result)
+
+    def test_iterate_applies_limit_and_skip_across_batches(self):
+        """CollectionResource.iterate() applies limit and skip when reading several batches
+        """
+        docs = self.make_data(10, save=True)
+        self.col_rec._BATCH_SIZE = 3
+        result = [doc.id for doc in self.col_rec.iterate(limit=7, skip=2)]
+        expected = sorted(doc.id for doc in docs)[2:9]
+        self.assertEqual(expected, result)
+
+    def test_iterate_raw_yields_dicts(self):
+        """CollectionResource.iterate() yields dictionaries if raw is set
+        """
+        self.make_data(3, save=True)
+        results = list(self.col_rec.iterate(fields=['number'], raw=True))
+        self.assertEqual(3, len(results))
+        for result in results:
+            self.assertCountEqual(['id', 'number'], result.keys())
+
+    def test_cursor_values_accepts_raw_document(self):
+        """CollectionResource.cursor_values() returns the id of a raw dictionary
+        """
+        self.make_data(1, save=True)
+        result = self.col_rec.retrieve(raw=True)[0]
+        self.assertEqual([result['id']], self.col_rec.cursor_values(result))
+
+    def test_cursor_values_returns_document_id(self):
+        """CollectionResource.cursor_values() returns the document's id
+        """
+        doc = self.make_data(1, save=True)[0]
+        result = self.col_rec.cursor_values(doc)
+        self.assertEqual([doc.id], result)
+
     def test_retrieve_returns_empty_list_if_nothing_found(self):
         """CollectionResource.retrieve() returns empty list if nothing is found
         """
@@ -276,6 +592,35 @@ class DocumentResourceTestCase(MockResourceTestCase):
         result = self.doc_rec.retrieve(fields)
         self.assertIsNone(result.number)
 
+    def test_retrieve_raw_returns_dict(self):
+        """DocumentResource.retrieve() returns a dictionary if raw is set
+        """
+        result = self.doc_rec.retrieve(raw=True)
+        self.assertIsInstance(result, dict)
+        self.assertEqual(result['id'], self.doc_ids[0])
+
+    def test_retrieve_raw_only_returns_explicitly_named_fields(self):
+        """DocumentResource.retrieve() only returns explicitly named fields if raw is set
+        """
+        result = self.doc_rec.retrieve(['name'], raw=True)
+        self.assertCountEqual(['id', 'name'], result.keys())
+
+    def test_retrieve_raw_raises_exception_if_doc_does_not_exist(self):
+        """DocumentResource.retrieve() raises DoesNotExist if raw is set and document does not exist
+        """
+        from bson import ObjectId
+        bad_doc_rec = self.col_rec[ObjectId()]
+        from mongoengine import DoesNotExist
+        with self.assertRaises(DoesNotExist):
+            bad_doc_rec.retrieve(raw=True)
+
+    def test_update_ignores_raw_reads(self):
+        """DocumentResource.update() returns a document even if _RAW_READS is set
+        """
+        self.col_rec._RAW_READS = True
+        result = self.doc_rec.update({'name': 'new name'})
+        self.assertIsInstance(result, testing.mock.MockDocument)
+
     def test_update_returns_true(self):
         """DocumentResource.update() returns document if successful
         """
@@ -312,9 +657,549 @@ class DocumentResourceTestCase(MockResourceTestCase):
         with self.assertRaises(ValidationError):
             self.doc_rec.update(update)
 
+    def test_update_atomic_returns_updated_document(self):
+        """DocumentResource.update() returns the updated document if atomic is set
+        """
+        update = {'name': 'new name'}
+        result = self.doc_rec.update(update, atomic=True)
+        self.assertIsInstance(result, testing.mock.MockDocument)
+        self.assertEqual(result.name, update['name'])
+
+    def test_update_atomic_saves_to_mongodb(self):
+        """DocumentResource.update() saves changes to MongoDB if atomic is set
+        """
+        update = {'name': 'new name'}
+        self.doc_rec.update(update, atomic=True)
+        result = testing.mock.MockDocument.objects.get(id=self.doc_ids[0])
+        self.assertEqual(result.name, update['name'])
+
+    def test_update_atomic_preserves_concurrent_changes(self):
+        """DocumentResource.update() does not overwrite other fields if atomic is set
+        """
+        testing.mock.MockDocument.objects(id=self.doc_ids[0]).update(
+            set__number=42)
+        result = self.doc_rec.update({'fact': True}, atomic=True)
+        self.assertEqual(42, result.number)
+
+    def test_update_atomic_unsets_none(self):
+        """DocumentResource.update() unsets fields set to None if atomic is set
+        """
+        self.doc_rec.update({'number': None}, atomic=True)
+        result = testing.mock.MockDocument.objects.get(id=self.doc_ids[0])
+        self.assertIsNone(result.number)
+
+    def test_update_atomic_defaults_to_atomic_updates(self):
+        """DocumentResource.update() updates atomically if _ATOMIC_UPDATES is set
+        """
+        self.col_rec._ATOMIC_UPDATES = True
+        from unittest import mock
+        with mock.patch.object(
+                self.doc_rec, '_update_atomic',
+                wraps=self.doc_rec._update_atomic) as update_atomic:
+            self.doc_rec.update({'name': 'new name'})
+        update_atomic.assert_called_once_with({'name': 'new name'}, None)
+
+    def test_update_atomic_raises_exception_if_document_does_not_exist(self):
+        """DocumentResource.update() raises DoesNotExist if atomic is set and document does not exist
+        """
+        from bson import ObjectId
+        bad_doc_rec = self.col_rec[ObjectId()]
+        from mongoengine import DoesNotExist
+        with self.assertRaises(DoesNotExist):
+            bad_doc_rec.update({'name': 'new name'}, atomic=True)
+
+    def test_update_atomic_raises_exception_if_data_is_invalid(self):
+        """DocumentResource.update() raises ValidationError if atomic is set with invalid number
+        """
+        from mongoengine import ValidationError
+        with self.assertRaises(ValidationError):
+            self.doc_rec.update({'number': 'invalid_number'}, atomic=True)
+
+    def test_update_atomic_raises_exception_if_required_field_is_unset(self):
+        """DocumentResource.update() raises ValidationError if atomic is set and a required field is unset
+        """
+        from mongoengine import ValidationError
+        with self.assertRaises(ValidationError):
+            self.doc_rec.update({'name': None}, atomic=True)
+
+    def test_update_atomic_raises_exception_if_unique_field_already_exists(self):
+        """DocumentResource.update() raises NotUniqueError if atomic is set and unique field already exists
+        """
+        from mongoengine import NotUniqueError
+        with self.assertRaises(NotUniqueError):
+            self.doc_rec.update({'name': 'document 1'}, atomic=True)
+
     def test_delete_removes_from_mongodb(self):
         """DocumentResource.delete() removes the document from MongoDB
         """
         self.doc_rec.delete()
         result = testing.mock.MockDocument.objects(id=self.doc_ids[0])
         self.assertFalse(result)
+
+    def test_delete_returns_true(self):
+        """DocumentResource.delete() returns True if successful
+        """
+        result = self.doc_rec.delete()
+        self.assertTrue(result)
+
+    def test_delete_does_not_remove_other_documents(self):
+        """DocumentResource.delete() only removes the target document from MongoDB
+        """
+        self.doc_rec.delete()
+        result = testing.mock.MockDocument.objects.count()
+        self.assertEqual(19, result)
+
+    def test_delete_raises_exception_if_document_does_not_exist(self):
+        """DocumentResource.delete() raises DoesNotExist if document does not exist
+        """
+        from bson import ObjectId
+        bad_doc_rec = self.col_rec[ObjectId()]
+        from mongoengine import DoesNotExist
+        with self.assertRaises(DoesNotExist):
+            bad_doc_rec.delete()
+
+    def test_delete_does_not_load_document(self):
+        """DocumentResource.delete() does not instantiate the target document
+        """
+        from unittest import mock
+        with mock.patch.object(testing.mock.MockDocument, 'delete') as delete:
+            self.doc_rec.delete()
+        delete.assert_not_called()
+
+    def test_delete_loads_document_if_document_deletes_is_set(self):
+        """DocumentResource.delete() calls the document's delete() if _DOCUMENT_DELETES is set
+        """
+        self.col_rec._DOCUMENT_DELETES = True
+        from unittest import mock
+        with mock.patch.object(testing.mock.MockDocument, 'delete') as delete:
+            self.doc_rec.delete()
+        delete.assert_called_once_with()
+
+    def test_delete_document_deletes_raises_exception_if_document_does_not_exist(self):
+        """DocumentResource.delete() raises DoesNotExist if _DOCUMENT_DELETES is set and document does not exist
+        """
+        self.col_rec._DOCUMENT_DELETES = True
+        from bson import ObjectId
+        bad_doc_rec = self.col_rec[ObjectId()]
+        from mongoengine import DoesNotExist
+        with self.assertRaises(DoesNotExist):
+            bad_doc_rec.delete()
+
+    def test_version_returns_version_field(self):
+        """DocumentResource.version() returns the value of the version field
+        """
+        self.col_rec._VERSION_FIELD = 'number'
+        doc = testing.mock.MockDocument.objects.get(id=self.doc_rec.id)
+        self.assertEqual(doc.number, self.doc_rec.version())
+
+    def test_update_increments_version(self):
+        """DocumentResource.update() increments the version field if _VERSION_FIELD is set
+        """
+        self.col_rec._VERSION_FIELD = 'number'
+        expected = self.doc_rec.version() + 1
+        for atomic in (False, True):
+            result = self.doc_rec.update({'number': -1}, atomic=atomic)
+            self.assertEqual(expected, result.number)
+            self.assertEqual(expected, self.doc_rec.version())
+            expected += 1
+
+    def test_update_with_stale_version_raises_exception(self):
+        """DocumentResource.update() raises SaveConditionError if the version does not match
+        """
+        self.col_rec._VERSION_FIELD = 'number'
+        stale = self.doc_rec.version() - 1
+        from mongoengine.errors import SaveConditionError
+        for atomic in (False, True):
+            with self.assertRaises(SaveConditionError):
+                self.doc_rec.update({'name': 'new name'}, atomic, stale)
+
+    def test_update_with_current_version_updates_document(self):
+        """DocumentResource.update() updates the document if the version matches
+        """
+        self.col_rec._VERSION_FIELD = 'number'
+        for atomic in (False, True):
+            version = self.doc_rec.version()
+            result = self.doc_rec.update(
+                {'name': 'version {}'.format(version)}, atomic, version)
+            self.assertEqual('version {}'.format(version), result.name)
+
+    def test_delete_with_stale_version_raises_exception(self):
+        """DocumentResource.delete() raises SaveConditionError if the version does not match
+        """
+        self.col_rec._VERSION_FIELD = 'number'
+        stale = self.doc_rec.version() - 1
+        from mongoengine.errors import SaveConditionError
+        for document_deletes in (False, True):
+            self.col_rec._DOCUMENT_DELETES = document_deletes
+            with self.assertRaises(SaveConditionError):
+                self.doc_rec.delete(stale)
+        self.assertTrue(self.doc_rec.retrieve())
+
+    def test_delete_with_current_version_removes_document(self):
+        """DocumentResource.delete() removes the document if the version matches
+        """
+        self.col_rec._VERSION_FIELD = 'number'
+        self.doc_rec.delete(self.doc_rec.version())
+        from mongoengine import DoesNotExist
+        with self.assertRaises(DoesNotExist):
+            self.doc_rec.retrieve()
+
+
+class FromPymongoTestCase(unittest.TestCase):
+    """
+    Unit tests for converting raw ``pymongo`` dictionaries.
+    """
+
+    layer = testing.layers.UnitTestLayer
+
+    import mongoengine
+    class _MockEmbeddedDocument(mongoengine.EmbeddedDocument):
+        import mongoengine
+        first = mongoengine.StringField(db_field='f')
+    class _MockDocument(mongoengine.Document):
+        import mongoengine
+        name = mongoengine.EmbeddedDocumentField(
+            'FromPymongoTestCase._MockEmbeddedDocument', db_field='n')
+        aliases = mongoengine.ListField(mongoengine.EmbeddedDocumentField(
+            'FromPymongoTestCase._MockEmbeddedDocument'))
+        meta = {'allow_inheritance': True}
+
+    def test_converts_db_fields_into_field_names(self):
+        """_from_pymongo() converts nested db field names into field names
+        """
+        from bson import ObjectId
+        from ..mongo import _from_pymongo
+        oid = ObjectId()
+        data = {
+            '_id': oid,
+            '_cls': '_MockDocument',
+            'n': {'f': 'Kim'},
+            'aliases': [{'f': 'K'}]}
+        expected = {
+            'id': oid,
+            'name': {'first': 'Kim'},
+            'aliases': [{'first': 'K'}]}
+        result = _from_pymongo(self._MockDocument, data)
+        self.assertEqual(expected, result)
+
+
+class ProjectionTestCase(unittest.TestCase):
+    """
+    Unit tests for planning database projections.
+    """
+
+    layer = testing.layers.UnitTestLayer
+
+    import mongoengine
+    class _MockEmbeddedDocument(mongoengine.EmbeddedDocument):
+        import mongoengine
+        first = mongoengine.StringField()
+    class _MockDocument(mongoengine.Document):
+        import mongoengine
+        name = mongoengine.EmbeddedDocumentField(
+            'ProjectionTestCase._MockEmbeddedDocument')
+        number = mongoengine.IntField()
+
+    def test_returns_nested_field_paths(self):
+        """_projection() returns dot-notation paths of document fields
+        """
+        from ..mongo import _projection
+        fields = ['id', 'name.first', 'number']
+        result = _projection(self._MockDocument, fields)
+        self.assertEqual(tuple(fields), result)
+
+    def test_returns_empty_projection_for_unknown_field(self):
+        """_projection() returns an empty projection if a field cannot be resolved
+        """
+        from ..mongo import _projection
+        fields = ['name.first', 'name.middle']
+        result = _projection(self._MockDocument, fields)
+        self.assertEqual((), result)
+
+
+class CompileUpdateTestCase(unittest.TestCase):
+    """
+    Unit tests for compiling atomic updates.
+    """
+
+    layer = testing.layers.UnitTestLayer
+
+    import mongoengine
+    class _MockEmbeddedDocument(mongoengine.EmbeddedDocument):
+        import mongoengine
+        first = mongoengine.StringField(db_field='f', required=True)
+        last = mongoengine.StringField()
+    class _MockDocument(mongoengine.Document):
+        import mongoengine
+        name = mongoengine.EmbeddedDocumentField(
+            'CompileUpdateTestCase._MockEmbeddedDocument', db_field='n')
+        number = mongoengine.IntField()
+
+    def test_compiles_nested_fields_into_dotted_paths(self):
+        """_compile_update() compiles embedded documents into dotted db field paths
+        """
+        from ..mongo import _compile_update
+        data = {'name': {'first': 'Kim', 'last': None}, 'number': 3}
+        expected = {
+            '$set': {'n.f': 'Kim', 'number': 3},
+            '$unset': {'n.last': ''}}
+        result = _compile_update(self._MockDocument, data)
+        self.assertEqual(expected, result)
+
+    def test_ignores_unknown_fields(self):
+        """_compile_update() ignores keys that are not document fields
+        """
+        from ..mongo import _compile_update
+        result = _compile_update(self._MockDocument, {'unknown': 1})
+        self.assertEqual({}, result)
+
+    def test_raises_exception_for_invalid_nested_field(self):
+        """_compile_update() raises ValidationError for an invalid embedded value
+        """
+        from ..mongo import _compile_update
+        from mongoengine import ValidationError
+        data = {'name': {'first': None}}
+        with self.assertRaises(ValidationError) as context:
+            _compile_update(self._MockDocument, data)
+        self.assertIn('name', context.exception.to_dict())
+
+    def test_raises_exception_for_primary_key(self):
+        """_compile_update() raises ValidationError if the primary key is changed
+        """
+        from ..mongo import _compile_update
+        from mongoengine import ValidationError
+        from bson import ObjectId
+        with self.assertRaises(ValidationError):
+            _compile_update(self._MockDocument, {'id': ObjectId()})
+
+
+class TextSearchTestCase(MockResourceTestCase):
+    """
+    Integration tests for text searches of :class:`resources.CollectionResource`.
+    """
+
+    def setUp(self):
+        from stackcite.api import search
+        super().setUp()
+        search.invalidate(testing.mock.MockDocument)
+        self.col_rec._TEXT_SEARCH = 'local'
+        names = [
+            'Some Important Document',
+            'Some Other Document',
+            'Important, important notes']
+        self.docs = [testing.mock.MockDocument(name=n, number=i)
+                     for i, n in enumerate(names)]
+        for doc in self.docs:
+            doc.save()
+
+    def test_text_fields_default_to_meta_text_index(self):
+        """CollectionResource.text_fields defaults to the text index declared in meta
+        """
+        self.assertEqual({'name': 1}, self.col_rec.text_fields)
+
+    def test_text_fields_can_be_declared(self):
+        """CollectionResource.text_fields returns declared _TEXT_FIELDS weights
+        """
+        self.col_rec._TEXT_FIELDS = {'name': 10}
+        self.assertEqual({'name': 10}, self.col_rec.text_fields)
+
+    def test_retrieve_text_queryset_sorts_by_text_score(self):
+        """CollectionResource._queryset() searches text and sorts by text score
+        """
+        self.col_rec._TEXT_SEARCH = 'text'
+        results, ranking = self.col_rec._queryset(text='important')
+        self.assertIsNone(ranking)
+        self.assertEqual('important', results._search_text)
+        self.assertEqual(
+            [('_text_score', {'$meta': 'textScore'}), ('_id', 1)],
+            results._ordering)
+
+    def test_retrieve_local_search_ranks_results(self):
+        """CollectionResource.retrieve() ranks local text search results by score
+        """
+        results = self.col_rec.retrieve(text='important')
+        expected = [self.docs[2].id, self.docs[0].id]
+        self.assertEqual(expected, [doc.id for doc in results])
+
+    def test_retrieve_local_search_applies_query(self):
+        """CollectionResource.retrieve() combines local text searches with queries
+        """
+        results = self.col_rec.retrieve({'number': 0}, text='important')
+        self.assertEqual([self.docs[0].id], [doc.id for doc in results])
+
+    def test_retrieve_local_search_excludes_negated_terms(self):
+        """CollectionResource.retrieve() excludes negated terms of local text searches
+        """
+        results = self.col_rec.retrieve(text='document -other', raw=True)
+        self.assertEqual([self.docs[0].id], [doc['id'] for doc in results])
+
+    def test_retrieve_local_search_pages_with_skip(self):
+        """CollectionResource.retrieve() pages local text searches with skip
+        """
+        results = self.col_rec.retrieve(text='important', limit=1, skip=1)
+        self.assertEqual([self.docs[0].id], [doc.id for doc in results])
+
+    def test_retrieve_text_search_rejects_cursors(self):
+        """CollectionResource.retrieve() raises ValueError for text searches with cursors
+        """
+        with self.assertRaises(ValueError):
+            self.col_rec.retrieve(text='important', after=[self.docs[0].id])
+
+    def test_iterate_local_search_ranks_results(self):
+        """CollectionResource.iterate() ranks local text search results by score
+        """
+        results = self.col_rec.iterate(text='important', raw=True)
+        expected = [self.docs[2].id, self.docs[0].id]
+        self.assertEqual(expected, [doc['id'] for doc in results])
+
+    def test_count_local_search(self):
+        """CollectionResource.count() counts documents matching a local text search
+        """
+        self.assertEqual(2, self.col_rec.count(text='important'))
+
+    def test_text_query_adds_text_operator(self):
+        """CollectionResource.text_query() adds a $text operator to a raw query
+        """
+        self.col_rec._TEXT_SEARCH = 'text'
+        expected = {'number': 1, '$text': {'$search': 'notes'}}
+        result = self.col_rec.text_query({'number': 1}, 'notes')
+        self.assertEqual(expected, result)
+
+    def test_writes_invalidate_local_index(self):
+        """CollectionResource writes invalidate the local text index
+        """
+        self.col_rec.retrieve(text='notes')
+        self.col_rec.create({'name': 'More notes'})
+        self.assertEqual(2, self.col_rec.count(text='notes'))
+        self.col_rec[str(self.docs[2].id)].delete()
+        self.assertEqual(1, self.col_rec.count(text='notes'))
+
+    def test_local_search_requires_text_fields(self):
+        """CollectionResource.retrieve() raises ValueError without text fields
+        """
+        self.col_rec._TEXT_FIELDS = {}
+        with self.assertRaises(ValueError):
+            self.col_rec.retrieve(text='important')
+
+
+class SortTestCase(MockResourceTestCase):
+    """
+    Integration tests for sorting :class:`resources.CollectionResource`.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.col_rec._SORT_KEYS = ('number', 'fact')
+        numbers = [3, None, 1, 3, 2, None, 1, 3]
+        self.docs = []
+        for n, number in enumerate(numbers):
+            doc = testing.mock.MockDocument(
+                name='document {}'.format(n), number=number, fact=bool(n % 2))
+            doc.save()
+            self.docs.append(doc)
+
+    def expected(self, key):
+        return [d.id for d in sorted(self.docs, key=key)]
+
+    def page_through(self, sort, limit):
+        results, after = [], None
+        while True:
+            page = list(self.col_rec.retrieve(
+                limit=limit, after=after, sort=sort))
+            results.extend(page)
+            if len(page) < limit:
+                return [d.id for d in results]
+            after = self.col_rec.cursor_values(page[-1], sort)
+
+    def test_sort_spec_appends_id(self):
+        """CollectionResource.sort_spec() sorts by id last
+        """
+        result = self.col_rec.sort_spec(['-number', 'fact'])
+        self.assertEqual([('number', -1), ('fact', 1), ('id', 1)], result)
+
+    def test_sort_spec_keeps_explicit_id(self):
+        """CollectionResource.sort_spec() does not repeat an explicit id key
+        """
+        result = self.col_rec.sort_spec(['-id'])
+        self.assertEqual([('id', -1)], result)
+
+    def test_sort_spec_rejects_unlisted_keys(self):
+        """CollectionResource.sort_spec() raises ValueError for keys missing from _SORT_KEYS
+        """
+        with self.assertRaises(ValueError):
+            self.col_rec.sort_spec(['name'])
+
+    def test_sort_spec_rejects_duplicate_keys(self):
+        """CollectionResource.sort_spec() raises ValueError for repeated keys
+        """
+        with self.assertRaises(ValueError):
+            self.col_rec.sort_spec(['number', '-number'])
+
+    def test_sort_spec_defaults_to_indexed_fields(self):
+        """CollectionResource.sort_spec() accepts indexed fields if _SORT_KEYS is unset
+        """
+        self.col_rec._SORT_KEYS = None
+        self.assertEqual(
+            [('name', -1), ('id', 1)], self.col_rec.sort_spec(['-name']))
+        for key in ('number', 'unknown'):
+            with self.assertRaises(ValueError):
+                self.col_rec.sort_spec([key])
+
+    def test_retrieve_sorts_results(self):
+        """CollectionResource.retrieve() sorts results by sort keys, then id
+        """
+        results = self.col_rec.retrieve(sort=['number'])
+        expected = self.expected(
+            lambda d: (d.number is not None, d.number or 0, d.id))
+        self.assertEqual(expected, [d.id for d in results])
+
+    def test_iterate_sorts_results(self):
+        """CollectionResource.iterate() sorts results by sort keys, then id
+        """
+        results = self.col_rec.iterate(sort=['-fact'], raw=True)
+        expected = self.expected(lambda d: (not d.fact, d.id))
+        self.assertEqual(expected, [d['id'] for d in results])
+
+    def test_retrieve_after_pages_through_ascending_sort(self):
+        """CollectionResource.retrieve() pages through sorted results with cursors
+        """
+        result = self.page_through(['number'], 3)
+        expected = self.expected(
+            lambda d: (d.number is not None, d.number or 0, d.id))
+        self.assertEqual(expected, result)
+
+    def test_retrieve_after_pages_through_mixed_sort(self):
+        """CollectionResource.retrieve() pages through mixed-direction sorts with cursors
+        """
+        result = self.page_through(['-number', 'fact'], 2)
+        expected = self.expected(
+            lambda d: (d.number is None, -(d.number or 0), d.fact, d.id))
+        self.assertEqual(expected, result)
+
+    def test_cursor_values_returns_sort_key_values(self):
+        """CollectionResource.cursor_values() returns sort key values, then the id
+        """
+        doc = self.docs[0]
+        result = self.col_rec.cursor_values(doc, ['-number', 'fact'])
+        self.assertEqual([3, False, doc.id], result)
+
+    def test_retrieve_after_must_match_sort(self):
+        """CollectionResource.retrieve() raises ValueError if a cursor does not match sort keys
+        """
+        after = self.col_rec.cursor_values(self.docs[0])
+        with self.assertRaises(ValueError):
+            self.col_rec.retrieve(after=after, sort=['number'])
+
+    def test_retrieve_after_does_not_interpret_operators(self):
+        """CollectionResource.retrieve() compares cursor values as values rather than operators
+        """
+        after = [{'$ne': None}, {'$ne': None}, self.docs[0].id]
+        result = list(self.col_rec.retrieve(
+            after=after, sort=['number', 'fact']))
+        self.assertEqual([], result)
+
+    def test_text_search_cannot_be_sorted(self):
+        """CollectionResource.retrieve() raises ValueError for sorted text searches
+        """
+        with self.assertRaises(ValueError):
+            self.col_rec.retrieve(text='document', sort=['number'])
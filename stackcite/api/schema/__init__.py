@@ -5,9 +5,16 @@ features.
 """
 
 from . import fields
+from . import operators
 from . import validators
 
 from .schema import (
+    COUNT_EXACT,
+    COUNT_ESTIMATED,
+    COUNT_CAPPED,
+    COUNT_NONE,
+    COUNT_MODES,
+    is_dumpable_path,
     APISchema,
     APIDocumentSchema,
     APICollectionSchema
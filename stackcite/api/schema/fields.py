@@ -1,5 +1,7 @@
 from marshmallow import fields
 
+from stackcite.api import utils
+
 from . import validators
 
 
@@ -170,3 +172,40 @@ class FieldsListField(fields.List):
         else:
             value = value.replace('__', '.').split(',')
         return super()._deserialize(value, attr, data)
+
+
+class SortListField(FieldsListField):
+    """
+    A field that converts an API signature list of sort keys (e.g.
+    ``'-year,title'``) into a python list of sort keys, specified with
+    dot-notation and prefixed with ``-`` for descending order (e.g.
+    ``['-year', 'title']``).
+    """
+    default_error_messages = {'invalid_key': 'Not a valid sort key.'}
+
+    def _deserialize(self, value, attr, data):
+        value = super()._deserialize(value, attr, data)
+        for key in value:
+            if not key.lstrip('-+'):
+                self.fail('invalid_key')
+        return value
+
+
+class CursorField(fields.String):
+    """
+    A field that decodes an opaque pagination cursor (e.g. the ``next`` value
+    returned by a collection view) into a list of sort key values.
+
+    :param args: The same positional arguments that
+        :class:`marshmallow.fields.String` receives.
+    :param kwargs: The same keyword arguments that
+        :class:`marshmallow.fields.String` receives.
+    """
+    default_error_messages = {'invalid': 'Not a valid cursor.'}
+
+    def _deserialize(self, value, attr, data):
+        value = super()._deserialize(value, attr, data)
+        try:
+            return utils.decode_cursor(value)
+        except ValueError:
+            self.fail('invalid')
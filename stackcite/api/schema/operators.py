@@ -0,0 +1,101 @@
+"""
+Declarative query operators for collection schemas. For every document field
+of an :class:`.APICollectionSchema`, load-only operator fields are generated
+according to the field's type (e.g. ``number__gt`` for an ``Integer`` field
+``number``):
+
+    * ``__gt``, ``__gte``, ``__lt`` and ``__lte`` for numbers and dates
+    * ``__in`` (a comma-separated list) for numbers and strings
+    * ``__prefix`` for strings
+    * ``__exists`` for every field
+
+Operator values are validated like values of the field itself. Resources
+compile loaded operators into ``pymongo`` operators (see
+:meth:`.APICollectionResource._operator_query`).
+"""
+
+import copy
+
+from marshmallow import fields as mm_fields, missing
+from marshmallow.schema import SchemaMeta
+
+from . import fields as api_fields
+
+
+SEPARATOR = '__'
+
+RANGE_OPERATORS = ('gt', 'gte', 'lt', 'lte')
+OPERATORS = RANGE_OPERATORS + ('in', 'exists', 'prefix')
+
+# Field types that support each kind of operator:
+_RANGE_TYPES = (mm_fields.Number, mm_fields.DateTime, mm_fields.Date)
+_IN_TYPES = (mm_fields.Number, mm_fields.String)
+_PREFIX_TYPES = (mm_fields.String,)
+_NO_PREFIX_TYPES = (api_fields.ObjectIdField,)
+
+
+def split_operator(key):
+    """
+    Splits a query key into a two-tuple of (``name``, ``operator``). The
+    operator is ``None`` if the key does not end with a known operator.
+    """
+    name, sep, operator = key.rpartition(SEPARATOR)
+    if sep and name and operator in OPERATORS:
+        return name, operator
+    return key, None
+
+
+def _operand(field):
+    """
+    Copies a field to validate operands, dropping options that only apply to
+    the field itself (e.g. ``required``).
+    """
+    field = copy.deepcopy(field)
+    field.required = False
+    field.missing = missing
+    field.default = missing
+    field.load_only = True
+    field.dump_only = False
+    field.attribute = None
+    field.load_from = None
+    return field
+
+
+def operator_fields(name, field):
+    """
+    Generates the operator fields of a schema field.
+
+    :param name: The name of the schema field
+    :param field: A :class:`marshmallow.fields.Field`
+    :return list: Two-tuples in the form of (``key``, ``field``)
+    """
+    operators = []
+    if isinstance(field, _RANGE_TYPES):
+        operators.extend((op, _operand(field)) for op in RANGE_OPERATORS)
+    if isinstance(field, _IN_TYPES):
+        operators.append(
+            ('in', api_fields.ListField(_operand(field), load_only=True)))
+    if isinstance(field, _PREFIX_TYPES) and \
+            not isinstance(field, _NO_PREFIX_TYPES):
+        operators.append(('prefix', mm_fields.String(load_only=True)))
+    operators.append(('exists', mm_fields.Boolean(load_only=True)))
+    return [(name + SEPARATOR + op, f) for op, f in operators]
+
+
+class OperatorSchemaMeta(SchemaMeta):
+    """
+    A schema metaclass that generates operator fields for every declared field
+    that is neither load-only (e.g. request parameters) nor dump-only.
+    """
+
+    @classmethod
+    def get_declared_fields(mcs, klass, cls_fields, inherited_fields,
+                            dict_cls):
+        declared = super().get_declared_fields(
+            klass, cls_fields, inherited_fields, dict_cls)
+        for name, field in list(declared.items()):
+            if field.load_only or field.dump_only:
+                continue
+            for key, operator in operator_fields(name, field):
+                declared.setdefault(key, operator)
+        return declared
@@ -5,10 +5,15 @@ database-layer queries and CRUD operations.
 
 from marshmallow import (
     Schema,
-    fields as mm_fields
+    ValidationError,
+    fields as mm_fields,
+    validates_schema
 )
 
+from stackcite.api import timing
+
 from . import fields as api_fields
+from .operators import OperatorSchemaMeta
 
 
 POST = 'POST'
@@ -17,40 +22,112 @@ PUT = 'PUT'
 DELETE = 'DELETE'
 API_METHODS = (POST, GET, PUT, DELETE)
 
+COUNT_EXACT = 'exact'
+COUNT_ESTIMATED = 'estimated'
+COUNT_CAPPED = 'capped'
+COUNT_NONE = 'none'
+COUNT_MODES = (COUNT_EXACT, COUNT_ESTIMATED, COUNT_CAPPED, COUNT_NONE)
+
 
 class APISchema(Schema):
     """
     A sub-type of :class:`marshmallow.Schema` that provides a ``method``
     context that can be used to enforce specific schema-wide validation rules
     (e.g. :class:`~Person` requires a ``name`` if the HTTP method is ``POST``).
+
+    A schema can be frozen with :meth:`freeze` so that a single instance can
+    be safely shared between requests.
+
+    Loads and dumps are timed as the ``load`` and ``dump`` stages of the
+    current request (see :mod:`stackcite.api.timing`).
     """
 
+    # Options that cannot be changed once a schema is frozen:
+    _FROZEN_OPTIONS = ('only', 'exclude', 'strict', 'many', 'context')
+
+    _frozen = False
+
+    def __setattr__(self, name, value):
+        if self._frozen and name in self._FROZEN_OPTIONS:
+            msg = 'Cannot modify a frozen schema: {}'.format(name)
+            raise AttributeError(msg)
+        super().__setattr__(name, value)
+
+    def freeze(self):
+        """
+        Prevents any further changes to this schema's options (including
+        ``method``) and returns the schema.
+        """
+        self._frozen = True
+        return self
+
+    def load(self, *args, **kwargs):
+        with timing.stage('load'):
+            return super().load(*args, **kwargs)
+
+    def dump(self, *args, **kwargs):
+        with timing.stage('dump'):
+            return super().dump(*args, **kwargs)
+
     @property
     def method(self):
         return self.context.get('method')
 
     @method.setter
     def method(self, value):
+        if self._frozen:
+            raise AttributeError('Cannot modify a frozen schema: method')
         if value and value not in API_METHODS:
             msg = 'Invalid request method: {}'.format(value)
             raise ValueError(msg)
         self.context['method'] = value
 
 
+def is_dumpable_path(schm, path):
+    """
+    Checks whether a dot-notation field path (e.g. ``'name.first'``) resolves
+    to a field that ``schm`` can serialize, following nested schemas.
+
+    :param schm: A :class:`marshmallow.Schema` instance
+    :param str path: A dot-notation field path
+    :return bool: ``True`` if the path can be serialized
+    """
+    fields = schm.fields
+    parts = path.split('.')
+    for idx, name in enumerate(parts):
+        field = fields.get(name)
+        if field is None or field.load_only:
+            return False
+        if isinstance(field, mm_fields.List):
+            field = field.container
+        if idx < len(parts) - 1:
+            if not isinstance(field, mm_fields.Nested):
+                return False
+            fields = field.schema.fields
+    return True
+
+
 class APIDocumentSchema(APISchema):
     # DEPRECIATED
     pass
 
 
-class APICollectionSchema(APISchema):
+class APICollectionSchema(APISchema, metaclass=OperatorSchemaMeta):
     """
-    A generalized schema for (de)serializing one or more documents.
+    A generalized schema for (de)serializing one or more documents. Query
+    operator fields (e.g. ``number__gt``) are generated for every document
+    field (see :mod:`stackcite.api.schema.operators`).
 
-    :cvar q: An arbitrary query string (``load_only=True``)
+    :cvar q: A full-text search string (``load_only=True``)
     :cvar ids: A comma-separated list of ids (``load_only=True``)
     :cvar fields: A comma-separated list of field names to include (``load_only=True``)
     :cvar limit: The maximum number of documents returned (``load_only=True``)
     :cvar skip: The total number of documents "skipped" (``load_only=True``)
+    :cvar after: An opaque cursor to resume paging from (``load_only=True``)
+    :cvar sort: A comma-separated list of sort keys, e.g. ``-year,title`` (``load_only=True``)
+    :cvar count: A strategy used to count matching documents (``load_only=True``)
+    :cvar ordered: Stops bulk operations at the first failure (``load_only=True``)
+    :cvar stream: Streams results instead of buffering them (``load_only=True``)
     :cvar id: An individual document id (``dump_only=True``)
     """
 
@@ -66,10 +143,32 @@ class APICollectionSchema(APISchema):
         missing=0,
         validate=mm_fields.validate.Range(min=0),
         load_only=True)
+    after = api_fields.CursorField(load_only=True)
+    sort = api_fields.SortListField(load_only=True)
+    count = mm_fields.String(
+        missing=COUNT_EXACT,
+        validate=mm_fields.validate.OneOf(COUNT_MODES),
+        load_only=True)
+    ordered = mm_fields.Boolean(load_only=True)
+    stream = mm_fields.Boolean(load_only=True)
 
     # Response fields:
     id = api_fields.ObjectIdField(dump_only=True)
 
+    @validates_schema
+    def validate_cursor(self, data):
+        """
+        Checks that a cursor holds one value per sort key, plus a final
+        ``id`` unless the sort keys include it.
+        """
+        if 'after' not in data:
+            return
+        names = [key.lstrip('-+') for key in data.get('sort') or ()]
+        expected = len(names) + (0 if 'id' in names else 1)
+        if len(data['after']) != expected:
+            msg = 'Cursor does not match the sort keys.'
+            raise ValidationError(msg, ['after'])
+
 
 class RetrieveCollection(Schema):
     # DEPRECIATED
@@ -258,4 +258,57 @@ class FieldsFieldTests(unittest.TestCase):
         data = 'id,name__full,birth,pets__dogs__indoor'
         expected = ['id', 'name.full', 'birth', 'pets.dogs.indoor']
         result = self.fields.deserialize(data)
-        self.assertEqual(expected, result)
\ No newline at end of file
+        self.assertEqual(expected, result)
+
+class SortListFieldTests(unittest.TestCase):
+
+    layer = testing.layers.UnitTestLayer
+
+    def setUp(self):
+        from ..fields import SortListField
+        self.field = SortListField()
+
+    def test_deserialize_sort_keys(self):
+        """SortListField.deserialize() parses a list string into sort keys
+        """
+        result = self.field.deserialize('-year,title,-name__last')
+        self.assertEqual(['-year', 'title', '-name.last'], result)
+
+    def test_deserialize_empty_string(self):
+        """SortListField.deserialize() parses an empty string into an empty list
+        """
+        self.assertEqual([], self.field.deserialize(''))
+
+    def test_deserialize_rejects_empty_keys(self):
+        """SortListField.deserialize() raises exception for empty sort keys
+        """
+        from marshmallow import ValidationError
+        for data in ('-', 'year,', '-year,,title'):
+            with self.assertRaises(ValidationError):
+                self.field.deserialize(data)
+
+
+class CursorFieldTests(unittest.TestCase):
+
+    layer = testing.layers.UnitTestLayer
+
+    def setUp(self):
+        from ..fields import CursorField
+        self.field = CursorField()
+
+    def test_deserialize_decodes_cursor(self):
+        """CursorField.deserialize() decodes a cursor into a list of values
+        """
+        from bson import ObjectId
+        from stackcite.api import utils
+        expected = [ObjectId()]
+        cursor = utils.encode_cursor(expected)
+        result = self.field.deserialize(cursor)
+        self.assertEqual(expected, result)
+
+    def test_deserialize_raises_exception_for_invalid_cursor(self):
+        """CursorField.deserialize() raises ValidationError for an invalid cursor
+        """
+        from marshmallow import ValidationError
+        with self.assertRaises(ValidationError):
+            self.field.deserialize('invalid_cursor')
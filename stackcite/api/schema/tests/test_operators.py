@@ -0,0 +1,111 @@
+import unittest
+
+from stackcite.api import testing
+
+
+class SplitOperatorTests(unittest.TestCase):
+
+    layer = testing.layers.UnitTestLayer
+
+    def test_splits_known_operators(self):
+        """split_operator() splits a key into a field name and an operator
+        """
+        from ..operators import split_operator
+        self.assertEqual(split_operator('number__gt'), ('number', 'gt'))
+        self.assertEqual(split_operator('a.b__in'), ('a.b', 'in'))
+
+    def test_ignores_unknown_operators(self):
+        """split_operator() returns no operator for other keys
+        """
+        from ..operators import split_operator
+        for key in ('number', 'number__unknown', '__gt', 'first_name'):
+            self.assertEqual(split_operator(key), (key, None))
+
+
+class OperatorSchemaTests(unittest.TestCase):
+
+    layer = testing.layers.UnitTestLayer
+
+    def setUp(self):
+        from marshmallow import fields as mm_fields
+        from .. import fields, schema
+        class _Schema(schema.APICollectionSchema):
+            name = mm_fields.String(required=True)
+            number = mm_fields.Integer()
+            date = mm_fields.DateTime()
+            flag = mm_fields.Boolean()
+            ref = fields.ObjectIdField()
+            derived = mm_fields.String(dump_only=True)
+        self.schema_class = _Schema
+        self.schema = _Schema(strict=True)
+
+    def test_generates_operators_by_field_type(self):
+        """APICollectionSchema generates operator fields by field type
+        """
+        fields = self.schema.fields
+        for key in ('number__gt', 'number__gte', 'number__lt', 'number__lte',
+                    'number__in', 'date__gt', 'date__lte', 'name__in',
+                    'name__prefix', 'ref__in', 'flag__exists'):
+            self.assertIn(key, fields)
+        for key in ('name__gt', 'flag__in', 'flag__gt', 'ref__prefix',
+                    'number__prefix'):
+            self.assertNotIn(key, fields)
+
+    def test_every_field_has_exists_operator(self):
+        """APICollectionSchema generates an "exists" operator for every field
+        """
+        for name in ('name', 'number', 'date', 'flag', 'ref'):
+            self.assertIn(name + '__exists', self.schema.fields)
+
+    def test_skips_load_only_and_dump_only_fields(self):
+        """APICollectionSchema does not generate operators for load-only or dump-only fields
+        """
+        for key in ('derived__exists', 'limit__gt', 'q__prefix', 'id__in'):
+            self.assertNotIn(key, self.schema.fields)
+
+    def test_operator_fields_are_load_only(self):
+        """APICollectionSchema operator fields are optional and load-only
+        """
+        field = self.schema.fields['name__in']
+        self.assertTrue(field.load_only)
+        self.assertFalse(field.required)
+        self.assertFalse(self.schema.fields['name__prefix'].required)
+
+    def test_loads_operator_values(self):
+        """APICollectionSchema.load() deserializes operator values like their field
+        """
+        query = {
+            'name': 'Doc', 'number__gt': '3', 'number__in': '1,2',
+            'name__prefix': 'Doc', 'flag__exists': 'false'}
+        data, errors = self.schema.load(query)
+        self.assertEqual(data['number__gt'], 3)
+        self.assertEqual(data['number__in'], [1, 2])
+        self.assertEqual(data['name__prefix'], 'Doc')
+        self.assertIs(data['flag__exists'], False)
+
+    def test_validates_operator_values(self):
+        """APICollectionSchema.load() validates operator values like their field
+        """
+        from marshmallow import ValidationError
+        for key, value in (('number__gt', 'a'), ('number__in', '1,b'),
+                           ('ref__in', 'not_an_id')):
+            with self.assertRaises(ValidationError) as cm:
+                self.schema.load({'name': 'Doc', key: value})
+            self.assertIn(key, cm.exception.messages)
+
+    def test_subclasses_keep_operators(self):
+        """APICollectionSchema subclasses generate operators for new fields
+        """
+        from marshmallow import fields as mm_fields
+        class _Subclass(self.schema_class):
+            extra = mm_fields.Float()
+        fields = _Subclass().fields
+        for key in ('number__gt', 'extra__lt', 'extra__exists'):
+            self.assertIn(key, fields)
+
+    def test_does_not_dump_operators(self):
+        """APICollectionSchema.dump() does not dump operator fields
+        """
+        data, errors = self.schema.dump({'name': 'Doc', 'number__gt': 3})
+        self.assertEqual(data['name'], 'Doc')
+        self.assertNotIn('number__gt', data)
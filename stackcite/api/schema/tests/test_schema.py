@@ -31,6 +31,36 @@ class APISchemaTests(unittest.TestCase):
                 msg = 'Unexpected exception raised: {}'.format(err)
                 self.fail(msg=msg)
 
+    def test_freeze_returns_schema(self):
+        """APISchema.freeze() returns the schema itself
+        """
+        result = self.schema.freeze()
+        self.assertIs(self.schema, result)
+
+    def test_frozen_schema_options_cannot_be_modified(self):
+        """APISchema options cannot be modified after freeze()
+        """
+        self.schema.freeze()
+        for option in ('only', 'exclude', 'strict', 'many', 'context'):
+            with self.assertRaises(AttributeError):
+                setattr(self.schema, option, None)
+
+    def test_frozen_schema_method_cannot_be_modified(self):
+        """APISchema.method cannot be modified after freeze()
+        """
+        self.schema.freeze()
+        with self.assertRaises(AttributeError):
+            self.schema.method = 'POST'
+
+    def test_frozen_schema_can_load_and_dump(self):
+        """APISchema can still load and dump after freeze()
+        """
+        schm = testing.mock.MockDocumentSchema().freeze()
+        data, errors = schm.load({'name': 'Document'})
+        self.assertEqual('Document', data['name'])
+        data, errors = schm.dump({'name': 'Document'})
+        self.assertEqual('Document', data['name'])
+
     def test_nested_schema_recieves_method_context(self):
         """APICollectionSchema passes method context to a nested schema
         """
@@ -225,3 +255,93 @@ class APICollectionSchemaTests(unittest.TestCase):
         expected = ['id', 'name', 'number']
         result = data['fields']
         self.assertListEqual(expected, result)
+
+    def test_returns_decoded_after(self):
+        """APICollectionSchema.after loads a decoded cursor
+        """
+        from bson import ObjectId
+        from stackcite.api import utils
+        expected = [ObjectId()]
+        query = {'after': utils.encode_cursor(expected)}
+        data, errors = self.schema.load(query)
+        result = data['after']
+        self.assertEqual(expected, result)
+
+    def test_after_must_be_valid_cursor(self):
+        """APICollectionSchema.after logs error loading an invalid cursor
+        """
+        query = {'after': 'invalid_cursor'}
+        data, errors = self.schema.load(query)
+        self.assertIn('after', errors)
+
+    def test_after_must_match_sort_keys(self):
+        """APICollectionSchema.after logs error loading a cursor that does not match the sort keys
+        """
+        from bson import ObjectId
+        from stackcite.api import utils
+        cursor = utils.encode_cursor([3, ObjectId()])
+        cases = (('-number', True), ('number,-id', True),
+                 ('number,name', False), (None, False))
+        for sort, valid in cases:
+            query = {'after': cursor}
+            if sort:
+                query['sort'] = sort
+            data, errors = self.schema.load(query)
+            self.assertEqual(not valid, 'after' in errors, sort)
+
+    def test_default_count(self):
+        """APICollectionSchema.count defaults to loading 'exact' without being set
+        """
+        result = self.schema.load({})
+        self.assertEqual(result.data['count'], 'exact')
+
+    def test_count_must_be_valid_mode(self):
+        """APICollectionSchema.count must be a known count mode
+        """
+        query = {'count': 'approximately'}
+        data, errors = self.schema.load(query)
+        self.assertIn('count', errors)
+
+
+class IsDumpablePathTests(unittest.TestCase):
+
+    layer = testing.layers.UnitTestLayer
+
+    def setUp(self):
+        from marshmallow import fields as mm_fields
+        from .. import schema
+        class _NameSchema(schema.APISchema):
+            first = mm_fields.String()
+        class _PersonSchema(schema.APICollectionSchema):
+            name = mm_fields.Nested(_NameSchema)
+            aliases = mm_fields.List(mm_fields.Nested(_NameSchema))
+            number = mm_fields.Integer()
+        self.schema = _PersonSchema()
+
+    def test_accepts_top_level_fields(self):
+        """is_dumpable_path() accepts top-level serializable fields
+        """
+        from .. import is_dumpable_path
+        for path in ('id', 'number', 'name'):
+            self.assertTrue(is_dumpable_path(self.schema, path))
+
+    def test_accepts_nested_field_paths(self):
+        """is_dumpable_path() accepts dot-notation paths into nested schemas
+        """
+        from .. import is_dumpable_path
+        for path in ('name.first', 'aliases.first'):
+            self.assertTrue(is_dumpable_path(self.schema, path))
+
+    def test_rejects_unknown_fields(self):
+        """is_dumpable_path() rejects unknown fields
+        """
+        from .. import is_dumpable_path
+        for path in ('unknown', 'name.last', 'number.first'):
+            self.assertFalse(is_dumpable_path(self.schema, path))
+
+    def test_rejects_load_only_fields(self):
+        """is_dumpable_path() rejects load-only fields
+        """
+        from .. import is_dumpable_path
+        for path in ('limit', 'fields'):
+            self.assertFalse(is_dumpable_path(self.schema, path))
@@ -1,13 +1,16 @@
 from marshmallow import validate
 
-from stackcite.api.validators.groups import validate_group
+from stackcite.api.validators.groups import (
+    validate_group,
+    validate_group_many
+)
 
 
 class GroupValidator(validate.Validator):
     """
     A ``marshmallow`` style :class:`bson.User` group validator. Raises
-    :class:`marshmallow.ValidationError` if the string provided is not a valid
-    :class:`bson.User` group.
+    :class:`marshmallow.ValidationError` if the string (or any string in the
+    list) provided is not a valid :class:`bson.User` group.
     """
 
     default_message = 'Invalid group: {}'
@@ -19,6 +22,11 @@ class GroupValidator(validate.Validator):
         return self.error.format(value)
 
     def __call__(self, value):
-        message = self._format_error(value)
-        if not validate_group(value):
-            raise validate.ValidationError(message)
+        if isinstance(value, (list, tuple)):
+            mask = validate_group_many(value)
+            errors = [self._format_error(v) for v, ok in zip(value, mask)
+                      if not ok]
+            if errors:
+                raise validate.ValidationError(errors)
+        elif not validate_group(value):
+            raise validate.ValidationError(self._format_error(value))
@@ -1,13 +1,16 @@
 from marshmallow import validate
 
-from stackcite.api.validators.keys import validate_key
+from stackcite.api.validators.keys import (
+    validate_key,
+    validate_key_many
+)
 
 
 class AuthTokenKeyValidator(validate.Validator):
     """
     A ``marshmallow`` style :class:`bson.AuthToken` key validator. Raises
-    :class:`marshmallow.ValidationError` if the string provided is not a valid
-    :class:`bson.AuthToken` key.
+    :class:`marshmallow.ValidationError` if the string (or any string in the
+    list) provided is not a valid :class:`bson.AuthToken` key.
     """
 
     default_message = 'Invalid API token key: {}'
@@ -19,6 +22,11 @@ class AuthTokenKeyValidator(validate.Validator):
         return self.error.format(value)
 
     def __call__(self, value):
-        message = self._format_error(value)
-        if not validate_key(value):
-            raise validate.ValidationError(message)
+        if isinstance(value, (list, tuple)):
+            mask = validate_key_many(value)
+            errors = [self._format_error(v) for v, ok in zip(value, mask)
+                      if not ok]
+            if errors:
+                raise validate.ValidationError(errors)
+        elif not validate_key(value):
+            raise validate.ValidationError(self._format_error(value))
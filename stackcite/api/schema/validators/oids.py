@@ -1,13 +1,16 @@
 from marshmallow import validate
 
-from stackcite.api.validators.oids import validate_objectid
+from stackcite.api.validators.oids import (
+    validate_objectid,
+    validate_objectid_many
+)
 
 
 class ObjectIdValidator(validate.Validator):
     """
     A ``marshmallow`` style :class:`bson.ObjectId` validator. Raises
-    :class:`marshmallow.ValidationError` if the string provided is not a valid
-    :class:`bson.ObjectId`.
+    :class:`marshmallow.ValidationError` if the string (or any string in the
+    list) provided is not a valid :class:`bson.ObjectId`.
     """
 
     default_message = 'Invalid ObjectId: {}'
@@ -19,6 +22,11 @@ class ObjectIdValidator(validate.Validator):
         return self.error.format(value)
 
     def __call__(self, value):
-        message = self._format_error(value)
-        if not validate_objectid(value):
-            raise validate.ValidationError(message)
+        if isinstance(value, (list, tuple)):
+            mask = validate_objectid_many(value)
+            errors = [self._format_error(v) for v, ok in zip(value, mask)
+                      if not ok]
+            if errors:
+                raise validate.ValidationError(errors)
+        elif not validate_objectid(value):
+            raise validate.ValidationError(self._format_error(value))
@@ -1,13 +1,16 @@
 from marshmallow import validate
 
-from stackcite.api.validators.passwords import validate_password
+from stackcite.api.validators.passwords import (
+    validate_password,
+    validate_password_many
+)
 
 
 class PasswordValidator(validate.Validator):
     """
     A ``marshmallow`` style :class:`bson.Password` validator. Raises
-    :class:`marshmallow.ValidationError` if the string provided is not a valid
-    :class:`bson.Password`.
+    :class:`marshmallow.ValidationError` if the string (or any string in the
+    list) provided is not a valid :class:`bson.Password`.
     """
 
     default_message = 'Invalid password: {}'
@@ -19,6 +22,11 @@ class PasswordValidator(validate.Validator):
         return self.error.format(value)
 
     def __call__(self, value):
-        message = self._format_error(value)
-        if not validate_password(value):
-            raise validate.ValidationError(message)
+        if isinstance(value, (list, tuple)):
+            mask = validate_password_many(value)
+            errors = [self._format_error(v) for v, ok in zip(value, mask)
+                      if not ok]
+            if errors:
+                raise validate.ValidationError(errors)
+        elif not validate_password(value):
+            raise validate.ValidationError(self._format_error(value))
@@ -28,3 +28,21 @@ class GroupValidatorTests(unittest.TestCase):
         from marshmallow import ValidationError
         with self.assertRaises(ValidationError):
             self.validator('invalid')
+
+    def test_valid_group_list_passes_validation(self):
+        """GroupValidator accepts a list of known groups
+        """
+        from stackcite.api import auth
+        from marshmallow import ValidationError
+        try:
+            self.validator(auth.GROUPS)
+        except ValidationError as err:
+            self.fail(err)
+
+    def test_invalid_group_list_reports_each_invalid_group(self):
+        """GroupValidator reports every invalid group in a list
+        """
+        from marshmallow import ValidationError
+        with self.assertRaises(ValidationError) as ctx:
+            self.validator(['users', 'cats', 'dogs'])
+        self.assertEqual(2, len(ctx.exception.messages))
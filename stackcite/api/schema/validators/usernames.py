@@ -1,13 +1,16 @@
 from marshmallow import validate
 
-from stackcite.api.validators.usernames import validate_username
+from stackcite.api.validators.usernames import (
+    validate_username,
+    validate_username_many
+)
 
 
 class UsernameValidator(validate.Validator):
     """
     A ``marshmallow`` style :class:`bson.Username` validator. Raises
-    :class:`marshmallow.ValidationError` if the string provided is not a valid
-    :class:`bson.Username`.
+    :class:`marshmallow.ValidationError` if the string (or any string in the
+    list) provided is not a valid :class:`bson.Username`.
     """
 
     default_message = 'Invalid password: {}'
@@ -19,6 +22,11 @@ class UsernameValidator(validate.Validator):
         return self.error.format(value)
 
     def __call__(self, value):
-        message = self._format_error(value)
-        if not validate_username(value):
-            raise validate.ValidationError(message)
+        if isinstance(value, (list, tuple)):
+            mask = validate_username_many(value)
+            errors = [self._format_error(v) for v, ok in zip(value, mask)
+                      if not ok]
+            if errors:
+                raise validate.ValidationError(errors)
+        elif not validate_username(value):
+            raise validate.ValidationError(self._format_error(value))
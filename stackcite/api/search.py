@@ -0,0 +1,183 @@
+"""
+An in-process full-text search fallback for deployments without MongoDB text
+indexes. A :class:`TextIndex` is an inverted index of the weighted text fields
+of a collection, built with a single read of those fields and kept in memory
+until a write to the collection invalidates it (see :func:`invalidate`).
+
+Like MongoDB's ``$text`` operator, searches match documents containing any of
+the search terms and exclude documents containing a negated (``-term``) term.
+Documents are scored by the sum of the weights of each matching term
+occurrence. Unlike MongoDB, terms are neither stemmed nor filtered for stop
+words.
+
+Writes through resources invalidate indexes, as do documents saved or
+deleted through ``mongoengine`` if signals are available (i.e. ``blinker``
+is installed). Signal receivers are only connected for document classes
+with a built index, since ``mongoengine`` loads and deletes documents one
+by one in ``QuerySet.delete()`` if any ``post_delete`` receiver is connected
+for their class. Writes made by other processes are not seen until the index
+is invalidated.
+"""
+
+import collections
+import re
+import threading
+
+from mongoengine import signals
+
+
+_TOKEN = re.compile(r'\w+')
+
+# Built indexes by (collection name, document class, weights),
+# generations by collection name and document classes connected to signals:
+_INDEXES = {}
+_GENERATIONS = collections.Counter()
+_CONNECTED = set()
+_LOCK = threading.Lock()
+
+
+def tokenize(text):
+    """
+    Splits a string into lowercase word terms.
+    """
+    return _TOKEN.findall(text.lower())
+
+
+def parse_search(text):
+    """
+    Parses a search string into a two-tuple of (``terms``, ``excluded``)
+    terms. Words prefixed with ``-`` are excluded.
+    """
+    terms, excluded = [], []
+    for word in text.split():
+        if word.startswith('-'):
+            excluded.extend(tokenize(word[1:]))
+        else:
+            terms.extend(tokenize(word))
+    return terms, excluded
+
+
+def _strings(value, parts):
+    """
+    Yields the strings found at a dot-notation path (split into ``parts``)
+    of a raw document, descending into lists.
+    """
+    if isinstance(value, list):
+        for item in value:
+            yield from _strings(item, parts)
+    elif not parts:
+        if isinstance(value, str):
+            yield value
+    elif isinstance(value, dict):
+        yield from _strings(value.get(parts[0]), parts[1:])
+
+
+class TextIndex(object):
+    """
+    An inverted index of weighted text fields.
+
+    :param weights: A dictionary of weights keyed by raw (``db_field``)
+        dot-notation paths
+    """
+
+    def __init__(self, weights):
+        self.weights = dict(weights)
+        self._postings = collections.defaultdict(dict)
+
+    def add(self, doc_id, data):
+        """
+        Indexes the text fields of a raw ``pymongo`` document.
+
+        :param doc_id: The document's ``_id``
+        :param data: A raw dictionary returned by ``pymongo``
+        """
+        for path, weight in self.weights.items():
+            for value in _strings(data, path.split('.')):
+                for term in tokenize(value):
+                    postings = self._postings[term]
+                    postings[doc_id] = postings.get(doc_id, 0) + weight
+
+    def search(self, text):
+        """
+        Returns the ids of documents matching a search string, ordered by
+        descending score (and ascending id for equal scores).
+        """
+        terms, excluded = parse_search(text)
+        scores = {}
+        for term in set(terms):
+            for doc_id, score in self._postings.get(term, {}).items():
+                scores[doc_id] = scores.get(doc_id, 0) + score
+        for term in excluded:
+            for doc_id in self._postings.get(term, ()):
+                scores.pop(doc_id, None)
+        return sorted(scores, key=lambda doc_id: (-scores[doc_id], doc_id))
+
+    @classmethod
+    def build(cls, document_class, weights):
+        """
+        Builds an index over every document of a collection.
+
+        :param document_class: A :class:`mongoengine.Document` class
+        :param weights: A dictionary of weights keyed by raw dot-notation
+            paths
+        """
+        index = cls(weights)
+        collection = document_class._get_collection()
+        query = document_class.objects._query
+        projection = {path: True for path in index.weights}
+        for data in collection.find(query, projection):
+            index.add(data['_id'], data)
+        return index
+
+
+def get_index(document_class, weights):
+    """
+    Returns the index of a collection, building it if there is none or if
+    the collection has been invalidated since it was built.
+
+    :param document_class: A :class:`mongoengine.Document` class
+    :param weights: A dictionary of weights keyed by raw dot-notation paths
+    :return: A :class:`TextIndex`
+    """
+    name = document_class._get_collection_name()
+    key = (name, document_class, frozenset(weights.items()))
+    index = _INDEXES.get(key)
+    if index is None:
+        _connect(document_class)
+        generation = _GENERATIONS[name]
+        index = TextIndex.build(document_class, weights)
+        with _LOCK:
+            # Indexes built while the collection changed are not kept:
+            if _GENERATIONS[name] == generation:
+                _INDEXES[key] = index
+    return index
+
+
+def invalidate(document_class):
+    """
+    Discards every index of a document's collection after a write.
+    """
+    name = document_class._get_collection_name()
+    with _LOCK:
+        _GENERATIONS[name] += 1
+        for key in [k for k in _INDEXES if k[0] == name]:
+            del _INDEXES[key]
+
+
+def _invalidate_sender(sender, **kwargs):
+    invalidate(sender)
+
+
+def _connect(document_class):
+    """
+    Invalidates the indexes of a document class whenever one of its
+    documents is saved or deleted (if signals are available).
+    """
+    if not signals.signals_available:
+        return
+    with _LOCK:
+        if document_class in _CONNECTED:
+            return
+        _CONNECTED.add(document_class)
+    signals.post_save.connect(_invalidate_sender, sender=document_class)
+    signals.post_delete.connect(_invalidate_sender, sender=document_class)
@@ -0,0 +1,497 @@
+"""
+A reproducible benchmark suite for the resource and view stack. Benchmarks
+drive :class:`.CollectionResource` CRUD, :class:`.APICollectionViews` and
+:class:`.APIDocumentViews` against ``mongomock`` or a local ``mongod`` at
+varying document counts, page sizes, field projections and nesting depths.
+Documents nest embedded documents as deep as each depth (see
+:func:`document_class`), so nested schemas, deserializers and projections
+are exercised.
+
+Each benchmark reports its throughput, p50/p99 latencies and peak memory
+allocated per operation. Results can be saved as a baseline JSON file and
+later runs compared against it, e.g.::
+
+    stackcite-benchmark --save baseline.json
+    stackcite-benchmark --baseline baseline.json
+
+The console script exits with a non-zero status if any benchmark's p50
+latency regressed by more than ``--threshold`` (10% by default).
+"""
+
+import argparse
+import functools
+import gc
+import itertools
+import json
+import sys
+import time
+import tracemalloc
+
+import mongoengine
+
+from marshmallow import fields as mm_fields
+from pyramid import testing as pyramid_testing
+
+from stackcite.api import models, resources, schema, views
+from stackcite.api.config import mongo as mongo_config
+
+
+BACKENDS = ('mongomock', 'mongod')
+
+# Defaults of the console script:
+DEFAULT_COUNTS = (100, 1000)
+DEFAULT_PAGE_SIZES = (10, 100)
+DEFAULT_DEPTHS = (0, 4)
+DEFAULT_FIELDS = ((), ('name', 'number'), ('name', 'nested.level'))
+DEFAULT_REPEAT = 30
+DEFAULT_WARMUP = 3
+DEFAULT_THRESHOLD = 0.1
+
+
+# The collection shared by the benchmark documents of every depth:
+COLLECTION = 'benchmark_document'
+
+
+class BenchmarkDocument(models.IDocument):
+    """
+    The fields shared by the benchmark documents of every depth (see
+    :func:`document_class`).
+    """
+
+    name = mongoengine.StringField(required=True)
+    number = mongoengine.IntField()
+    fact = mongoengine.BooleanField()
+
+    meta = {'abstract': True}
+
+
+class BenchmarkDocumentSchema(schema.APICollectionSchema):
+    """
+    A (de)serialization schema for the fields of :class:`~BenchmarkDocument`.
+    """
+
+    name = mm_fields.String()
+    number = mm_fields.Integer()
+    fact = mm_fields.Boolean()
+
+
+class BenchmarkDocumentResource(resources.APIDocumentResource):
+    pass
+
+
+@functools.lru_cache(maxsize=None)
+def level_class(depth):
+    """
+    Returns an embedded document class with ``depth`` levels of embedded
+    documents (i.e. a ``child`` of ``level_class(depth - 1)`` if ``depth`` is
+    greater than 1). Children default to empty documents, so partial updates
+    are deserialized into existing levels.
+    """
+    attrs = {
+        'level': mongoengine.IntField(),
+        'tags': mongoengine.ListField(mongoengine.StringField())
+    }
+    if depth > 1:
+        child = level_class(depth - 1)
+        attrs['child'] = mongoengine.EmbeddedDocumentField(
+            child, default=child)
+    name = 'BenchmarkLevel{}'.format(depth)
+    return type(name, (models.IEmbeddedDocument,), attrs)
+
+
+@functools.lru_cache(maxsize=None)
+def level_schema(depth):
+    """
+    Returns a (de)serialization schema for :func:`level_class`.
+    """
+    attrs = {
+        'level': mm_fields.Integer(),
+        'tags': mm_fields.List(mm_fields.String())
+    }
+    if depth > 1:
+        attrs['child'] = mm_fields.Nested(level_schema(depth - 1))
+    name = 'BenchmarkLevel{}Schema'.format(depth)
+    return type(name, (schema.APISchema,), attrs)
+
+
+@functools.lru_cache(maxsize=None)
+def document_class(depth):
+    """
+    Returns a :class:`~BenchmarkDocument` class with a ``nested`` embedded
+    document ``depth`` levels deep (or no ``nested`` field if ``depth`` is
+    0). Documents of every depth share a collection.
+    """
+    attrs = {'meta': {'collection': COLLECTION}}
+    if depth:
+        nested = level_class(depth)
+        attrs['nested'] = mongoengine.EmbeddedDocumentField(
+            nested, default=nested)
+    name = 'BenchmarkDocument{}'.format(depth)
+    return type(name, (BenchmarkDocument,), attrs)
+
+
+@functools.lru_cache(maxsize=None)
+def collection_class(depth):
+    """
+    Returns a collection resource class for :func:`document_class`, with a
+    schema that nests :func:`level_schema`.
+    """
+    attrs = {}
+    if depth:
+        attrs['nested'] = mm_fields.Nested(level_schema(depth))
+    schema_class = type('BenchmarkDocument{}Schema'.format(depth),
+                        (BenchmarkDocumentSchema,), attrs)
+    name = 'BenchmarkCollection{}Resource'.format(depth)
+    return type(name, (resources.APICollectionResource,), {
+        '_COLLECTION': document_class(depth),
+        '_DOCUMENT_RESOURCE': BenchmarkDocumentResource,
+        '_SCHEMA': schema_class
+    })
+
+
+def nested_data(depth):
+    """
+    Returns the data of an embedded document nested ``depth`` levels deep
+    (see :func:`level_class`).
+    """
+    data = {}
+    for level in range(depth):
+        child = {'child': data} if data else {}
+        data = dict(child, level=level, tags=['a', 'b', 'c'])
+    return data
+
+
+def document_data(depth, **data):
+    """
+    Returns the data of a document of :func:`document_class`.
+    """
+    if depth:
+        data['nested'] = nested_data(depth)
+    return data
+
+
+def populate(count, depth):
+    """
+    Replaces the benchmark collection with ``count`` documents and returns
+    their ids.
+    """
+    document_class(depth).drop_collection()
+    docs = [
+        document_data(depth, name='doc {}'.format(idx), number=idx,
+                      fact=idx % 2 == 0)
+        for idx in range(count)]
+    if not docs:
+        return []
+    collection = document_class(depth)._get_collection()
+    return collection.insert_many(docs).inserted_ids
+
+
+class Scenario(object):
+    """
+    The parameters of a single benchmark run.
+    """
+
+    def __init__(self, ids, count, depth, page=None, fields=()):
+        self.ids = ids
+        self.count = count
+        self.depth = depth
+        self.page = page
+        self.fields = fields
+        self._names = itertools.count()
+
+    def key(self, name):
+        params = ['count={}'.format(self.count), 'depth={}'.format(self.depth)]
+        if self.page is not None:
+            params.append('page={}'.format(self.page))
+        if self.fields:
+            params.append('fields={}'.format('+'.join(self.fields)))
+        return '{}[{}]'.format(name, ','.join(params))
+
+    def collection(self):
+        return collection_class(self.depth)(None, 'benchmark')
+
+    def document(self):
+        return self.collection()[str(self.ids[0])]
+
+    def data(self):
+        name = 'new {}'.format(next(self._names))
+        return document_data(self.depth, name=name, number=1)
+
+    def changes(self, number):
+        """
+        Returns the data of a partial update, which changes the innermost
+        level of the nested document (if any).
+        """
+        data = {'number': number}
+        if self.depth:
+            nested = {'level': number}
+            for _ in range(self.depth - 1):
+                nested = {'child': nested}
+            data['nested'] = nested
+        return data
+
+    def is_valid(self):
+        """
+        Checks whether every projected field path exists at this depth.
+        """
+        schm = self.collection().schema()
+        return all(schema.is_dumpable_path(schm, path)
+                   for path in self.fields)
+
+    def params(self):
+        params = {}
+        if self.page is not None:
+            params['limit'] = str(self.page)
+        if self.fields:
+            params['fields'] = ','.join(self.fields)
+        return params
+
+
+def _resource_create(scenario):
+    resource = scenario.collection()
+    return lambda: resource.create(scenario.data())
+
+
+def _resource_retrieve(scenario):
+    resource = scenario.collection()
+    return lambda: list(resource.retrieve(
+        {}, fields=scenario.fields, limit=scenario.page))
+
+
+def _resource_count(scenario):
+    resource = scenario.collection()
+    return lambda: resource.count({})
+
+
+def _resource_update(scenario):
+    resource = scenario.document()
+    return lambda: resource.update(scenario.changes(2))
+
+
+def _collection_view_retrieve(scenario):
+    request = pyramid_testing.DummyRequest(params=scenario.params())
+    view = views.APICollectionViews(scenario.collection(), request)
+    return view.retrieve
+
+
+def _collection_view_create(scenario):
+    request = pyramid_testing.DummyRequest()
+    view = views.APICollectionViews(scenario.collection(), request)
+
+    def create():
+        request.json_body = scenario.data()
+        return view.create()
+
+    return create
+
+
+def _document_view_retrieve(scenario):
+    request = pyramid_testing.DummyRequest(params=scenario.params())
+    view = views.APIDocumentViews(scenario.document(), request)
+    return view.retrieve
+
+
+def _document_view_update(scenario):
+    request = pyramid_testing.DummyRequest(json_body=scenario.changes(3))
+    view = views.APIDocumentViews(scenario.document(), request)
+    return view.update
+
+
+# Benchmarks in the form of (name, factory, varies by page, varies by fields):
+BENCHMARKS = (
+    ('resource.create', _resource_create, False, False),
+    ('resource.retrieve', _resource_retrieve, True, True),
+    ('resource.count', _resource_count, False, False),
+    ('resource.update', _resource_update, False, False),
+    ('views.collection.create', _collection_view_create, False, False),
+    ('views.collection.retrieve', _collection_view_retrieve, True, True),
+    ('views.document.retrieve', _document_view_retrieve, False, True),
+    ('views.document.update', _document_view_update, False, False),
+)
+
+
+def percentile(samples, q):
+    """
+    Returns the ``q``-th percentile (0-100) of a list of samples using the
+    nearest-rank method.
+    """
+    ordered = sorted(samples)
+    rank = max(int(round(q / 100 * len(ordered))) - 1, 0)
+    return ordered[min(rank, len(ordered) - 1)]
+
+
+def measure(operation, repeat=DEFAULT_REPEAT, warmup=DEFAULT_WARMUP):
+    """
+    Calls ``operation`` ``warmup`` times, then times ``repeat`` calls. Peak
+    memory is measured in a separate call, since tracing allocations slows
+    down every call.
+
+    :return dict: Throughput (``ops``), ``p50``/``p99`` latencies in
+        milliseconds and the ``peak_kb`` allocated by a single call
+    """
+    for _ in range(warmup):
+        operation()
+    gc.collect()
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        operation()
+        samples.append(time.perf_counter() - start)
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        operation()
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return {
+        'ops': round(len(samples) / sum(samples), 1),
+        'p50': round(percentile(samples, 50) * 1000, 3),
+        'p99': round(percentile(samples, 99) * 1000, 3),
+        'peak_kb': round((peak - before) / 1024, 1)
+    }
+
+
+def run(counts=DEFAULT_COUNTS, page_sizes=DEFAULT_PAGE_SIZES,
+        depths=DEFAULT_DEPTHS, fields=DEFAULT_FIELDS, repeat=DEFAULT_REPEAT,
+        warmup=DEFAULT_WARMUP, only=None, report=None):
+    """
+    Runs every benchmark (or those with ``only`` in their key) using the
+    current ``mongoengine`` connection. The benchmark collection is dropped
+    afterwards.
+
+    :param report: A callable receiving each key and result as it completes
+    :return dict: Results keyed by benchmark key
+    """
+    results = {}
+    try:
+        for count, depth in itertools.product(counts, depths):
+            ids = populate(count, depth)
+            for name, factory, by_page, by_fields in BENCHMARKS:
+                grid = itertools.product(
+                    page_sizes if by_page else (None,),
+                    fields if by_fields else ((),))
+                for page, projection in grid:
+                    scenario = Scenario(ids, count, depth, page, projection)
+                    key = scenario.key(name)
+                    if only and only not in key or not scenario.is_valid():
+                        continue
+                    if not ids and name.startswith(('resource.update',
+                                                    'views.document')):
+                        continue
+                    results[key] = measure(factory(scenario), repeat, warmup)
+                    if report:
+                        report(key, results[key])
+    finally:
+        document_class(0).drop_collection()
+    return results
+
+
+def compare(results, baseline, threshold=DEFAULT_THRESHOLD):
+    """
+    Compares the ``p50`` latencies of results with a baseline. Benchmarks
+    missing from either side are ignored.
+
+    :return list: Regressions in the form of (``key``, ``baseline``,
+        ``result``) for latencies more than ``threshold`` slower
+    """
+    regressions = []
+    for key, result in sorted(results.items()):
+        if key not in baseline:
+            continue
+        before, after = baseline[key]['p50'], result['p50']
+        if after > before * (1 + threshold):
+            regressions.append((key, before, after))
+    return regressions
+
+
+def connect(backend, db, host=None):
+    """
+    Connects ``mongoengine`` to ``mongomock`` or a ``mongod`` instance.
+    """
+    settings = {'mongo.db': db}
+    if host:
+        settings['mongo.host'] = host
+    if backend == 'mongomock':
+        try:
+            import mongomock
+        except ImportError:
+            raise SystemExit('The mongomock backend requires mongomock.')
+        return mongo_config.connect(
+            settings, mongo_client_class=mongomock.MongoClient)
+    return mongo_config.connect(settings)
+
+
+def _ints(value):
+    return tuple(int(v) for v in value.split(',') if v)
+
+
+def _field_lists(value):
+    return tuple(tuple(f for f in v.split('+') if f) for v in value.split(','))
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        prog='stackcite-benchmark',
+        description='Benchmarks the Stackcite API resource and view stack.')
+    parser.add_argument('--backend', choices=BACKENDS, default='mongomock')
+    parser.add_argument('--host', help='A MongoDB host name or URI')
+    parser.add_argument('--db', default='stackcite_benchmark')
+    parser.add_argument(
+        '--counts', type=_ints, default=DEFAULT_COUNTS,
+        help='Comma-separated document counts')
+    parser.add_argument(
+        '--page-sizes', type=_ints, default=DEFAULT_PAGE_SIZES,
+        help='Comma-separated page sizes')
+    parser.add_argument(
+        '--depths', type=_ints, default=DEFAULT_DEPTHS,
+        help='Comma-separated nesting depths')
+    parser.add_argument(
+        '--fields', type=_field_lists, default=DEFAULT_FIELDS,
+        help='Comma-separated projections of +-separated fields, e.g. '
+             '",name+number" (an empty projection loads every field)')
+    parser.add_argument('--repeat', type=int, default=DEFAULT_REPEAT)
+    parser.add_argument('--warmup', type=int, default=DEFAULT_WARMUP)
+    parser.add_argument(
+        '--only', help='Only runs benchmarks whose key contains this string')
+    parser.add_argument('--save', help='Saves results to a baseline file')
+    parser.add_argument(
+        '--baseline', help='Compares results with a baseline file')
+    parser.add_argument(
+        '--threshold', type=float, default=DEFAULT_THRESHOLD,
+        help='The p50 slowdown reported as a regression (default 0.1)')
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    connect(args.backend, args.db, args.host)
+
+    def report(key, result):
+        print('{:<72} {ops:>10.1f} ops/s  p50 {p50:>9.3f} ms  '
+              'p99 {p99:>9.3f} ms  peak {peak_kb:>9.1f} kB'.format(
+                  key, **result))
+
+    results = run(
+        args.counts, args.page_sizes, args.depths, args.fields, args.repeat,
+        args.warmup, args.only, report)
+
+    if args.save:
+        with open(args.save, 'w') as f:
+            json.dump({'backend': args.backend, 'results': results}, f,
+                      indent=2, sort_keys=True)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)['results']
+        regressions = compare(results, baseline, args.threshold)
+        for key, before, after in regressions:
+            print('REGRESSION {}: p50 {:.3f} ms -> {:.3f} ms'.format(
+                key, before, after))
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
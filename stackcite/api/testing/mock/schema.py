@@ -13,14 +13,13 @@ class MockDocumentSchema(schema.APICollectionSchema):
     :cvar fact: A boolean value.
     """
 
-    # TODO: Implement "__gt" and "__lt" query fields
     name = fields.String()
     number = fields.Integer()
     fact = fields.Boolean()
 
     @validates_schema
     def route_methods(self, data):
-        if self.method is 'POST':
+        if self.method == 'POST':
             self._validate_required_name_field(data)
 
     @staticmethod
@@ -0,0 +1,126 @@
+import unittest
+
+from stackcite.api import testing
+
+
+class PercentileTests(unittest.TestCase):
+
+    layer = testing.layers.UnitTestLayer
+
+    def test_returns_nearest_rank(self):
+        """percentile() returns the nearest-rank percentile of samples
+        """
+        from ..benchmark import percentile
+        samples = list(range(100, 0, -1))
+        self.assertEqual(50, percentile(samples, 50))
+        self.assertEqual(99, percentile(samples, 99))
+        self.assertEqual(1, percentile(samples, 0))
+
+    def test_handles_single_samples(self):
+        """percentile() returns the only sample of a single-sample list
+        """
+        from ..benchmark import percentile
+        self.assertEqual(3, percentile([3], 99))
+
+
+class CompareTests(unittest.TestCase):
+
+    layer = testing.layers.UnitTestLayer
+
+    def test_reports_regressions(self):
+        """compare() reports p50 latencies slower than the threshold
+        """
+        from ..benchmark import compare
+        baseline = {'a': {'p50': 1.0}, 'b': {'p50': 1.0}}
+        results = {'a': {'p50': 1.05}, 'b': {'p50': 1.5}}
+        self.assertEqual([('b', 1.0, 1.5)], compare(results, baseline, 0.1))
+
+    def test_ignores_missing_benchmarks(self):
+        """compare() ignores benchmarks missing from the baseline
+        """
+        from ..benchmark import compare
+        self.assertEqual([], compare({'a': {'p50': 9.0}}, {}))
+
+
+class ScenarioTests(unittest.TestCase):
+
+    layer = testing.layers.UnitTestLayer
+
+    def test_key_includes_varied_parameters(self):
+        """Scenario.key() includes page sizes and projections if set
+        """
+        from ..benchmark import Scenario
+        scenario = Scenario([], 10, 2, 5, ('name', 'number'))
+        expected = 'views[count=10,depth=2,page=5,fields=name+number]'
+        self.assertEqual(expected, scenario.key('views'))
+
+    def test_params_match_query_parameters(self):
+        """Scenario.params() returns request query parameters
+        """
+        from ..benchmark import Scenario
+        scenario = Scenario([], 10, 2, 5, ('name', 'number'))
+        expected = {'limit': '5', 'fields': 'name,number'}
+        self.assertEqual(expected, scenario.params())
+
+
+class DocumentClassTests(unittest.TestCase):
+
+    layer = testing.layers.UnitTestLayer
+
+    def test_nests_embedded_documents(self):
+        """document_class() nests embedded documents with default children as deep as requested
+        """
+        from ..benchmark import document_class, level_class
+        doc = document_class(3)()
+        self.assertIsInstance(doc.nested, level_class(3))
+        self.assertIsInstance(doc.nested.child.child, level_class(1))
+        self.assertFalse(hasattr(doc.nested.child.child, 'child'))
+
+    def test_returns_flat_document_for_depth_0(self):
+        """document_class() returns a document without a nested field for depth 0
+        """
+        from ..benchmark import document_class
+        self.assertNotIn('nested', document_class(0)._fields)
+
+    def test_schema_nests_level_schemas(self):
+        """collection_class() returns a resource whose schema serializes nested paths
+        """
+        from stackcite.api import schema
+        from ..benchmark import collection_class
+        schm = collection_class(2)(None, 'benchmark').schema()
+        self.assertTrue(schema.is_dumpable_path(schm, 'nested.child.level'))
+        self.assertFalse(schema.is_dumpable_path(schm, 'nested.child.child'))
+
+
+class RunIntegrationTests(unittest.TestCase):
+
+    layer = testing.layers.MongoTestLayer
+
+    def test_runs_every_benchmark(self):
+        """run() measures every benchmark in the matrix
+        """
+        from ..benchmark import BENCHMARKS, run
+        results = run(
+            counts=(3,), page_sizes=(2,), depths=(1,), fields=((),),
+            repeat=2, warmup=0)
+        self.assertEqual(len(BENCHMARKS), len(results))
+        for result in results.values():
+            self.assertEqual({'ops', 'p50', 'p99', 'peak_kb'}, set(result))
+
+    def test_updates_innermost_level(self):
+        """Scenario.changes() updates the innermost level of nested documents
+        """
+        from ..benchmark import Scenario, populate
+        ids = populate(1, 2)
+        scenario = Scenario(ids, 1, 2)
+        result = scenario.document().update(scenario.changes(7))
+        self.assertEqual(7, result.nested.child.level)
+        self.assertEqual(1, result.nested.level)
+
+    def test_drops_benchmark_collection(self):
+        """run() drops the benchmark collection afterwards
+        """
+        from ..benchmark import document_class, run
+        run(counts=(3,), page_sizes=(2,), depths=(0,), fields=((),),
+            repeat=1, warmup=0, only='resource.count')
+        self.assertEqual(0, document_class(0).objects.count())
@@ -0,0 +1,79 @@
+import unittest
+
+from stackcite.api import testing
+
+
+class MakeKeyTests(unittest.TestCase):
+
+    layer = testing.layers.UnitTestLayer
+
+    def test_ignores_query_order(self):
+        """make_key() returns the same key regardless of query parameter order
+        """
+        from ..cache import make_key
+        expected = make_key('docs', 0, ['', 'docs'], {'a': '1', 'b': '2'}, [])
+        result = make_key('docs', 0, ['', 'docs'], {'b': '2', 'a': '1'}, [])
+        self.assertEqual(expected, result)
+
+    def test_varies_by_principals(self):
+        """make_key() returns different keys for different principals
+        """
+        from ..cache import make_key
+        anonymous = make_key('docs', 0, ['docs'], {}, ['system.Everyone'])
+        user = make_key('docs', 0, ['docs'], {}, ['system.Everyone', 'users'])
+        self.assertNotEqual(anonymous, user)
+
+    def test_varies_by_generation(self):
+        """make_key() returns different keys for different generations
+        """
+        from ..cache import make_key
+        first = make_key('docs', 0, ['docs'], {}, [])
+        second = make_key('docs', 1, ['docs'], {}, [])
+        self.assertNotEqual(first, second)
+
+
+class MemoryCacheTests(unittest.TestCase):
+
+    layer = testing.layers.UnitTestLayer
+
+    def setUp(self):
+        from ..cache import MemoryCache
+        self.cache = MemoryCache(maxsize=2, ttl=60)
+
+    def test_get_returns_cached_value(self):
+        """MemoryCache.get() returns a cached value
+        """
+        self.cache.set('key', {'value': 1})
+        result = self.cache.get('key')
+        self.assertEqual({'value': 1}, result)
+
+    def test_get_returns_none_for_missing_key(self):
+        """MemoryCache.get() returns None for a missing key
+        """
+        self.assertIsNone(self.cache.get('key'))
+
+    def test_get_returns_none_for_expired_entry(self):
+        """MemoryCache.get() returns None and drops an expired entry
+        """
+        self.cache.set('key', 'value', ttl=0)
+        self.assertIsNone(self.cache.get('key'))
+        self.assertEqual(0, len(self.cache))
+
+    def test_set_evicts_least_recently_used_entry(self):
+        """MemoryCache.set() evicts the least recently used entry if full
+        """
+        self.cache.set('a', 1)
+        self.cache.set('b', 2)
+        self.cache.get('a')
+        self.cache.set('c', 3)
+        self.assertEqual(1, self.cache.get('a'))
+        self.assertIsNone(self.cache.get('b'))
+        self.assertEqual(3, self.cache.get('c'))
+
+    def test_incr_increments_generation(self):
+        """MemoryCache.incr() increments the generation of a namespace
+        """
+        self.assertEqual(0, self.cache.generation('docs'))
+        self.cache.incr('docs')
+        self.assertEqual(1, self.cache.generation('docs'))
+        self.assertEqual(0, self.cache.generation('other'))
@@ -0,0 +1,223 @@
+import unittest
+
+from unittest.mock import patch
+
+from stackcite.api import resources, testing
+
+
+COLLSCAN = {'queryPlanner': {'winningPlan': {'stage': 'COLLSCAN'}}}
+IXSCAN = {'queryPlanner': {'winningPlan': {
+    'stage': 'FETCH', 'inputStage': {'stage': 'IXSCAN'}}}}
+
+
+class _Root(resources.APIIndexResource):
+    """
+    A root resource with a single collection resource.
+    """
+
+    def __init__(self, parent=None, name=None):
+        super().__init__(parent, name)
+        self['mock'] = testing.mock.MockAPICollectionResource
+
+
+class CollectionResourcesTests(unittest.TestCase):
+
+    layer = testing.layers.UnitTestLayer
+
+    def test_walks_traversal_tree(self):
+        """collection_resources() returns the collection resources of a traversal tree
+        """
+        from ..indexes import collection_resources
+        root = _Root()
+        root['index'] = resources.APIIndexResource
+        root['index']['nested'] = testing.mock.MockCollectionResource
+        result = collection_resources(root)
+        self.assertEqual(
+            [testing.mock.MockAPICollectionResource,
+             testing.mock.MockCollectionResource],
+            [type(r) for r in result])
+
+    def test_defaults_to_collection_resource_classes(self):
+        """collection_resources() defaults to every collection resource class
+        """
+        from ..indexes import collection_resources
+        result = [type(r) for r in collection_resources()]
+        self.assertIn(testing.mock.MockCollectionResource, result)
+        self.assertIn(testing.mock.MockAPICollectionResource, result)
+        self.assertNotIn(resources.APICollectionResource, result)
+
+
+class IndexTests(unittest.TestCase):
+
+    layer = testing.layers.UnitTestLayer
+
+    def setUp(self):
+        self.resource = testing.mock.MockAPICollectionResource(None, 'mock')
+
+    def test_required_indexes_back_sort_keys(self):
+        """required_indexes() returns an index on each sort key followed by _id
+        """
+        from ..indexes import required_indexes
+        self.resource._SORT_KEYS = ('number', 'id')
+        result = required_indexes(self.resource)
+        self.assertEqual([[('number', 1), ('_id', 1)]], result)
+
+    def test_required_indexes_default_to_indexed_fields(self):
+        """required_indexes() backs indexed fields if sort keys are unset
+        """
+        from ..indexes import required_indexes
+        result = required_indexes(self.resource)
+        self.assertEqual([[('name', 1), ('_id', 1)]], result)
+
+    def test_representative_queries(self):
+        """representative_queries() filters by every document field and sorts by every sort key
+        """
+        from ..indexes import representative_queries
+        result = {d: (q, s) for d, q, s in
+                  representative_queries(self.resource)}
+        self.assertEqual(
+            ({'number': {'$exists': True}}, None), result["filter on 'number'"])
+        self.assertEqual(
+            ({}, [('name', 1), ('_id', 1)]), result["sort by 'name'"])
+        self.assertCountEqual(
+            ["filter on 'name'", "filter on 'number'", "filter on 'fact'",
+             "sort by 'name'"], result)
+
+    def test_representative_queries_skip_unindexed_operators(self):
+        """representative_queries() skips fields that are allowed to scan
+        """
+        from ..indexes import representative_queries
+        self.resource._UNINDEXED_OPERATORS = ('number',)
+        result = [d for d, q, s in representative_queries(self.resource)]
+        self.assertNotIn("filter on 'number'", result)
+
+    def test_scans_collection_detects_collscan(self):
+        """scans_collection() detects a collection scan in a winning plan
+        """
+        from ..indexes import scans_collection
+        self.assertTrue(scans_collection(COLLSCAN))
+        self.assertFalse(scans_collection(IXSCAN))
+
+    def test_scans_collection_inspects_shards(self):
+        """scans_collection() inspects the winning plans of every shard
+        """
+        from ..indexes import scans_collection
+        plan = {'queryPlanner': {'winningPlan': {
+            'stage': 'SHARD_MERGE', 'shards': [
+                {'winningPlan': {'stage': 'IXSCAN'}},
+                {'winningPlan': {'stage': 'COLLSCAN'}}]}}}
+        self.assertTrue(scans_collection(plan))
+
+
+class VerifyTests(unittest.TestCase):
+
+    layer = testing.layers.UnitTestLayer
+
+    def setUp(self):
+        self.resource = testing.mock.MockAPICollectionResource(None, 'mock')
+        self.resource._UNINDEXED_OPERATORS = ('number', 'fact')
+
+    def explain(self, resource, query, sort=None):
+        return IXSCAN if 'name' in query or sort else COLLSCAN
+
+    def test_verify_reports_collection_scans(self):
+        """verify() describes representative queries that scan the collection
+        """
+        from .. import indexes
+        self.resource._UNINDEXED_OPERATORS = ('fact',)
+        with patch.object(indexes, 'explain', self.explain):
+            result = indexes.verify(self.resource)
+        self.assertEqual(
+            ["MockDocument: filter on 'number' scans the collection "
+             "(COLLSCAN)"], result)
+
+    def test_check_returns_no_problems(self):
+        """check() returns an empty list if no query scans a collection
+        """
+        from .. import indexes
+        with patch.object(indexes, 'explain', self.explain):
+            result = indexes.check([self.resource], ensure=False)
+        self.assertEqual([], result)
+
+    def test_check_warns_about_collection_scans(self):
+        """check() logs a warning for every query that scans a collection
+        """
+        from .. import indexes
+        with patch.object(indexes, 'explain', return_value=COLLSCAN):
+            with self.assertLogs('stackcite.api.indexes', 'WARNING') as cm:
+                result = indexes.check([self.resource], ensure=False)
+        self.assertEqual(2, len(result))
+        self.assertEqual(2, len(cm.output))
+
+    def test_check_fails_on_collection_scans(self):
+        """check() raises CollectionScanError in "fail" mode
+        """
+        from .. import indexes
+        with patch.object(indexes, 'explain', return_value=COLLSCAN):
+            with self.assertRaises(indexes.CollectionScanError):
+                indexes.check([self.resource], ensure=False, mode='fail')
+
+    def test_check_skips_verification(self):
+        """check() does not explain queries in "off" mode
+        """
+        from .. import indexes
+        with patch.object(indexes, 'explain') as explain:
+            result = indexes.check([self.resource], ensure=False, mode='off')
+        explain.assert_not_called()
+        self.assertEqual([], result)
+
+    def test_check_rejects_invalid_mode(self):
+        """check() raises ValueError for an unknown verification mode
+        """
+        from .. import indexes
+        with self.assertRaises(ValueError):
+            indexes.check([self.resource], mode='maybe')
+
+    def test_includeme_checks_indexes_on_startup(self):
+        """includeme() checks collection resources once the application is created
+        """
+        from pyramid.config import Configurator
+        from .. import indexes
+        config = Configurator(settings={
+            'indexes.root': 'stackcite.api.tests.test_indexes._Root',
+            'indexes.verify': 'fail'})
+        config.include('stackcite.api.indexes')
+        with patch.object(indexes, 'explain', return_value=COLLSCAN):
+            with patch.object(indexes, 'ensure_indexes') as ensure_indexes:
+                with self.assertRaises(indexes.CollectionScanError):
+                    config.make_wsgi_app()
+        ensure_indexes.assert_not_called()
+
+    def test_includeme_ensures_indexes_if_enabled(self):
+        """includeme() creates missing indexes on startup if indexes.ensure is set
+        """
+        from pyramid.config import Configurator
+        from .. import indexes
+        config = Configurator(settings={
+            'indexes.root': 'stackcite.api.tests.test_indexes._Root',
+            'indexes.ensure': 'true',
+            'indexes.verify': 'off'})
+        config.include('stackcite.api.indexes')
+        with patch.object(indexes, 'ensure_indexes') as ensure_indexes:
+            config.make_wsgi_app()
+        self.assertEqual(1, ensure_indexes.call_count)
+
+
+class EnsureIndexesTests(unittest.TestCase):
+
+    layer = testing.layers.MongoTestLayer
+
+    def setUp(self):
+        testing.mock.MockDocument.drop_collection()
+        self.resource = testing.mock.MockAPICollectionResource(None, 'mock')
+
+    def test_ensure_indexes_creates_required_indexes(self):
+        """ensure_indexes() creates meta and required indexes
+        """
+        from ..indexes import ensure_indexes
+        self.resource._SORT_KEYS = ('number',)
+        ensure_indexes(self.resource)
+        collection = testing.mock.MockDocument._get_collection()
+        keys = [info['key'] for info in collection.index_information().values()]
+        self.assertIn([('number', 1), ('_id', 1)], keys)
+        self.assertIn([('name', 1)], keys)
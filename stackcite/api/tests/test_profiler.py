@@ -0,0 +1,307 @@
+import unittest
+
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+from stackcite.api import testing
+
+
+def _event(command_name, command, request_id=1, reply=None, duration=2000):
+    return SimpleNamespace(
+        command_name=command_name, command=command, connection_id=('db', 1),
+        request_id=request_id, reply=reply or {}, duration_micros=duration)
+
+
+class FingerprintTests(unittest.TestCase):
+
+    layer = testing.layers.UnitTestLayer
+
+    def test_shape_replaces_values(self):
+        """shape() replaces values with placeholders, keeping fields and operators
+        """
+        from ..profiler import shape
+        query = {'name': 'x', 'number': {'$gt': 3, '$in': [1, 2, 3]},
+                 '$or': [{'a': 1}, {'a': 2}, {'b': 3}]}
+        expected = {'name': '?', 'number': {'$gt': '?', '$in': ['?']},
+                    '$or': [{'a': '?'}, {'b': '?'}]}
+        self.assertEqual(expected, shape(query))
+
+    def test_fingerprint_ignores_values(self):
+        """fingerprint() returns the same fingerprint for queries that differ in values
+        """
+        from ..profiler import fingerprint
+        first = fingerprint('find', {
+            'find': 'books', 'filter': {'year': {'$gt': 1900}}, 'limit': 10})
+        second = fingerprint('find', {
+            'find': 'books', 'filter': {'year': {'$gt': 2000}}, 'limit': 5})
+        self.assertEqual(first, second)
+        self.assertEqual('find books {"filter":{"year":{"$gt":"?"}}}', first)
+
+    def test_fingerprint_keeps_projection_and_sort(self):
+        """fingerprint() keeps projections and the order of sort keys
+        """
+        from ..profiler import fingerprint
+        command = {'find': 'books', 'filter': {}, 'projection': {'title': 1},
+                   'sort': {'year': -1, '_id': 1}}
+        result = fingerprint('find', command)
+        self.assertIn('"projection":{"title":1}', result)
+        self.assertIn('"sort":[["year",-1],["_id",1]]', result)
+
+    def test_fingerprint_ignores_other_commands(self):
+        """fingerprint() returns None for commands that are not profiled
+        """
+        from ..profiler import fingerprint
+        self.assertIsNone(fingerprint('hello', {'hello': 1}))
+
+    def test_resource_lineage_hides_document_ids(self):
+        """resource_lineage() replaces document names with a wildcard
+        """
+        from bson import ObjectId
+        from ..profiler import resource_lineage
+        collection = testing.mock.MockAPICollectionResource(None, 'mock')
+        document = collection[str(ObjectId())]
+        self.assertEqual('/mock', resource_lineage(collection))
+        self.assertEqual('/mock/*', resource_lineage(document))
+
+
+class HistogramTests(unittest.TestCase):
+
+    layer = testing.layers.UnitTestLayer
+
+    def test_observe_counts_durations_by_bucket(self):
+        """Histogram.observe() counts durations in their buckets
+        """
+        from ..profiler import Histogram
+        histogram = Histogram()
+        for duration in (0.5, 0.7, 3, 8000):
+            histogram.observe(duration)
+        buckets = histogram.as_dict()['buckets']
+        self.assertEqual(2, buckets['1'])
+        self.assertEqual(1, buckets['5'])
+        self.assertEqual(1, buckets['+Inf'])
+        self.assertEqual(4, histogram.count)
+        self.assertEqual(8000, histogram.max)
+
+    def test_percentile_returns_bucket_bound(self):
+        """Histogram.percentile() returns the upper bound of the percentile's bucket
+        """
+        from ..profiler import Histogram
+        histogram = Histogram()
+        for duration in [1.5] * 90 + [150] * 10:
+            histogram.observe(duration)
+        self.assertEqual(2, histogram.percentile(50))
+        self.assertEqual(150, histogram.percentile(99))
+
+
+class ProfilerTests(unittest.TestCase):
+
+    layer = testing.layers.UnitTestLayer
+
+    def setUp(self):
+        from ..profiler import Profiler
+        self.logger = MagicMock()
+        self.profiler = Profiler(threshold=100, logger=self.logger)
+
+    def make_request(self, name='mock'):
+        from pyramid.testing import DummyRequest
+        request = DummyRequest(path='/mock')
+        request.context = testing.mock.MockAPICollectionResource(None, name)
+        return request
+
+    def test_record_aggregates_by_fingerprint_and_lineage(self):
+        """Profiler.record() records durations by fingerprint and lineage
+        """
+        self.profiler.record('find a', 2.0, self.make_request())
+        self.profiler.record('find a', 4.0, self.make_request())
+        self.profiler.record('find b', 1.0)
+        self.assertEqual(2, self.profiler.fingerprints['find a'].count)
+        self.assertEqual(6.0, self.profiler.lineages['/mock'].total)
+        self.assertEqual(['/mock'], list(self.profiler.lineages))
+
+    def test_record_logs_slow_queries(self):
+        """Profiler.record() logs queries slower than the threshold with the view and principal
+        """
+        from pyramid import testing as pyramid_testing
+        config = pyramid_testing.setUp()
+        self.addCleanup(pyramid_testing.tearDown)
+        config.testing_securitypolicy(userid='user_id')
+        request = self.make_request()
+        self.profiler.record('find a', 2.0, request)
+        self.logger.warning.assert_not_called()
+        self.profiler.record('find a', 200.0, request)
+        args = self.logger.warning.call_args[0]
+        self.assertIn('find a', args)
+        self.assertIn('GET /mock', args)
+        self.assertIn('user_id', args)
+
+    def test_record_caps_fingerprints(self):
+        """Profiler.record() records new fingerprints past the maximum as OTHER
+        """
+        from ..profiler import OTHER
+        self.profiler.max_fingerprints = 1
+        self.profiler.record('find a', 1.0)
+        self.profiler.record('find b', 1.0)
+        self.assertEqual({'find a', OTHER}, set(self.profiler.fingerprints))
+
+    def test_top_orders_by_total_duration(self):
+        """Profiler.top() returns the fingerprints with the highest total duration
+        """
+        for key, duration in (('a', 5.0), ('b', 1.0), ('c', 3.0), ('c', 3.0)):
+            self.profiler.record(key, duration)
+        result = self.profiler.top(2)
+        self.assertEqual(['c', 'a'], [r['fingerprint'] for r in result])
+        self.assertEqual(6.0, result[0]['total'])
+
+    def test_reset_discards_histograms(self):
+        """Profiler.reset() discards every histogram
+        """
+        self.profiler.record('find a', 1.0, self.make_request())
+        self.profiler.reset()
+        self.assertEqual([], self.profiler.top())
+        self.assertEqual([], self.profiler.top(by='lineage'))
+
+
+class ProfilerListenerTests(unittest.TestCase):
+
+    layer = testing.layers.UnitTestLayer
+
+    def setUp(self):
+        from ..profiler import Profiler, ProfilerListener
+        self.profiler = Profiler(threshold=None)
+        self.listener = ProfilerListener(self.profiler)
+
+    def test_records_profiled_commands(self):
+        """ProfilerListener records the duration of profiled commands by fingerprint
+        """
+        command = {'find': 'books', 'filter': {'year': 1900}}
+        self.listener.started(_event('find', command))
+        self.listener.succeeded(_event('find', command))
+        [result] = self.profiler.top()
+        self.assertEqual(
+            'find books {"filter":{"year":"?"}}', result['fingerprint'])
+        self.assertEqual(2.0, result['total'])
+
+    def test_ignores_other_commands(self):
+        """ProfilerListener ignores commands that are not profiled
+        """
+        self.listener.started(_event('hello', {'hello': 1}))
+        self.listener.succeeded(_event('hello', {'hello': 1}))
+        self.assertEqual([], self.profiler.top())
+
+    def test_records_failed_commands(self):
+        """ProfilerListener records the duration of failed commands
+        """
+        command = {'delete': 'books', 'deletes': [{'q': {}, 'limit': 0}]}
+        self.listener.started(_event('delete', command))
+        self.listener.failed(_event('delete', command))
+        self.assertEqual(1, len(self.profiler.top()))
+
+    def test_attributes_get_more_to_cursor_query(self):
+        """ProfilerListener records getMore commands with the fingerprint of their cursor
+        """
+        command = {'find': 'books', 'filter': {'year': 1900}}
+        reply = {'cursor': {'id': 42, 'firstBatch': []}}
+        self.listener.started(_event('find', command))
+        self.listener.succeeded(_event('find', command, reply=reply))
+        more = {'getMore': 42, 'collection': 'books'}
+        self.listener.started(_event('getMore', more, request_id=2))
+        self.listener.succeeded(_event('getMore', more, request_id=2))
+        [result] = self.profiler.top()
+        self.assertEqual(2, result['count'])
+
+
+    def test_evicts_oldest_cursors(self):
+        """ProfilerListener stops tracking the oldest cursors past the maximum
+        """
+        from unittest.mock import patch
+        from .. import profiler
+        command = {'find': 'books', 'filter': {}}
+        with patch.object(profiler, '_MAX_CURSORS', 2):
+            for cursor_id in (1, 2, 3):
+                reply = {'cursor': {'id': cursor_id, 'firstBatch': []}}
+                self.listener.started(_event('find', command))
+                self.listener.succeeded(_event('find', command, reply=reply))
+        self.assertEqual([2, 3], list(self.listener._cursors))
+
+    def test_records_events_from_concurrent_threads(self):
+        """ProfilerListener records every command published by concurrent threads
+        """
+        import threading
+        command = {'find': 'books', 'filter': {}}
+
+        def publish(thread):
+            for request_id in range(200):
+                reply = {'cursor': {'id': thread * 1000 + request_id + 1}}
+                event = _event('find', command, request_id=request_id,
+                               reply=reply)
+                event.connection_id = ('db', thread)
+                self.listener.started(event)
+                self.listener.succeeded(event)
+
+        threads = [threading.Thread(target=publish, args=(idx,))
+                   for idx in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        [result] = self.profiler.top()
+        self.assertEqual(1600, result['count'])
+        self.assertEqual({}, self.listener._pending)
+
+
+class ProfilerEndpointTests(unittest.TestCase):
+
+    layer = testing.layers.UnitTestLayer
+
+    def make_app(self, settings):
+        from pyramid.config import Configurator
+        config = Configurator(settings=settings)
+        config.include('stackcite.api.renderers')
+        config.include('stackcite.api.profiler')
+        return config.make_wsgi_app()
+
+    def tearDown(self):
+        from .. import profiler
+        profiler.get_profiler().reset()
+
+    def test_endpoint_lists_top_fingerprints(self):
+        """profiler_view() lists the top fingerprints and lineages
+        """
+        from webob import Request
+        from .. import profiler
+        app = self.make_app({'profiler.endpoint': '/_debug/queries'})
+        for key in ('a', 'b', 'b'):
+            profiler.get_profiler().record(key, 1.0)
+        response = Request.blank('/_debug/queries?n=1').get_response(app)
+        self.assertEqual(200, response.status_code)
+        self.assertEqual(['b'], [
+            r['fingerprint'] for r in response.json['fingerprints']])
+        self.assertEqual([], response.json['lineages'])
+
+    def test_endpoint_is_disabled_by_default(self):
+        """includeme() does not add the profiler endpoint unless configured
+        """
+        from webob import Request
+        app = self.make_app({})
+        response = Request.blank('/_debug/queries').get_response(app)
+        self.assertEqual(404, response.status_code)
+
+    def test_includeme_sets_threshold(self):
+        """includeme() sets the slow query threshold of the profiler
+        """
+        from .. import profiler
+        self.make_app({'profiler.threshold': '25'})
+        self.assertEqual(25.0, profiler.get_profiler().threshold)
+        self.make_app({'profiler.threshold': ''})
+        self.assertIsNone(profiler.get_profiler().threshold)
+
+    def test_endpoint_requires_admins(self):
+        """ProfilerResource grants the debug permission to admins only
+        """
+        from pyramid.authorization import ACLHelper
+        from stackcite.api import auth
+        from ..profiler import ProfilerResource
+        context = ProfilerResource(None)
+        helper = ACLHelper()
+        self.assertTrue(helper.permits(context, [auth.ADMIN], 'debug'))
+        self.assertFalse(helper.permits(context, [auth.STAFF], 'debug'))
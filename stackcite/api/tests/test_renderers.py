@@ -0,0 +1,118 @@
+import datetime
+import json
+import unittest
+
+from stackcite.api import testing
+
+
+class DumpsTests(unittest.TestCase):
+
+    layer = testing.layers.UnitTestLayer
+
+    def test_returns_bytes(self):
+        """dumps() returns UTF-8 encoded JSON
+        """
+        from ..renderers import dumps
+        result = dumps({'name': 'café'})
+        self.assertEqual({'name': 'café'}, json.loads(result.decode()))
+
+    def test_adapts_object_ids(self):
+        """dumps() serializes ObjectIds as strings
+        """
+        from bson import ObjectId
+        from ..renderers import dumps
+        oid = ObjectId()
+        result = json.loads(dumps({'id': oid}).decode())
+        self.assertEqual({'id': str(oid)}, result)
+
+    def test_adapts_datetimes(self):
+        """dumps() serializes datetimes as ISO 8601 strings
+        """
+        from ..renderers import dumps
+        value = datetime.datetime(2017, 3, 1, 12, 30)
+        result = json.loads(dumps({'at': value}).decode())
+        self.assertEqual({'at': '2017-03-01T12:30:00'}, result)
+
+    def test_adapts_documents(self):
+        """dumps() serializes documents as dictionaries of set fields
+        """
+        from ..renderers import dumps
+        from ..models.tests.test_utils import _MockName
+        result = json.loads(dumps(_MockName(first='Nancy')).decode())
+        self.assertEqual({'first': 'Nancy'}, result)
+
+    def test_converts_non_string_keys(self):
+        """dumps() converts non-string dictionary keys into strings
+        """
+        from ..renderers import dumps
+        result = json.loads(dumps({0: 'error'}).decode())
+        self.assertEqual({'0': 'error'}, result)
+
+    def test_sorts_keys(self):
+        """dumps() sorts dictionary keys if sort_keys is True
+        """
+        from ..renderers import dumps
+        result = dumps({'b': 1, 'a': 2}, sort_keys=True)
+        self.assertEqual(b'{"a":2,"b":1}', result)
+
+    def test_raises_type_error_for_unsupported_values(self):
+        """dumps() raises a TypeError for values it cannot serialize
+        """
+        from ..renderers import dumps
+        with self.assertRaises(TypeError):
+            dumps({'value': object()})
+
+    def test_backends_match_stdlib(self):
+        """dumps() backends produce the same documents as the stdlib backend
+        """
+        from bson import ObjectId
+        from .. import renderers
+        data = {'id': ObjectId(), 'at': datetime.date(2017, 3, 1), 1: [None]}
+        expected = renderers._dumps_stdlib(data)
+        result = renderers.dumps(data)
+        self.assertEqual(json.loads(expected), json.loads(result))
+
+
+class LoadsTests(unittest.TestCase):
+
+    layer = testing.layers.UnitTestLayer
+
+    def test_decodes_bytes_and_strings(self):
+        """loads() decodes both bytes and strings
+        """
+        from ..renderers import loads
+        self.assertEqual({'a': 1}, loads(b'{"a": 1}'))
+        self.assertEqual({'a': 1}, loads('{"a": 1}'))
+
+    def test_raises_value_error_for_invalid_json(self):
+        """loads() raises a ValueError for invalid JSON
+        """
+        from ..renderers import loads
+        with self.assertRaises(ValueError):
+            loads(b'{"a": ')
+
+
+class JSONRendererTests(unittest.TestCase):
+
+    layer = testing.layers.UnitTestLayer
+
+    def setUp(self):
+        from pyramid.config import Configurator
+
+        def view(request):
+            return {'body': request.json_body}
+
+        config = Configurator()
+        config.include('stackcite.api.renderers')
+        config.add_route('test', '/')
+        config.add_view(view, route_name='test', renderer='json')
+        self.app = config.make_wsgi_app()
+
+    def test_renders_json(self):
+        """JSONRenderer renders view results as application/json
+        """
+        from webob import Request
+        request = Request.blank('/', method='POST', body=b'{"a": [1, 2]}')
+        response = request.get_response(self.app)
+        self.assertEqual('application/json', response.content_type)
+        self.assertEqual({'body': {'a': [1, 2]}}, response.json_body)
@@ -0,0 +1,94 @@
+import unittest
+
+from stackcite.api import testing
+
+
+class ParseSearchTests(unittest.TestCase):
+
+    layer = testing.layers.UnitTestLayer
+
+    def test_splits_terms_and_excluded_terms(self):
+        """parse_search() splits a search string into terms and negated terms
+        """
+        from ..search import parse_search
+        expected = (['some', 'important', 'notes'], ['draft'])
+        result = parse_search('Some Important-notes -DRAFT')
+        self.assertEqual(expected, result)
+
+
+class TextIndexTests(unittest.TestCase):
+
+    layer = testing.layers.UnitTestLayer
+
+    def setUp(self):
+        from ..search import TextIndex
+        self.index = TextIndex({'title': 10, 'notes': 1, 'authors.name': 2})
+        self.index.add(1, {'title': 'Moby Dick', 'notes': 'whale whale'})
+        self.index.add(2, {'title': 'The Whale', 'notes': 'another title'})
+        self.index.add(3, {'authors': [{'name': 'Herman Melville'}]})
+
+    def test_search_ranks_by_weighted_score(self):
+        """TextIndex.search() orders ids by their weighted score
+        """
+        self.assertEqual([2, 1], self.index.search('whale'))
+
+    def test_search_matches_any_term(self):
+        """TextIndex.search() matches documents containing any term
+        """
+        self.assertEqual([1, 3], self.index.search('moby melville'))
+
+    def test_search_excludes_negated_terms(self):
+        """TextIndex.search() excludes documents containing negated terms
+        """
+        self.assertEqual([1], self.index.search('whale -another'))
+
+    def test_search_indexes_lists_of_embedded_documents(self):
+        """TextIndex.search() indexes dotted paths through lists
+        """
+        self.assertEqual([3], self.index.search('herman'))
+
+
+class GetIndexTests(unittest.TestCase):
+
+    layer = testing.layers.MongoTestLayer
+
+    def setUp(self):
+        from ..testing.mock import MockDocument
+        MockDocument.drop_collection()
+        MockDocument(name='Some Important Document').save()
+
+    def test_caches_indexes(self):
+        """get_index() returns the same index until the collection is invalidated
+        """
+        from ..search import get_index, invalidate
+        from ..testing.mock import MockDocument
+        index = get_index(MockDocument, {'name': 1})
+        self.assertIs(index, get_index(MockDocument, {'name': 1}))
+        invalidate(MockDocument)
+        self.assertIsNot(index, get_index(MockDocument, {'name': 1}))
+
+    def test_builds_index_over_collection(self):
+        """get_index() indexes every document of a collection
+        """
+        from ..search import get_index, invalidate
+        from ..testing.mock import MockDocument
+        invalidate(MockDocument)
+        index = get_index(MockDocument, {'name': 1})
+        self.assertEqual(1, len(index.search('important')))
+
+    def test_connects_signals_of_indexed_classes_only(self):
+        """get_index() connects save and delete signals for the indexed document class only
+        """
+        from unittest.mock import MagicMock, patch
+        from .. import search
+        from ..testing.mock import MockDocument
+        signals = MagicMock(signals_available=True)
+        with patch.object(search, 'signals', signals), \
+                patch.object(search, '_CONNECTED', set()):
+            search.invalidate(MockDocument)
+            search.get_index(MockDocument, {'name': 1})
+            search.invalidate(MockDocument)
+            search.get_index(MockDocument, {'name': 1})
+        for signal in (signals.post_save, signals.post_delete):
+            signal.connect.assert_called_once_with(
+                search._invalidate_sender, sender=MockDocument)
@@ -0,0 +1,157 @@
+import unittest
+
+from unittest.mock import MagicMock
+
+from stackcite.api import testing
+
+
+class TimingsTests(unittest.TestCase):
+
+    layer = testing.layers.UnitTestLayer
+
+    def test_record_accumulates_durations_and_counts(self):
+        """Timings.record() accumulates durations and calls per stage
+        """
+        from ..timing import Timings
+        timings = Timings()
+        timings.record('mongo', 1.5)
+        timings.record('mongo', 2.0)
+        self.assertEqual(3.5, timings.durations['mongo'])
+        self.assertEqual(2, timings.counts['mongo'])
+
+    def test_stage_records_block(self):
+        """Timings.stage() records its block as a call of a stage
+        """
+        from ..timing import Timings
+        timings = Timings()
+        with timings.stage('load'):
+            pass
+        self.assertEqual(1, timings.counts['load'])
+        self.assertGreaterEqual(timings.durations['load'], 0)
+
+    def test_server_timing_formats_stages(self):
+        """Timings.server_timing() formats stages as a Server-Timing header
+        """
+        from ..timing import Timings
+        timings = Timings()
+        timings.record('load', 0.5)
+        timings.record('mongo', 1)
+        timings.record('mongo', 0.25)
+        expected = 'load;dur=0.50;desc="1 call", mongo;dur=1.25;desc="2 calls"'
+        self.assertEqual(expected, timings.server_timing())
+
+
+class StageTests(unittest.TestCase):
+
+    layer = testing.layers.UnitTestLayer
+
+    def test_does_nothing_outside_of_requests(self):
+        """stage() does nothing if there is no current request
+        """
+        from ..timing import current, stage
+        with stage('load'):
+            pass
+        self.assertIsNone(current())
+
+    def test_records_into_current_timings(self):
+        """stage() records into the timings of the current request
+        """
+        from .. import timing
+        timings = timing.Timings()
+        token = timing._current.set(timings)
+        try:
+            with timing.stage('load'):
+                pass
+        finally:
+            timing._current.reset(token)
+        self.assertEqual(1, timings.counts['load'])
+
+    def test_timed_records_calls(self):
+        """timed() records every call of a function
+        """
+        from .. import timing
+
+        @timing.timed('work')
+        def work(value):
+            return value
+
+        timings = timing.Timings()
+        token = timing._current.set(timings)
+        try:
+            result = work(1)
+            work(2)
+        finally:
+            timing._current.reset(token)
+        self.assertEqual(1, result)
+        self.assertEqual(2, timings.counts['work'])
+
+
+class MongoListenerTests(unittest.TestCase):
+
+    layer = testing.layers.UnitTestLayer
+
+    def test_records_commands(self):
+        """MongoListener records succeeded and failed commands as mongo calls
+        """
+        from .. import timing
+        listener = timing.MongoListener()
+        timings = timing.Timings()
+        token = timing._current.set(timings)
+        try:
+            listener.succeeded(MagicMock(duration_micros=1500))
+            listener.failed(MagicMock(duration_micros=500))
+        finally:
+            timing._current.reset(token)
+        self.assertEqual(2.0, timings.durations['mongo'])
+        self.assertEqual(2, timings.counts['mongo'])
+
+
+class TimingTweenTests(unittest.TestCase):
+
+    layer = testing.layers.UnitTestLayer
+
+    def make_app(self, settings=None):
+        from pyramid.config import Configurator
+        from stackcite.api import timing
+
+        def view(request):
+            with timing.stage('load'):
+                pass
+            return {'ok': True}
+
+        config = Configurator(settings=settings)
+        config.include('stackcite.api.renderers')
+        config.include('stackcite.api.timing')
+        config.add_route('test', '/')
+        config.add_view(view, route_name='test', renderer='json')
+        return config.make_wsgi_app()
+
+    def test_sets_server_timing_header(self):
+        """timing_tween_factory() sets a Server-Timing header with request stages
+        """
+        from webob import Request
+        app = self.make_app({'timing.header': 'true'})
+        response = Request.blank('/').get_response(app)
+        header = response.headers['Server-Timing']
+        for name in ('load', 'render', 'total'):
+            self.assertIn(name + ';dur=', header)
+
+    def test_header_is_disabled_by_default(self):
+        """timing_tween_factory() does not set a Server-Timing header unless enabled
+        """
+        from webob import Request
+        for settings in (None, {'timing.header': 'false'}):
+            app = self.make_app(settings)
+            response = Request.blank('/').get_response(app)
+            self.assertNotIn('Server-Timing', response.headers)
+
+    def test_reports_to_sink(self):
+        """timing_tween_factory() reports timings to the configured sink
+        """
+        from webob import Request
+        sink = MagicMock()
+        app = self.make_app({'timing.sink': sink})
+        Request.blank('/').get_response(app)
+        request, timings = sink.record.call_args[0]
+        self.assertEqual('/', request.path)
+        self.assertEqual(1, timings.counts['total'])
@@ -17,3 +17,45 @@ class LoadJSONFileTests(unittest.TestCase):
         expected = 'testPassed'
         result = data['testUtils']
         self.assertEqual(expected, result)
+
+
+class CursorTests(unittest.TestCase):
+
+    layer = testing.layers.UnitTestLayer
+
+    def test_decode_cursor_reverses_encode_cursor(self):
+        """decode_cursor() returns the values passed to encode_cursor()
+        """
+        from bson import ObjectId
+        expected = [42, ObjectId()]
+        from .. import utils
+        cursor = utils.encode_cursor(expected)
+        result = utils.decode_cursor(cursor)
+        self.assertEqual(expected, result)
+
+    def test_encode_cursor_returns_url_safe_string(self):
+        """encode_cursor() returns a string without URL-reserved characters
+        """
+        from bson import ObjectId
+        from .. import utils
+        result = utils.encode_cursor([ObjectId()])
+        for char in '+/=&?':
+            self.assertNotIn(char, result)
+
+    def test_decode_cursor_raises_exception_for_invalid_cursor(self):
+        """decode_cursor() raises ValueError for an invalid cursor
+        """
+        from .. import utils
+        for cursor in ('', 'nonsense', '!!!', utils.encode_cursor([])):
+            with self.assertRaises(ValueError):
+                utils.decode_cursor(cursor)
+
+    def test_decode_cursor_rejects_non_scalar_values(self):
+        """decode_cursor() raises ValueError for a tampered cursor with non-scalar values
+        """
+        from bson import ObjectId
+        from .. import utils
+        for value in ({'$ne': None}, [1, 2]):
+            cursor = utils.encode_cursor([value, ObjectId()])
+            with self.assertRaises(ValueError):
+                utils.decode_cursor(cursor)
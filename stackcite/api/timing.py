@@ -0,0 +1,228 @@
+"""
+Per-request timing of the stages of API requests (e.g. schema ``load``,
+``query`` building, ``mongo`` round trips, ``dump`` and ``render``).
+Applications can include this module (``config.include(
+'stackcite.api.timing')``) to time every request, which:
+
+    * Adds a tween that collects a :class:`Timings` for each request and
+      (optionally) sets a ``Server-Timing`` response header
+    * Registers a :class:`MongoListener` that counts and times MongoDB
+      commands (only clients created afterwards are monitored)
+
+Recognized settings include:
+
+    * ``timing.header``: Set ``Server-Timing`` headers (``false`` by
+      default). The header exposes internal stage durations and MongoDB
+      round trips to every client, so only enable it in development or
+      behind a proxy that strips it.
+    * ``timing.sink``: A dotted name of an :class:`IMetricsSink` (class or
+      instance) that receives the timings of every request
+
+Code reports into the current request's timings with :func:`stage` or
+:func:`timed`, which do nothing outside of a timed request.
+"""
+
+import collections
+import contextlib
+import contextvars
+import functools
+import logging
+import time
+
+from pymongo import monitoring
+
+from pyramid.path import DottedNameResolver
+from pyramid.settings import asbool
+
+
+# The timings of the current request (if any):
+_current = contextvars.ContextVar('stackcite_timings', default=None)
+
+# A reusable context manager for code that runs outside of timed requests:
+_NULL_STAGE = contextlib.nullcontext()
+
+# The listener registered by :func:`includeme`:
+_listener = None
+
+
+class _Stage(object):
+
+    __slots__ = ('timings', 'name', 'start')
+
+    def __init__(self, timings, name):
+        self.timings = timings
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        elapsed = (time.perf_counter() - self.start) * 1000
+        self.timings.record(self.name, elapsed)
+
+
+class Timings(object):
+    """
+    Accumulates the total duration (in milliseconds) and number of calls of
+    named stages. Stages can be nested, so durations may overlap.
+    """
+
+    def __init__(self):
+        self.durations = collections.OrderedDict()
+        self.counts = collections.Counter()
+
+    def record(self, name, duration):
+        """
+        Adds a call of ``duration`` milliseconds to the stage ``name``.
+        """
+        self.durations[name] = self.durations.get(name, 0.0) + duration
+        self.counts[name] += 1
+
+    def stage(self, name):
+        """
+        Returns a context manager that records the time spent in its block
+        as a call of the stage ``name``.
+        """
+        return _Stage(self, name)
+
+    def server_timing(self):
+        """
+        Formats timings as the value of a ``Server-Timing`` header, e.g.
+        ``mongo;dur=1.25;desc="2 calls"``.
+        """
+        return ', '.join(
+            '{};dur={:.2f};desc="{} call{}"'.format(
+                name, duration, self.counts[name],
+                '' if self.counts[name] == 1 else 's')
+            for name, duration in self.durations.items())
+
+
+def current():
+    """
+    Returns the :class:`Timings` of the current request or ``None``.
+    """
+    return _current.get()
+
+
+def stage(name):
+    """
+    Returns a context manager that records its block as a call of the stage
+    ``name`` of the current request (if any).
+    """
+    timings = _current.get()
+    if timings is None:
+        return _NULL_STAGE
+    return _Stage(timings, name)
+
+
+def timed(name):
+    """
+    A decorator that records every call of a function as a call of the stage
+    ``name`` of the current request (if any).
+    """
+
+    def decorator(func):
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with stage(name):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+class MongoListener(monitoring.CommandListener):
+    """
+    A ``pymongo`` command listener that records every MongoDB command as a
+    call of the ``mongo`` stage of the current request (if any). Commands
+    issued while streaming a response body run after the request's timings
+    are reported and are not recorded.
+    """
+
+    def started(self, event):
+        pass
+
+    def succeeded(self, event):
+        self._record(event)
+
+    def failed(self, event):
+        self._record(event)
+
+    @staticmethod
+    def _record(event):
+        timings = _current.get()
+        if timings is not None:
+            timings.record('mongo', event.duration_micros / 1000)
+
+
+class IMetricsSink(object):
+    """
+    A common interface for receivers of request timings (e.g. a StatsD
+    client or an in-process aggregator).
+    """
+
+    def record(self, request, timings):
+        """
+        Receives the :class:`Timings` of a completed request.
+        """
+        raise NotImplementedError()
+
+
+class LogSink(IMetricsSink):
+    """
+    Logs the timings of every request.
+
+    :param logger: A logger (or the ``stackcite.api.timing`` logger)
+    :param level: The level of log records
+    """
+
+    def __init__(self, logger=None, level=logging.DEBUG):
+        self.logger = logger or logging.getLogger(__name__)
+        self.level = level
+
+    def record(self, request, timings):
+        self.logger.log(
+            self.level, '%s %s %s',
+            request.method, request.path, timings.server_timing())
+
+
+def _resolve_sink(value):
+    value = DottedNameResolver().maybe_resolve(value) if value else None
+    return value() if isinstance(value, type) else value
+
+
+def timing_tween_factory(handler, registry):
+    """
+    A Pyramid tween factory that times every request and reports its
+    timings to the configured sink.
+    """
+    settings = registry.settings or {}
+    header = asbool(settings.get('timing.header', False))
+    sink = _resolve_sink(settings.get('timing.sink'))
+
+    def timing_tween(request):
+        timings = Timings()
+        token = _current.set(timings)
+        try:
+            with timings.stage('total'):
+                response = handler(request)
+        finally:
+            _current.reset(token)
+        if header:
+            response.headers['Server-Timing'] = timings.server_timing()
+        if sink is not None:
+            sink.record(request, timings)
+        return response
+
+    return timing_tween
+
+
+def includeme(config):
+    global _listener
+    if _listener is None:
+        _listener = MongoListener()
+        monitoring.register(_listener)
+    config.add_tween('stackcite.api.timing.timing_tween_factory')
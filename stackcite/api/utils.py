@@ -1,8 +1,53 @@
 import os
 import json
+import base64
+import datetime
+
+import bson
+import bson.decimal128
 
 
 def load_json_file(directory, filename):
     path = os.path.join(directory, filename)
     with open(path) as json_file:
         return json.load(json_file)
+
+
+# The types of sort key values accepted in cursors (besides None). Other
+# values (e.g. dictionaries) could be interpreted as query operators:
+CURSOR_TYPES = (bool, int, float, str, datetime.datetime, bson.ObjectId,
+                bson.decimal128.Decimal128)
+
+
+def encode_cursor(values):
+    """
+    Encodes a list of sort key values into an opaque, URL-safe cursor string.
+
+    :param values: A list or tuple of BSON-serializable values
+    :return str: An opaque cursor string
+    """
+    data = bson.BSON.encode({'v': list(values)})
+    return base64.urlsafe_b64encode(data).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor):
+    """
+    Decodes an opaque cursor string produced by :func:`encode_cursor` back
+    into a list of sort key values. Raises :class:`ValueError` if the cursor
+    cannot be decoded or holds a value that is not a scalar or an
+    ``ObjectId`` (see ``CURSOR_TYPES``).
+
+    :param str cursor: An opaque cursor string
+    :return list: A list of sort key values
+    """
+    try:
+        padding = '=' * (-len(cursor) % 4)
+        data = base64.urlsafe_b64decode(cursor + padding)
+        values = bson.BSON(data).decode()['v']
+    except (TypeError, ValueError, KeyError, bson.errors.BSONError):
+        raise ValueError('Invalid cursor: {}'.format(cursor))
+    if not isinstance(values, list) or not values or not all(
+            value is None or isinstance(value, CURSOR_TYPES)
+            for value in values):
+        raise ValueError('Invalid cursor: {}'.format(cursor))
+    return values
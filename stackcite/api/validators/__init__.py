@@ -1,6 +1,13 @@
-from .groups import validate_group
-from .isbns import validate_isbn, validate_isbn10, validate_isbn13
-from .keys import validate_key
-from .oids import validate_objectid
-from .passwords import validate_password
-from .usernames import validate_username
+from .groups import validate_group, validate_group_many
+from .isbns import (
+    validate_isbn,
+    validate_isbn10,
+    validate_isbn13,
+    validate_isbn_many,
+    isbn10_to_isbn13,
+    normalize_isbn_many
+)
+from .keys import validate_key, validate_key_many
+from .oids import validate_objectid, validate_objectid_many
+from .passwords import validate_password, validate_password_many
+from .usernames import validate_username, validate_username_many
@@ -1,6 +1,10 @@
 from stackcite.api.config import auth
 
 
+# Known groups, for constant-time membership tests:
+_GROUPS = frozenset(auth.GROUPS)
+
+
 def validate_group(group):
     """
     Validates a given group. Returns the initial ``group`` string if
@@ -8,5 +12,15 @@ def validate_group(group):
 
     :param str group: A group name string.
     """
-    if group in auth.GROUPS:
+    if isinstance(group, str) and group in _GROUPS:
         return group
+
+
+def validate_group_many(groups):
+    """
+    Validates an iterable of groups in a single pass.
+
+    :param groups: An iterable of group name strings
+    :return list: A mask of booleans, ``True`` for each valid group
+    """
+    return [isinstance(g, str) and g in _GROUPS for g in groups]
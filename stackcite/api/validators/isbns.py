@@ -1,53 +1,64 @@
-def _tokenize_isbn(isbn):
+import re
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+# Separators stripped from canonical ISBNs:
+_SEPARATORS = str.maketrans('', '', '- ')
+
+# Canonical ISBN formats (an ISBN-10 check digit may be 'X'):
+_ISBN10 = re.compile(r'[0-9]{9}[0-9X]')
+_ISBN13 = re.compile(r'[0-9]{13}')
+
+# Digit values, including 'X' (10) for ISBN-10 check digits:
+_VALUES = {c: v for v, c in enumerate('0123456789X')}
+
+# A weighted sum of a valid ISBN-10 is a multiple of 11, and of a valid
+# ISBN-13, a multiple of 10:
+_ISBN10_WEIGHTS = tuple(range(10, 0, -1))
+_ISBN13_WEIGHTS = (1, 3) * 6 + (1,)
+
+# The EAN prefix of ISBN-13s converted from ISBN-10s:
+_ISBN13_PREFIX = '978'
+
+
+def _canonical(isbn):
     """
-    Converts a string representation of an ISBN into a list of digits.
+    Strips separators (hyphens and spaces) from an ISBN string.
 
     :param isbn: A string formatted ISBN-10 or ISBN-13
-    :return: A list formatted ISBN-10 or ISBN-13
+    :return: A canonical ISBN string, or ``None`` if ``isbn`` is not a string
     """
+    if isinstance(isbn, str):
+        return isbn.translate(_SEPARATORS).upper()
 
-    digits = []
-    for digit in isbn:
-        try:
-            digits.append(int(digit))
-        except ValueError:
-            if digit is 'X':
-                digits.append(10)
-    return digits
 
-
-def _calc_isbn10_check_digit(digits):
+def _checksum(isbn, weights):
     """
-    Calculates a valid check digit for the first nine digits of an ISBN-10.
-
-    :param digits: A list containing the first nine digits of an ISBN-10
-    :return: A valid ISBN-13 check digit
+    Calculates the weighted sum of the digits of a canonical ISBN.
     """
+    return sum(w * _VALUES[c] for w, c in zip(weights, isbn))
 
-    val = 0
-    for idx, dgt in enumerate(digits):
-        val += ((idx + 1) * dgt)
-    return val % 11
 
+def _is_isbn10(isbn):
+    return (_ISBN10.fullmatch(isbn) is not None and
+            not _checksum(isbn, _ISBN10_WEIGHTS) % 11)
 
-def _calc_isbn13_check_digit(digits):
-    """
-    Calculates a valid check digit for the first twelve digits of an ISBN-13.
 
-    :param digits: A list containing the first twelve digits of an ISBN-13
-    :return: A valid ISBN-13 check digit
-    """
+def _is_isbn13(isbn):
+    return (_ISBN13.fullmatch(isbn) is not None and
+            not _checksum(isbn, _ISBN13_WEIGHTS) % 10)
 
-    val = 0
-    for idx, dgt in enumerate(digits):
-        if not idx % 2:
-            val += (dgt * 1)
-        else:
-            val += (dgt * 3)
-    r = val % 10
-    if r == 0:
-        r = 10
-    return 10 - r
+
+def _to_isbn13(isbn10):
+    """
+    Converts a canonical ISBN-10 into a canonical ISBN-13.
+    """
+    isbn = _ISBN13_PREFIX + isbn10[:9]
+    return isbn + str(-_checksum(isbn, _ISBN13_WEIGHTS) % 10)
 
 
 def validate_isbn10(isbn10):
@@ -57,12 +68,9 @@ def validate_isbn10(isbn10):
     :param str isbn10: A string-formatted ISBN-10
     :return str: A valid ISBN-10 string or ``None``
     """
-
-    digits = _tokenize_isbn(isbn10)
-    if len(digits) is 10:
-        check_digit = digits.pop(-1)
-        if check_digit is _calc_isbn10_check_digit(digits):
-            return isbn10.replace('-', '')
+    isbn = _canonical(isbn10)
+    if isbn and _is_isbn10(isbn):
+        return isbn
 
 
 def validate_isbn13(isbn13):
@@ -72,12 +80,9 @@ def validate_isbn13(isbn13):
     :param str isbn13: A string-formatted ISBN-13
     :return str: A valid ISBN-13 string or ``None``
     """
-
-    digits = _tokenize_isbn(isbn13)
-    if len(digits) is 13:
-        check_digit = digits.pop(-1)
-        if check_digit is _calc_isbn13_check_digit(digits):
-            return isbn13.replace('-', '')
+    isbn = _canonical(isbn13)
+    if isbn and _is_isbn13(isbn):
+        return isbn
 
 
 def validate_isbn(isbn):
@@ -88,5 +93,107 @@ def validate_isbn(isbn):
     :param str isbn: A string-formatted ISBN-10 or ISBN-13
     :return str: A valid ISBN string or ``None``
     """
+    isbn = _canonical(isbn)
+    if isbn and (_is_isbn10(isbn) or _is_isbn13(isbn)):
+        return isbn
+
+
+def isbn10_to_isbn13(isbn10):
+    """
+    Converts a valid ISBN-10 into an equivalent ISBN-13.
+
+    :param str isbn10: A string-formatted ISBN-10
+    :return str: A canonical ISBN-13 string or ``None`` if ``isbn10`` is
+        invalid
+    """
+    isbn = validate_isbn10(isbn10)
+    if isbn:
+        return _to_isbn13(isbn)
+
+
+def normalize_isbn_many(isbns, isbn13=False):
+    """
+    Validates and normalizes a sequence of ISBNs in bulk. Uses vectorized
+    checksums if ``numpy`` is installed.
+
+    :param isbns: A sequence of string-formatted ISBN-10s or ISBN-13s
+    :param isbn13: Converts valid ISBN-10s into ISBN-13s if ``True``
+    :return list: A list of canonical ISBN strings, with ``None`` in place of
+        each invalid ISBN
+    """
+    isbns = [_canonical(isbn) for isbn in isbns]
+    if numpy is None:
+        return _normalize_many(isbns, isbn13)
+    return _normalize_many_numpy(isbns, isbn13)
+
+
+def validate_isbn_many(isbns):
+    """
+    Validates a sequence of ISBNs in bulk.
+
+    :param isbns: A sequence of string-formatted ISBN-10s or ISBN-13s
+    :return list: A mask of booleans, ``True`` for each valid ISBN
+    """
+    return [isbn is not None for isbn in normalize_isbn_many(isbns)]
+
+
+def _normalize_many(isbns, isbn13):
+    """
+    Validates and normalizes canonical ISBNs one at a time.
+    """
+    results = []
+    for isbn in isbns:
+        if not isbn:
+            results.append(None)
+        elif _is_isbn10(isbn):
+            results.append(_to_isbn13(isbn) if isbn13 else isbn)
+        elif _is_isbn13(isbn):
+            results.append(isbn)
+        else:
+            results.append(None)
+    return results
+
+
+def _normalize_many_numpy(isbns, isbn13):
+    """
+    Validates and normalizes canonical ISBNs with vectorized checksums. ISBNs
+    of each length are packed into a matrix of digits with one row per ISBN.
+    """
+    results = [None] * len(isbns)
+    for length, weights, modulus in ((10, _ISBN10_WEIGHTS, 11),
+                                     (13, _ISBN13_WEIGHTS, 10)):
+        indexes = [idx for idx, isbn in enumerate(isbns)
+                   if isbn and len(isbn) == length and isbn.isascii()]
+        if not indexes:
+            continue
+        raw = ''.join(isbns[idx] for idx in indexes).encode('ascii')
+        digits = numpy.frombuffer(raw, dtype=numpy.uint8).reshape(-1, length)
+        digits = digits.astype(numpy.int64) - ord('0')
+        valid = ((digits >= 0) & (digits <= 9))
+        if length == 10:
+            check_x = digits[:, -1] == ord('X') - ord('0')
+            digits[check_x, -1] = 10
+            valid[:, -1] |= check_x
+        valid = valid.all(axis=1)
+        valid &= (digits @ numpy.array(weights)) % modulus == 0
+        valid_indexes = [idx for idx, ok in zip(indexes, valid) if ok]
+        if length == 10 and isbn13:
+            converted = _to_isbn13_numpy(digits[valid])
+            for idx, isbn in zip(valid_indexes, converted):
+                results[idx] = isbn
+        else:
+            for idx in valid_indexes:
+                results[idx] = isbns[idx]
+    return results
 
-    return validate_isbn10(isbn) or validate_isbn13(isbn)
+
+def _to_isbn13_numpy(digits):
+    """
+    Converts a matrix of valid ISBN-10 digits into a list of ISBN-13s.
+    """
+    prefix = numpy.array([int(c) for c in _ISBN13_PREFIX])
+    body = numpy.hstack([numpy.tile(prefix, (len(digits), 1)), digits[:, :9]])
+    check = -(body @ numpy.array(_ISBN13_WEIGHTS[:12])) % 10
+    isbns = numpy.hstack([body, check[:, None]]) + ord('0')
+    raw = isbns.astype(numpy.uint8).tobytes().decode('ascii')
+    return [raw[idx:idx + 13] for idx in range(0, len(raw), 13)]
@@ -1,6 +1,11 @@
 import re
 
 
+# Exactly 56 characters, excluding whitespace and special characters:
+_SPEC_CHARS = re.escape(r"`~!@#$%^&*()+-=[]{};':\"<>,./?\|")
+_KEY = re.compile(r"[^" + _SPEC_CHARS + r"\s]{56}")
+
+
 def validate_key(key):
     """
     Validates a given API key. Returns the initial `key` value if it is
@@ -14,12 +19,16 @@ def validate_key(key):
     * May not include special characters
     * May not include a space (including newline characters)
     """
-    if not isinstance(key, str):
-        return None
-    else:
-        white_list = re.compile(r"^[\S]{56}$")
-        spec_chars = re.escape(r"`~!@#$%^&*()+-=[]{};':\"<>,./?\|")
-        black_list = re.compile(r"[" + spec_chars + r"\s\n]")
-        if not white_list.search(key) or black_list.search(key):
-            return None
-    return key
+    if isinstance(key, str) and _KEY.fullmatch(key):
+        return key
+
+
+def validate_key_many(keys):
+    """
+    Validates an iterable of API keys in a single pass.
+
+    :param keys: An iterable of API key strings
+    :return list: A mask of booleans, ``True`` for each valid key
+    """
+    match = _KEY.fullmatch
+    return [isinstance(k, str) and match(k) is not None for k in keys]
@@ -16,3 +16,14 @@ def validate_objectid(object_id):
         return object_id
     except InvalidId:
         return None
+
+
+def validate_objectid_many(object_ids):
+    """
+    Validates an iterable of ObjectId strings in a single pass.
+
+    :param object_ids: An iterable of ObjectId strings
+    :return list: A mask of booleans, ``True`` for each valid ObjectId
+    """
+    is_valid = ObjectId.is_valid
+    return [isinstance(o, str) and is_valid(o) for o in object_ids]
@@ -1,6 +1,22 @@
 import re
 
 
+_SPEC_CHARS = re.escape("`~!@#$%^&*()_+-=[]{};':\"<>,./?\|")
+
+# Character classes that every password must include:
+_RULES = (
+    re.compile(r"[a-z]").search,
+    re.compile(r"[A-Z]").search,
+    re.compile(r"[0-9]").search,
+    re.compile(r"[" + _SPEC_CHARS + r"]").search
+)
+
+
+def _is_password(password):
+    return (isinstance(password, str) and 8 <= len(password) <= 50 and
+            all(rule(password) for rule in _RULES))
+
+
 def validate_password(password):
     """
     Validates a given password. Returns the initial ``password`` string if
@@ -16,18 +32,15 @@ def validate_password(password):
     * Contains at-least one digit.
     * Contains at-least one basic symbol.
     """
-    if not isinstance(password, str):
-        return None
-    else:
-        spec_chars = re.escape("`~!@#$%^&*()_+-=[]{};':\"<>,./?\|")
-        rules = [
-            re.compile(r"^[\s\S]{8,50}$"),
-            re.compile(r"[a-z]"),
-            re.compile(r"[A-Z]"),
-            re.compile(r"[0-9]"),
-            re.compile(r"[" + spec_chars + r"]")
-            ]
-        for rule in rules:
-            if not rule.search(password):
-                return None
-    return password
+    if _is_password(password):
+        return password
+
+
+def validate_password_many(passwords):
+    """
+    Validates an iterable of passwords in a single pass.
+
+    :param passwords: An iterable of password strings
+    :return list: A mask of booleans, ``True`` for each valid password
+    """
+    return [_is_password(p) for p in passwords]
@@ -33,3 +33,10 @@ class ValidateGroupUnitTests(unittest.TestCase):
         from ..groups import validate_group
         result = validate_group('invalid_group')
         self.assertIsNone(result)
+
+    def test_group_many_returns_mask(self):
+        """'validate_group_many()' returns a mask of valid groups
+        """
+        from ..groups import validate_group_many
+        result = validate_group_many(['users', 'invalid_group', None, 'admin'])
+        self.assertEqual([True, False, False, True], result)
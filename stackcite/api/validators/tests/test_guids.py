@@ -45,3 +45,13 @@ class ValidateObjectIdTests(unittest.TestCase):
         for oid in invalid_types:
             result = validate_objectid(oid)
             self.assertIsNone(result)
+
+    def test_objectid_many_returns_mask(self):
+        """'validate_objectid_many()' returns a mask matching 'validate_objectid()'
+        """
+        objectids = testing.data.validation.valid_guids()
+        objectids += testing.data.validation.invalid_guids() + ['', None, False]
+        from ..oids import validate_objectid, validate_objectid_many
+        expected = [validate_objectid(v) is not None for v in objectids]
+        result = validate_objectid_many(objectids)
+        self.assertEqual(expected, result)
@@ -35,3 +35,91 @@ class ValidateISBNTests(unittest.TestCase):
         for isbn in invalid_isbns:
             result = validate_isbn(isbn)
             self.assertIsNone(result)
+
+    def test_validate_isbn_strips_spaces(self):
+        """validate_isbn() strips spaces as well as hyphens
+        """
+        from ..isbns import validate_isbn
+        result = validate_isbn('978 0 306 40615 7')
+        self.assertEqual('9780306406157', result)
+
+    def test_validate_isbn10_rejects_x_before_check_digit(self):
+        """validate_isbn10() rejects an 'X' anywhere but the check digit
+        """
+        from ..isbns import validate_isbn10
+        result = validate_isbn10('X985339896')
+        self.assertIsNone(result)
+
+
+class ISBN10ToISBN13Tests(unittest.TestCase):
+
+    layer = testing.layers.UnitTestLayer
+
+    def test_converts_valid_isbn10(self):
+        """isbn10_to_isbn13() returns an equivalent ISBN-13
+        """
+        from ..isbns import isbn10_to_isbn13
+        result = isbn10_to_isbn13('0-306-40615-2')
+        self.assertEqual('9780306406157', result)
+
+    def test_converts_isbn10_with_x_check_digit(self):
+        """isbn10_to_isbn13() converts an ISBN-10 with an 'X' check digit
+        """
+        from ..isbns import isbn10_to_isbn13, validate_isbn13
+        result = isbn10_to_isbn13('098533987-X')
+        self.assertEqual('9780985339876', validate_isbn13(result))
+
+    def test_invalid_isbn10_returns_none(self):
+        """isbn10_to_isbn13() returns `None` if the ISBN-10 is invalid
+        """
+        from ..isbns import isbn10_to_isbn13
+        result = isbn10_to_isbn13('0306406153')
+        self.assertIsNone(result)
+
+
+class NormalizeISBNManyTests(unittest.TestCase):
+
+    layer = testing.layers.UnitTestLayer
+
+    def setUp(self):
+        self.isbns = testing.data.validation.valid_isbn10s()
+        self.isbns += testing.data.validation.valid_isbn13s()
+        self.isbns += testing.data.validation.invalid_isbns()
+        self.isbns += ['', None, 'ISBN', '978-0-306-40615-7٣']
+
+    def test_returns_same_isbns_as_validate_isbn(self):
+        """normalize_isbn_many() returns the same ISBNs as validate_isbn()
+        """
+        from ..isbns import normalize_isbn_many, validate_isbn
+        expected = [validate_isbn(isbn) for isbn in self.isbns]
+        result = normalize_isbn_many(self.isbns)
+        self.assertEqual(expected, result)
+
+    def test_converts_isbn10s_to_isbn13s(self):
+        """normalize_isbn_many() converts ISBN-10s if isbn13 is set
+        """
+        from ..isbns import normalize_isbn_many, isbn10_to_isbn13
+        isbn10s = testing.data.validation.valid_isbn10s()
+        expected = [isbn10_to_isbn13(isbn) for isbn in isbn10s]
+        result = normalize_isbn_many(isbn10s, isbn13=True)
+        self.assertEqual(expected, result)
+
+    def test_python_and_numpy_results_match(self):
+        """normalize_isbn_many() returns the same results with or without numpy
+        """
+        from .. import isbns
+        if isbns.numpy is None:
+            self.skipTest('numpy is not installed')
+        canonical = [isbns._canonical(isbn) for isbn in self.isbns]
+        for isbn13 in (False, True):
+            expected = isbns._normalize_many(canonical, isbn13)
+            result = isbns._normalize_many_numpy(canonical, isbn13)
+            self.assertEqual(expected, result)
+
+    def test_validate_isbn_many_returns_mask(self):
+        """validate_isbn_many() returns a mask matching validate_isbn()
+        """
+        from ..isbns import validate_isbn_many, validate_isbn
+        expected = [validate_isbn(isbn) is not None for isbn in self.isbns]
+        result = validate_isbn_many(self.isbns)
+        self.assertEqual(expected, result)
@@ -32,3 +32,13 @@ class ValidateKeyUnitTests(unittest.TestCase):
         from ..keys import validate_key
         for key in non_keys:
             self.assertEqual(validate_key(key), None)
+
+    def test_key_many_returns_mask(self):
+        """'validate_key_many()' returns a mask matching 'validate_key()'
+        """
+        keys = testing.data.validation.valid_keys()
+        keys += testing.data.validation.invalid_keys() + ['', None, False]
+        from ..keys import validate_key, validate_key_many
+        expected = [validate_key(v) is not None for v in keys]
+        result = validate_key_many(keys)
+        self.assertEqual(expected, result)
@@ -32,3 +32,13 @@ class ValidatePasswordUnitTests(unittest.TestCase):
         from ..passwords import validate_password
         for password in non_passwords:
             self.assertEqual(validate_password(password), None)
+
+    def test_password_many_returns_mask(self):
+        """'validate_password_many()' returns a mask matching 'validate_password()'
+        """
+        passwords = testing.data.validation.valid_passwords()
+        passwords += testing.data.validation.invalid_passwords() + ['', None, False]
+        from ..passwords import validate_password, validate_password_many
+        expected = [validate_password(v) is not None for v in passwords]
+        result = validate_password_many(passwords)
+        self.assertEqual(expected, result)
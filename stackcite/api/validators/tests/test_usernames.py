@@ -32,3 +32,13 @@ class ValidateUsernameUnitTests(unittest.TestCase):
         from ..usernames import validate_username
         for username in non_usernames:
             self.assertEqual(validate_username(username), None)
+
+    def test_username_many_returns_mask(self):
+        """'validate_username_many()' returns a mask matching 'validate_username()'
+        """
+        usernames = testing.data.validation.valid_usernames()
+        usernames += testing.data.validation.invalid_usernames() + ['', None, False]
+        from ..usernames import validate_username, validate_username_many
+        expected = [validate_username(v) is not None for v in usernames]
+        result = validate_username_many(usernames)
+        self.assertEqual(expected, result)
@@ -1,6 +1,11 @@
 import re
 
 
+# 3-32 characters, excluding whitespace and special characters but '_':
+_SPEC_CHARS = re.escape(r"`~!@#$%^&*()+-=[]{};':\"<>,./?\|")
+_USERNAME = re.compile(r"[^" + _SPEC_CHARS + r"\s]{3,32}")
+
+
 def validate_username(username):
     """
     Validates a given username. Returns the initial `username` value if it is
@@ -17,12 +22,16 @@ def validate_username(username):
     * No whitespaces (including newline characters)
     * No special characters (except for '_')
     """
-    if not isinstance(username, str):
-        return None
-    else:
-        white_list = re.compile(r"^[\S]{3,32}$")
-        spec_chars = re.escape(r"`~!@#$%^&*()+-=[]{};':\"<>,./?\|")
-        black_list = re.compile(r"[" + spec_chars + r"\s\n]")
-        if not white_list.search(username) or black_list.search(username):
-            return None
-    return username
+    if isinstance(username, str) and _USERNAME.fullmatch(username):
+        return username
+
+
+def validate_username_many(usernames):
+    """
+    Validates an iterable of usernames in a single pass.
+
+    :param usernames: An iterable of username strings
+    :return list: A mask of booleans, ``True`` for each valid username
+    """
+    match = _USERNAME.fullmatch
+    return [isinstance(u, str) and match(u) is not None for u in usernames]
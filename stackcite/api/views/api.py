@@ -1,4 +1,5 @@
 import functools
+import hashlib
 import mongoengine
 import marshmallow
 import json
@@ -12,7 +13,7 @@ from pyramid.view import (
     notfound_view_config
 )
 
-from stackcite.api import exceptions, resources
+from stackcite.api import exceptions, renderers, resources, timing
 
 from . import base
 
@@ -20,13 +21,15 @@ from . import base
 def managed_view(view_method):
     """
     An exception manager for catching expected base exceptions in view methods
-    and converting them into Pyramid-style API HTTP exceptions.
+    and converting them into Pyramid-style API HTTP exceptions. Calls are
+    timed as the ``view`` stage of the current request.
     """
 
     @functools.wraps(view_method)
     def wrapper(self, *args, **kwargs):
         try:
-            return view_method(self, *args, **kwargs)
+            with timing.stage('view'):
+                return view_method(self, *args, **kwargs)
 
         except (ValueError, json.JSONDecodeError):
             raise exceptions.APIDecodingError()
@@ -45,9 +48,170 @@ def managed_view(view_method):
             errors = err.to_dict()
             raise exceptions.APIValidationError(detail=errors)
 
+        except mongoengine.errors.SaveConditionError:
+            raise exceptions.APIPreconditionFailed()
+
+    return wrapper
+
+
+def cached_view(view_method):
+    """
+    Serves the results of a view method from the context's response cache (if
+    any). Only dictionary results are cached, so streamed responses and
+    exceptions are never stored. Cached results are shared between requests
+    and must not be modified.
+    """
+
+    @functools.wraps(view_method)
+    def wrapper(self, *args, **kwargs):
+        cache = self.context.cache
+        if cache is None:
+            return view_method(self, *args, **kwargs)
+        key = self.context.cache_key(
+            self.request.params, self.request.effective_principals)
+        result = cache.get(key)
+        if result is None:
+            result = view_method(self, *args, **kwargs)
+            if isinstance(result, dict):
+                cache.set(key, result, self.context.cache_ttl)
+        return result
+
     return wrapper
 
 
+def _parse_etags(header):
+    """
+    Parses an ``If-Match`` or ``If-None-Match`` header into a list of
+    two-tuples in the form of (``tag``, ``weak``). The wildcard ``*`` is
+    returned as an unquoted, strong tag.
+    """
+    etags = []
+    for value in (header or '').split(','):
+        value = value.strip()
+        weak = value.startswith('W/')
+        if weak:
+            value = value[2:]
+        if value:
+            etags.append((value.strip('"'), weak))
+    return etags
+
+
+def _payload_etag(payload):
+    """
+    Returns a strong entity tag for a serialized document (a hash of its
+    canonical JSON representation).
+    """
+    data = renderers.dumps(payload, sort_keys=True)
+    return hashlib.sha1(data).hexdigest()
+
+
+def _check_not_modified(request, etag):
+    """
+    Raises ``304 NOT MODIFIED`` if ``etag`` matches the ``If-None-Match``
+    header of ``request`` (using weak comparison).
+    """
+    header = request.headers.get('If-None-Match')
+    tags = {tag for tag, weak in _parse_etags(header)}
+    if etag in tags or '*' in tags:
+        headers = {'ETag': '"{}"'.format(etag)}
+        raise exceptions.APINotModified(headers=headers)
+
+
+def _version_etag(version, fields=None):
+    """
+    Returns a strong entity tag for a document version. Representations
+    limited to ``fields`` get their own tag (``version;hash``), which still
+    starts with the version they were serialized from.
+    """
+    if not fields:
+        return str(version)
+    digest = hashlib.sha1(','.join(fields).encode()).hexdigest()
+    return '{};{}'.format(version, digest[:16])
+
+
+def _bulk_error(error):
+    """
+    Converts the error for a single item of a bulk operation into an API
+    exception dictionary (matching the output of :class:`APIExceptionViews`).
+
+    :param error: A dictionary of marshmallow error messages, a
+        ``mongoengine`` exception or ``None`` if the item was skipped
+    :return dict: A serialized API exception
+    """
+    if error is None:
+        msg = 'Item was not processed because a previous item failed.'
+        exception = exceptions.APIBadRequest(detail={'_bulk': [msg]})
+    elif isinstance(error, dict):
+        exception = exceptions.APIValidationError(detail=error)
+    elif isinstance(error, mongoengine.ValidationError):
+        exception = exceptions.APIValidationError(detail=error.to_dict())
+    elif isinstance(error, mongoengine.NotUniqueError):
+        exception = exceptions.APINotUniqueError()
+    else:
+        exception = exceptions.APIInternalServerError()
+    return {
+        'code': exception.code,
+        'title': exception.title,
+        'explanation': exception.explanation,
+        'detail': exception.detail or {}
+    }
+
+
+# The number of documents serialized into each chunk of a streamed response:
+_STREAM_CHUNK_SIZE = 100
+
+# The media type of newline-delimited JSON responses:
+_NDJSON = 'application/x-ndjson'
+
+
+def _chunked(documents):
+    """
+    Groups an iterable of documents into lists of at most
+    ``_STREAM_CHUNK_SIZE`` items.
+    """
+    chunk = []
+    for doc in documents:
+        chunk.append(doc)
+        if len(chunk) >= _STREAM_CHUNK_SIZE:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def _json_stream(schm, documents, head, next_cursor):
+    """
+    Yields a JSON object in chunks: the fields of ``head``, the serialized
+    ``items`` and finally a ``next`` cursor, which is computed by calling
+    ``next_cursor`` with the last document and the number of documents.
+
+    :param schm: A schema used to serialize each document
+    :param documents: An iterable of documents
+    :param head: A non-empty dictionary of fields preceding ``items``
+    :param next_cursor: A callable returning the ``next`` cursor
+    """
+    yield renderers.dumps(head)[:-1] + b',"items":['
+    last, count, sep = None, 0, b''
+    for chunk in _chunked(documents):
+        items = (renderers.dumps(schm.dump(doc).data) for doc in chunk)
+        yield sep + b','.join(items)
+        last, count, sep = chunk[-1], count + len(chunk), b','
+    tail = renderers.dumps(next_cursor(last, count))
+    yield b'],"next":' + tail + b'}'
+
+
+def _ndjson_stream(schm, documents):
+    """
+    Yields serialized documents as newline-delimited JSON, in chunks.
+
+    :param schm: A schema used to serialize each document
+    :param documents: An iterable of documents
+    """
+    for chunk in _chunked(documents):
+        yield b''.join(
+            renderers.dumps(schm.dump(doc).data) + b'\n' for doc in chunk)
+
+
 @view_defaults(renderer='json')
 class APIExceptionViews(base.BaseView):
     """
@@ -58,6 +222,7 @@ class APIExceptionViews(base.BaseView):
     @notfound_view_config()
     @view_config(context=exc.HTTPBadRequest)
     @view_config(context=exceptions.APIConflict)
+    @view_config(context=exceptions.APIPreconditionFailed)
     def exception(self):
         self.request.response.status_code = self.context.code
 
@@ -98,7 +263,8 @@ class APIIndexViews(base.BaseView):
 class APICollectionViews(base.BaseView):
     """
     A base view class to CREATE and RETRIEVE documents from a MongoDB
-    collection using v.1 of the Stackcite API.
+    collection using v.1 of the Stackcite API. Also provides bulk UPDATE and
+    DELETE operations for documents matching a query.
 
     NOTE: Object serialization is handled by the traversal resource, not the
     view object. By the time the object is handled by the view object, it has
@@ -107,7 +273,9 @@ class APICollectionViews(base.BaseView):
 
     METHODS = {
         'POST': 'create',
-        'GET': 'retrieve'
+        'GET': 'retrieve',
+        'PUT': 'update',
+        'DELETE': 'delete'
     }
 
     @view_config(request_method='POST', permission='create')
@@ -115,36 +283,193 @@ class APICollectionViews(base.BaseView):
     def create(self):
         """CREATE a new document using JSON models from the request body.
 
+        If the request body is a JSON array, creates every valid document in a
+        single bulk operation (see :meth:`_create_many`).
+
         :return dict: A dictionary containing the new document's ``ObjectId``
         """
         data = self.request.json_body
-        schm = self.context.schema(strict=True, exclude=('limit', 'skip'))
+        if isinstance(data, list):
+            return self._create_many(data)
+        schm = self.context.schema(
+            strict=True, exclude=('limit', 'skip', 'count'),
+            method=self.request.method)
         data = schm.load(data).data
         doc = self.context.create(data)
         result = schm.dump(doc).data
         self.request.response.status = 201
         return result
 
+    def _create_many(self, data):
+        """
+        CREATE new documents from a list of JSON models. Items are validated
+        individually and valid items are written in a single bulk operation.
+        If the ``ordered`` query parameter is set, processing stops at the
+        first failed item.
+
+        Returns ``201 CREATED`` if every item was created, or ``207
+        MULTI-STATUS`` with per-item errors keyed by index otherwise.
+
+        :param data: A list of JSON models
+        :return dict: A dictionary of created documents and per-item errors
+        """
+        params = self.context.schema(strict=True)
+        ordered = params.load(self.request.params).data.get('ordered', False)
+        schm = self.context.schema(
+            exclude=('limit', 'skip', 'count'), method=self.request.method)
+        loaded, errors = schm.load(data, many=True)
+        # Errors not keyed by index (e.g. "_schema") apply to the whole list:
+        list_errors = {key: errors[key] for key in errors
+                       if not isinstance(key, int)}
+        errors = {idx: errors[idx] for idx in errors if isinstance(idx, int)}
+        valid = [idx for idx in range(len(data)) if idx not in errors]
+        if ordered and errors:
+            valid = [idx for idx in valid if idx < min(errors)]
+        results = self.context.create_many(
+            [loaded[idx] for idx in valid], ordered=ordered)
+        items = [None] * len(data)
+        for idx, result in zip(valid, results):
+            if isinstance(result, mongoengine.Document):
+                items[idx] = schm.dump(result).data
+            else:
+                errors[idx] = result
+        for idx in range(len(data)):
+            if items[idx] is None and idx not in errors:
+                errors[idx] = None
+        self.request.response.status = 207 if errors or list_errors else 201
+        result_errors = {idx: _bulk_error(err) for idx, err in errors.items()}
+        result_errors.update(
+            {key: _bulk_error({key: err}) for key, err in list_errors.items()})
+        return {
+            'count': len(data) - len(errors),
+            'items': items,
+            'errors': result_errors
+        }
+
     @view_config(request_method='GET', permission='retrieve')
     @managed_view
     def retrieve(self):
         """
         RETRIEVE a list of documents matching the provided query (if any).
 
+        If the ``stream`` query parameter is set, documents are streamed to
+        the client instead of being buffered (see :meth:`_stream`). Otherwise,
+        sets a strong ``ETag`` (a hash of the serialized page) and raises
+        ``304 NOT MODIFIED`` if it matches ``If-None-Match``.
+
         :return: A list of serialized documents matching query parameters (if any)
         """
+        result = self._retrieve()
+        if isinstance(result, dict):
+            etag = _payload_etag(result)
+            _check_not_modified(self.request, etag)
+            self.request.response.headers['ETag'] = '"{}"'.format(etag)
+        return result
+
+    @cached_view
+    def _retrieve(self):
         query = self.request.params
         schm = self.context.schema(strict=True)
         query = schm.load(query).data
         query, params = self.context.get_params(query)
+        count = params.pop('count')
+        if params.pop('stream'):
+            return self._stream(query, params, count)
         results = self.context.retrieve(query, **params)
-        schm.only = params.get('fields')
+        docs = list(results)
+        schm = self.context.schema(strict=True, only=params['fields'])
         return {
-            'count': results.count(),
+            'count': self.context.count(query, count),
             'limit': params['limit'],
             'skip': params['skip'],
-            'items': schm.dump(results, many=True).data
+            'next': self.context.next_cursor(
+                docs, params['limit'], query, params['sort']),
+            'items': schm.dump(docs, many=True).data
+        }
+
+    def _stream(self, query, params, count):
+        """
+        RETRIEVE a list of documents as a chunked response body. Documents are
+        read from the cursor and serialized in batches, so memory use does not
+        grow with ``limit``.
+
+        Returns the same JSON object as :meth:`retrieve` (with ``next`` after
+        ``items``), or newline-delimited JSON documents if the client accepts
+        ``application/x-ndjson``.
+
+        :return: A :class:`pyramid.response.Response` with a streaming body
+        """
+        limit, sort = params['limit'], params['sort']
+        documents = self.context.iterate(query, **params)
+        schm = self.context.schema(strict=True, only=params['fields'])
+        response = self.request.response
+        if _NDJSON in self.request.headers.get('Accept', ''):
+            response.content_type = _NDJSON
+            response.app_iter = _ndjson_stream(schm, documents)
+            return response
+
+        def next_cursor(last, total):
+            if total >= limit:
+                return self.context.next_cursor([last], 1, query, sort)
+
+        head = {
+            'count': self.context.count(query, count),
+            'limit': limit,
+            'skip': params['skip']
         }
+        response.content_type = 'application/json'
+        response.app_iter = _json_stream(schm, documents, head, next_cursor)
+        return response
+
+    @view_config(request_method='PUT', permission='update')
+    @managed_view
+    def update(self):
+        """
+        UPDATE every document matching the provided query (e.g. ``ids``) using
+        JSON models from the request body.
+
+        Raises ``400 BAD REQUEST`` if the query is empty or if there is some
+        other problem with the request (e.g. schema validation error).
+
+        :return: The number of ``matched`` and ``modified`` documents
+        """
+        query = self._bulk_query()
+        data = self.request.json_body
+        schm = self.context.schema(
+            strict=True, exclude=('limit', 'skip', 'count'),
+            method=self.request.method)
+        data = schm.load(data).data
+        return self.context.update_many(query, data)
+
+    @view_config(request_method='DELETE', permission='delete')
+    @managed_view
+    def delete(self):
+        """
+        DELETE every document matching the provided query (e.g. ``ids``).
+
+        Raises ``400 BAD REQUEST`` if the query is empty or fails schema
+        validation.
+
+        :return: The number of ``deleted`` documents
+        """
+        query = self._bulk_query()
+        return self.context.delete_many(query)
+
+    def _bulk_query(self):
+        """
+        Loads a validated query for a bulk operation from the request
+        parameters. Raises :class:`APIValidationError` if the query is empty,
+        since bulk operations never apply to an entire collection.
+        """
+        query = self.request.params
+        schm = self.context.schema(strict=True)
+        query = schm.load(query).data
+        query, params = self.context.get_params(query)
+        query.pop('ordered', None)
+        if not query:
+            msg = 'A query is required for bulk operations.'
+            raise exceptions.APIValidationError(detail={'query': [msg]})
+        return query
 
 
 @view_defaults(context=resources.APIDocumentResource, renderer='json')
@@ -165,17 +490,85 @@ class APIDocumentViews(base.BaseView):
     def retrieve(self):
         """RETRIEVE an individual document
 
+        Sets a strong ``ETag`` and raises ``304 NOT MODIFIED`` if it matches
+        ``If-None-Match``. If the collection has a version field, the ETag is
+        derived from the document's version, which is read with a projection
+        of the version field only, so unchanged documents are never loaded.
+        Changed documents are loaded without the response cache and tagged
+        with the version they were loaded at. Otherwise, the ETag is a hash
+        of the (possibly cached) serialized document.
+
         :return: A serialized version of the document
         """
         query = self.request.params
-        schm = self.context.schema(strict=True, exclude=('limit', 'skip'))
+        schm = self.context.schema(
+            strict=True, exclude=('limit', 'skip', 'count'))
         query = schm.load(query).data
         query, params = self.context.get_params(query)
-        doc = self.context.retrieve(**params)
-        schm.only = params.get('fields')
-        result = schm.dump(doc).data
+        if self.context.version_field:
+            etag = _version_etag(self.context.version(), params['fields'])
+            _check_not_modified(self.request, etag)
+            result, version = self._retrieve_version(params)
+            etag = _version_etag(version, params['fields'])
+        else:
+            result = self._retrieve(params)
+            etag = _payload_etag(result)
+            _check_not_modified(self.request, etag)
+        self.request.response.headers['ETag'] = '"{}"'.format(etag)
         return result
 
+    @cached_view
+    def _retrieve(self, params):
+        doc = self.context.retrieve(**params)
+        schm = self.context.schema(
+            strict=True, exclude=('limit', 'skip', 'count'),
+            only=params['fields'])
+        return schm.dump(doc).data
+
+    def _retrieve_version(self, params):
+        """
+        Retrieves and serializes the document along with the value of its
+        version field, so that its ETag always matches the returned body.
+
+        :return: A two-tuple in the form of (``result``, ``version``)
+        """
+        field = self.context.version_field
+        fields = params['fields']
+        doc = self.context.retrieve(
+            **dict(params, fields=tuple(fields) + (field,) if fields else ()))
+        version = doc[field] if isinstance(doc, dict) else getattr(doc, field)
+        schm = self.context.schema(
+            strict=True, exclude=('limit', 'skip', 'count'), only=fields)
+        return schm.dump(doc).data, version
+
+    def _check_precondition(self):
+        """
+        Evaluates ``If-Match`` (using strong comparison) against the current
+        document. Raises ``412 PRECONDITION FAILED`` if no tag matches.
+
+        Any tag of the current version matches and the matched version is
+        returned, so the write is conditional on it. Only collections with a
+        version field (see ``_VERSION_FIELD``) can make writes conditional,
+        so other collections raise ``412 PRECONDITION FAILED`` for any tag
+        but ``*`` (writes to missing documents fail anyway).
+
+        :return: The expected document version or ``None``
+        """
+        header = self.request.headers.get('If-Match')
+        if not header:
+            return None
+        tags = {tag for tag, weak in _parse_etags(header) if not weak}
+        if not self.context.version_field:
+            if '*' in tags:
+                return None
+            msg = 'If-Match requires a version field on this collection.'
+            raise exceptions.APIPreconditionFailed(detail=msg)
+        version = self.context.version()
+        versions = {tag.split(';')[0] for tag in tags}
+        if '*' in tags or str(version) in versions:
+            return version
+        raise exceptions.APIPreconditionFailed()
+
     @view_config(request_method='PUT', permission='update')
     @managed_view
     def update(self):
@@ -186,13 +579,26 @@ class APIDocumentViews(base.BaseView):
         REQUEST`` if there is some other problem with the request (e.g. schema
         validation error).
 
+        If ``If-Match`` is set, raises ``412 PRECONDITION FAILED`` unless it
+        matches the document's current ETag (see :meth:`retrieve`), which
+        requires a version field (see :meth:`_check_precondition`).
+
         :return: A serialized version of the updated document
         """
         data = self.request.json_body
-        schm = self.context.schema(strict=True, exclude=('limit', 'skip'))
+        schm = self.context.schema(
+            strict=True, exclude=('limit', 'skip', 'count'),
+            method=self.request.method)
         data = schm.load(data).data
-        result = self.context.update(data)
-        result = schm.dump(result).data
+        version = self._check_precondition()
+        doc = self.context.update(data, version=version)
+        result = schm.dump(doc).data
+        field = self.context.version_field
+        if field:
+            etag = _version_etag(getattr(doc, field))
+        else:
+            etag = _payload_etag(result)
+        self.request.response.headers['ETag'] = '"{}"'.format(etag)
         return result
 
     @view_config(request_method='DELETE', permission='delete')
@@ -202,7 +608,11 @@ class APIDocumentViews(base.BaseView):
         DELETE an individual document.
 
         Raises ``204 NO CONTENT`` if successful or ``404 NOT FOUND`` if
-        document does not exist.
+        document does not exist. If ``If-Match`` is set, raises ``412
+        PRECONDITION FAILED`` unless it matches the document's current ETag
+        (see :meth:`retrieve`), which requires a version field (see
+        :meth:`_check_precondition`).
         """
-        self.context.delete()
+        version = self._check_precondition()
+        self.context.delete(version=version)
         raise exceptions.APINoContent()
@@ -178,6 +178,17 @@ class APICollectionViewsCreateTestCase(APICollectionViewsIntegrationTestCase):
         with self.assertRaises(APIBadRequest):
             view.create()
 
+    def test_create_enforces_post_required_fields(self):
+        """APICollectionViews.create() raises 400 BAD REQUEST if a POST is missing required fields
+        """
+        view = self.make_view()
+        view.request.method = 'POST'
+        view.request.json_body = {'number': 1}
+        from stackcite.api.exceptions import APIBadRequest
+        with self.assertRaises(APIBadRequest):
+            view.create()
+        self.assertEqual(0, testing.mock.MockDocument.objects.count())
+
     def test_create_serializes_new_document(self):
         """APICollectionViews.create() serializes new document
         """
@@ -192,6 +203,95 @@ class APICollectionViewsCreateTestCase(APICollectionViewsIntegrationTestCase):
         self.assertDictEqual(data, result)
 
 
+class APICollectionViewsBulkCreateTestCase(
+        APICollectionViewsIntegrationTestCase):
+
+    def test_create_list_creates_new_documents(self):
+        """APICollectionViews.create() saves a new MockDocument for each item in a list
+        """
+        view = self.make_view()
+        view.request.json_body = [
+            {'name': 'Document #{}'.format(n)} for n in range(8)]
+        result = view.create()
+        self.assertEqual(8, result['count'])
+        self.assertEqual(8, testing.mock.MockDocument.objects.count())
+        for item in result['items']:
+            doc = testing.mock.MockDocument.objects.get(id=item['id'])
+            self.assertEqual(doc.name, item['name'])
+
+    def test_create_list_returns_201_CREATED(self):
+        """APICollectionViews.create() returns 201 CREATED if every item is created
+        """
+        view = self.make_view()
+        view.request.json_body = [{'name': 'Document #0'}]
+        view.create()
+        result = view.request.response.status_code
+        self.assertEqual(result, 201)
+
+    def test_create_list_returns_errors_by_index(self):
+        """APICollectionViews.create() returns 207 MULTI-STATUS with errors for failed items
+        """
+        testing.mock.utils.create_mock_data(2, save=True)
+        view = self.make_view()
+        view.request.json_body = [
+            {'name': 'New Document'},
+            {'number': 'cats'},
+            {'name': 'Document #1'}]
+        result = view.create()
+        self.assertEqual(207, view.request.response.status_code)
+        self.assertEqual(1, result['count'])
+        self.assertIsNone(result['items'][1])
+        self.assertEqual(400, result['errors'][1]['code'])
+        self.assertEqual(409, result['errors'][2]['code'])
+        self.assertNotIn(0, result['errors'])
+
+    def test_create_list_enforces_post_required_fields(self):
+        """APICollectionViews.create() returns errors for items of a POST missing required fields
+        """
+        view = self.make_view()
+        view.request.method = 'POST'
+        view.request.json_body = [{'name': 'Document #0'}, {'number': 1}]
+        result = view.create()
+        self.assertEqual(1, result['count'])
+        self.assertEqual(400, result['errors'][1]['code'])
+
+    def test_create_list_returns_list_level_errors(self):
+        """APICollectionViews.create() returns errors that are not keyed by index
+        """
+        from unittest.mock import patch
+        schm = testing.mock.MockDocumentSchema
+        load = schm.load
+
+        def load_with_schema_error(self, data, *args, **kwargs):
+            result = load(self, data, *args, **kwargs)
+            if kwargs.get('many'):
+                result.errors['_schema'] = ['Invalid list.']
+            return result
+
+        view = self.make_view()
+        view.request.json_body = [{'name': 'Document #0'}]
+        with patch.object(schm, 'load', load_with_schema_error):
+            result = view.create()
+        self.assertEqual(207, view.request.response.status_code)
+        error = result['errors']['_schema']
+        self.assertEqual(400, error['code'])
+        self.assertEqual({'_schema': ['Invalid list.']}, error['detail'])
+
+    def test_create_list_ordered_skips_items_after_failure(self):
+        """APICollectionViews.create() skips items after the first failure if ordered
+        """
+        view = self.make_view()
+        view.request.params = {'ordered': 'true'}
+        view.request.json_body = [
+            {'name': 'Document #0'},
+            {'number': 'cats'},
+            {'name': 'Document #2'}]
+        result = view.create()
+        self.assertEqual(1, result['count'])
+        self.assertIn(2, result['errors'])
+        self.assertEqual(1, testing.mock.MockDocument.objects.count())
+
+
 class APICollectionViewsRetrieveTestCase(APICollectionViewsIntegrationTestCase):
 
     def test_retrieve_gets_all_documents(self):
@@ -247,6 +347,199 @@ class APICollectionViewsRetrieveTestCase(APICollectionViewsIntegrationTestCase):
             result = [x for x in document_data.keys()]
             self.assertCountEqual(expected, result)
 
+    def test_retrieve_next_cursor_pages_through_documents(self):
+        """APICollectionViews.retrieve() returns a `next` cursor for the following page
+        """
+        docs = testing.mock.utils.create_mock_data(save=True)
+        view = self.make_view()
+        view.request.params = {'limit': '10'}
+        first_page = view.retrieve()
+        view = self.make_view()
+        view.request.params = {'limit': '10', 'after': first_page['next']}
+        second_page = view.retrieve()
+        results = [d['name'] for d in first_page['items'] + second_page['items']]
+        expected = [d.name for d in docs]
+        self.assertEqual(expected, results)
+        self.assertIsNone(second_page['next'])
+
+    def test_retrieve_sort_pages_through_sorted_documents(self):
+        """APICollectionViews.retrieve() sorts documents and returns a matching `next` cursor
+        """
+        docs = testing.mock.utils.create_mock_data(save=True)
+        view = self.make_view()
+        view.request.params = {'limit': '10', 'sort': '-name'}
+        first_page = view.retrieve()
+        view = self.make_view()
+        view.request.params = {
+            'limit': '10', 'sort': '-name', 'after': first_page['next']}
+        second_page = view.retrieve()
+        results = [d['name'] for d in first_page['items'] + second_page['items']]
+        expected = sorted((d.name for d in docs), reverse=True)
+        self.assertEqual(expected, results)
+        self.assertIsNone(second_page['next'])
+
+    def test_retrieve_sort_pages_through_fields_without_sort_key(self):
+        """APICollectionViews.retrieve() pages through sorted documents if `fields` excludes the sort key
+        """
+        docs = testing.mock.utils.create_mock_data(save=True)
+        params = {'limit': '3', 'sort': '-name', 'fields': 'id,number'}
+        results, after = [], None
+        while True:
+            view = self.make_view()
+            view.request.params = dict(params, after=after) if after else params
+            page = view.retrieve()
+            results.extend(page['items'])
+            after = page['next']
+            if not after:
+                break
+        expected = [str(d.id) for d in
+                    sorted(docs, key=lambda d: d.name, reverse=True)]
+        self.assertEqual(expected, [d['id'] for d in results])
+        self.assertCountEqual(['id', 'number'], results[0])
+
+    def test_retrieve_sets_payload_etag(self):
+        """APICollectionViews.retrieve() sets a strong ETag that changes with the results
+        """
+        docs = testing.mock.utils.create_mock_data(2, save=True)
+        view = self.make_view()
+        view.retrieve()
+        etag = view.request.response.headers['ETag']
+        self.assertTrue(etag.startswith('"'))
+        docs[0].update(set__name='Changed')
+        view = self.make_view()
+        view.retrieve()
+        self.assertNotEqual(etag, view.request.response.headers['ETag'])
+
+    def test_retrieve_matching_etag_raises_304_NOT_MODIFIED(self):
+        """APICollectionViews.retrieve() raises 304 NOT MODIFIED if If-None-Match matches
+        """
+        testing.mock.utils.create_mock_data(2, save=True)
+        view = self.make_view()
+        view.retrieve()
+        etag = view.request.response.headers['ETag']
+        view = self.make_view()
+        view.request.headers['If-None-Match'] = etag
+        from stackcite.api.exceptions import APINotModified
+        with self.assertRaises(APINotModified):
+            view.retrieve()
+
+    def test_retrieve_invalid_sort_raises_400_BAD_REQUEST(self):
+        """APICollectionViews.retrieve() raises 400 BAD REQUEST for keys that cannot be sorted by
+        """
+        view = self.make_view()
+        view.request.params = {'sort': 'fact'}
+        from stackcite.api.exceptions import APIValidationError
+        with self.assertRaises(APIValidationError):
+            view.retrieve()
+
+    def test_retrieve_q_searches_text(self):
+        """APICollectionViews.retrieve() returns documents matching `q` without a `next` cursor
+        """
+        from stackcite.api import search
+        search.invalidate(testing.mock.MockDocument)
+        testing.mock.utils.create_mock_data(save=True)
+        testing.mock.MockDocument(name='Some notes').save()
+        view = self.make_view()
+        view.context._TEXT_SEARCH = 'local'
+        view.request.params = {'q': 'notes', 'limit': '1'}
+        result = view.retrieve()
+        self.assertEqual(1, result['count'])
+        self.assertEqual(['Some notes'], [d['name'] for d in result['items']])
+        self.assertIsNone(result['next'])
+
+    def test_retrieve_filters_with_query_operators(self):
+        """APICollectionViews.retrieve() filters documents with query operators
+        """
+        testing.mock.utils.create_mock_data(save=True)
+        view = self.make_view()
+        view.request.params = {
+            'name__in': 'Document #2,Document #5', 'name__prefix': 'Doc'}
+        result = view.retrieve()
+        names = sorted(d['name'] for d in result['items'])
+        self.assertEqual(['Document #2', 'Document #5'], names)
+
+    def test_retrieve_unindexed_operator_raises_400_BAD_REQUEST(self):
+        """APICollectionViews.retrieve() raises 400 BAD REQUEST for operators on unindexed fields
+        """
+        view = self.make_view()
+        view.request.params = {'number__gt': '3'}
+        from stackcite.api.exceptions import APIValidationError
+        with self.assertRaises(APIValidationError):
+            view.retrieve()
+
+    def test_retrieve_q_with_cursor_raises_400_BAD_REQUEST(self):
+        """APICollectionViews.retrieve() raises 400 BAD REQUEST for `q` with an `after` cursor
+        """
+        from bson import ObjectId
+        from stackcite.api import utils
+        view = self.make_view()
+        view.request.params = {
+            'q': 'notes', 'after': utils.encode_cursor([ObjectId()])}
+        from stackcite.api.exceptions import APIBadRequest
+        with self.assertRaises(APIBadRequest):
+            view.retrieve()
+
+    def test_retrieve_invalid_cursor_raises_400_BAD_REQUEST(self):
+        """APICollectionViews.retrieve() raises 400 BAD REQUEST for an invalid `after` cursor
+        """
+        view = self.make_view()
+        view.request.params = {'after': 'invalid_cursor'}
+        from stackcite.api.exceptions import APIBadRequest
+        with self.assertRaises(APIBadRequest):
+            view.retrieve()
+
+    def test_retrieve_tampered_cursor_raises_400_BAD_REQUEST(self):
+        """APICollectionViews.retrieve() raises 400 BAD REQUEST for a cursor with operators
+        """
+        from stackcite.api import utils
+        testing.mock.utils.create_mock_data(save=True)
+        view = self.make_view()
+        view.request.params = {
+            'sort': 'name', 'after': utils.encode_cursor(
+                [{'$ne': None}, {'$exists': True}])}
+        from stackcite.api.exceptions import APIBadRequest
+        with self.assertRaises(APIBadRequest):
+            view.retrieve()
+
+    def test_retrieve_counts_all_matching_documents(self):
+        """APICollectionViews.retrieve() counts all matching documents by default
+        """
+        testing.mock.utils.create_mock_data(save=True)
+        view = self.make_view()
+        view.request.params = {'limit': '4', 'fact': 'true'}
+        result = view.retrieve()['count']
+        self.assertEqual(8, result)
+
+    def test_retrieve_skips_count_if_mode_is_none(self):
+        """APICollectionViews.retrieve() does not count documents if count is 'none'
+        """
+        testing.mock.utils.create_mock_data(save=True)
+        view = self.make_view()
+        view.request.params = {'count': 'none'}
+        result = view.retrieve()['count']
+        self.assertIsNone(result)
+
+    def test_retrieve_raw_reads_match_document_reads(self):
+        """APICollectionViews.retrieve() serializes raw reads like documents
+        """
+        testing.mock.utils.create_mock_data(save=True)
+        view = self.make_view()
+        view.request.params = {'fields': 'id,name,number,fact'}
+        expected = view.retrieve()
+        view.context._RAW_READS = True
+        result = view.retrieve()
+        self.assertEqual(expected, result)
+
+    def test_retrieve_invalid_fields_raises_400_BAD_REQUEST(self):
+        """APICollectionViews.retrieve() raises 400 BAD REQUEST for unknown field names
+        """
+        testing.mock.utils.create_mock_data(save=True)
+        view = self.make_view()
+        view.request.params = {'fields': 'id,unknown'}
+        from stackcite.api.exceptions import APIBadRequest
+        with self.assertRaises(APIBadRequest):
+            view.retrieve()
+
     def test_retrieve_returns_200_OK(self):
         """APICollectionViews.retrieve() returns 200 OK if documents exist
         """
@@ -279,6 +572,182 @@ class APICollectionViewsRetrieveTestCase(APICollectionViewsIntegrationTestCase):
             view.retrieve()
 
 
+class APICollectionViewsStreamTestCase(APICollectionViewsIntegrationTestCase):
+
+    def stream(self, params, headers=None):
+        view = self.make_view()
+        view.request.params = params
+        view.request.headers.update(headers or {})
+        response = view.retrieve()
+        return response, b''.join(response.app_iter).decode()
+
+    def test_stream_returns_same_body_as_retrieve(self):
+        """APICollectionViews.retrieve() streams the same JSON object if `stream` is set
+        """
+        testing.mock.utils.create_mock_data(save=True)
+        view = self.make_view()
+        view.request.params = {'limit': '10'}
+        expected = view.retrieve()
+        response, body = self.stream({'limit': '10', 'stream': 'true'})
+        import json
+        self.assertEqual(expected, json.loads(body))
+        self.assertEqual('application/json', response.content_type)
+
+    def test_stream_returns_items_across_chunks(self):
+        """APICollectionViews.retrieve() streams every document if there are several chunks
+        """
+        docs = testing.mock.utils.create_mock_data(save=True)
+        from .. import api
+        chunk_size = api._STREAM_CHUNK_SIZE
+        api._STREAM_CHUNK_SIZE = 3
+        try:
+            response, body = self.stream({'stream': 'true'})
+        finally:
+            api._STREAM_CHUNK_SIZE = chunk_size
+        import json
+        result = [item['name'] for item in json.loads(body)['items']]
+        self.assertEqual([doc.name for doc in docs], result)
+
+    def test_stream_returns_empty_list_if_nothing_found(self):
+        """APICollectionViews.retrieve() streams an empty list if there are no results
+        """
+        response, body = self.stream({'stream': 'true'})
+        import json
+        result = json.loads(body)
+        self.assertEqual([], result['items'])
+        self.assertIsNone(result['next'])
+
+    def test_stream_returns_ndjson_if_accepted(self):
+        """APICollectionViews.retrieve() streams newline-delimited JSON if the client accepts it
+        """
+        docs = testing.mock.utils.create_mock_data(save=True)
+        response, body = self.stream(
+            {'stream': 'true', 'fields': 'name'},
+            {'Accept': 'application/x-ndjson'})
+        import json
+        results = [json.loads(line) for line in body.splitlines()]
+        self.assertEqual([doc.name for doc in docs],
+                         [result['name'] for result in results])
+        for result in results:
+            self.assertCountEqual(['name'], result.keys())
+        self.assertEqual('application/x-ndjson', response.content_type)
+
+
+class APICollectionViewsCacheTestCase(APICollectionViewsIntegrationTestCase):
+
+    def make_view(self, name=None):
+        view = super().make_view(name)
+        view.context._CACHE = self.cache
+        view.request.params = {}
+        return view
+
+    def setUp(self):
+        from stackcite.api.cache import MemoryCache
+        self.cache = MemoryCache()
+        super().setUp()
+
+    def test_retrieve_serves_cached_results(self):
+        """APICollectionViews.retrieve() serves cached results for the same query
+        """
+        testing.mock.utils.create_mock_data(4, save=True)
+        expected = self.make_view().retrieve()
+        testing.mock.MockDocument(name='Uncached').save()
+        result = self.make_view().retrieve()
+        self.assertEqual(expected, result)
+
+    def test_retrieve_caches_each_query(self):
+        """APICollectionViews.retrieve() caches results separately for each query
+        """
+        testing.mock.utils.create_mock_data(4, save=True)
+        self.make_view().retrieve()
+        view = self.make_view()
+        view.request.params = {'limit': '2'}
+        result = view.retrieve()
+        self.assertEqual(2, len(result['items']))
+
+    def test_create_invalidates_cached_results(self):
+        """APICollectionViews.create() invalidates cached results
+        """
+        testing.mock.utils.create_mock_data(4, save=True)
+        self.make_view().retrieve()
+        view = self.make_view()
+        view.request.json_body = {'name': 'New document'}
+        view.create()
+        result = self.make_view().retrieve()
+        self.assertEqual(5, result['count'])
+
+    def test_stream_is_not_cached(self):
+        """APICollectionViews.retrieve() does not cache streamed responses
+        """
+        view = self.make_view()
+        view.request.params = {'stream': 'true'}
+        view.retrieve()
+        self.assertEqual(0, len(self.cache))
+
+
+class APICollectionViewsBulkUpdateTestCase(
+        APICollectionViewsIntegrationTestCase):
+
+    def test_update_changes_matching_documents(self):
+        """APICollectionViews.update() changes documents listed in ids
+        """
+        docs = testing.mock.utils.create_mock_data(save=True)
+        view = self.make_view()
+        view.request.params = {'ids': ','.join(str(d.id) for d in docs[:4])}
+        view.request.json_body = {'number': 42}
+        result = view.update()
+        self.assertEqual(4, result['matched'])
+        self.assertEqual(4, result['modified'])
+        for doc in docs[:4]:
+            doc.reload()
+            self.assertEqual(42, doc.number)
+
+    def test_update_without_query_raises_400_BAD_REQUEST(self):
+        """APICollectionViews.update() raises 400 BAD REQUEST without a query
+        """
+        testing.mock.utils.create_mock_data(save=True)
+        view = self.make_view()
+        view.request.json_body = {'number': 42}
+        from stackcite.api.exceptions import APIBadRequest
+        with self.assertRaises(APIBadRequest):
+            view.update()
+
+    def test_update_invalid_data_raises_400_BAD_REQUEST(self):
+        """APICollectionViews.update() raises 400 BAD REQUEST if models fails validation
+        """
+        testing.mock.utils.create_mock_data(save=True)
+        view = self.make_view()
+        view.request.params = {'fact': 'true'}
+        view.request.json_body = {'number': 'cats'}
+        from stackcite.api.exceptions import APIBadRequest
+        with self.assertRaises(APIBadRequest):
+            view.update()
+
+
+class APICollectionViewsBulkDeleteTestCase(
+        APICollectionViewsIntegrationTestCase):
+
+    def test_delete_deletes_matching_documents(self):
+        """APICollectionViews.delete() deletes documents listed in ids
+        """
+        docs = testing.mock.utils.create_mock_data(save=True)
+        view = self.make_view()
+        view.request.params = {'ids': ','.join(str(d.id) for d in docs[:4])}
+        result = view.delete()
+        self.assertEqual({'deleted': 4}, result)
+        self.assertEqual(12, testing.mock.MockDocument.objects.count())
+
+    def test_delete_without_query_raises_400_BAD_REQUEST(self):
+        """APICollectionViews.delete() raises 400 BAD REQUEST without a query
+        """
+        testing.mock.utils.create_mock_data(save=True)
+        view = self.make_view()
+        from stackcite.api.exceptions import APIBadRequest
+        with self.assertRaises(APIBadRequest):
+            view.delete()
+        self.assertEqual(16, testing.mock.MockDocument.objects.count())
+
+
 class APIDocumentViewsIntegrationTestCase(
         APIViewsIntegrationTestCase,
         testing.views.DocumentViewTestCase):
@@ -325,6 +794,17 @@ class APIDocumentViewsRetrieveTestCase(APIDocumentViewsIntegrationTestCase):
             result = [x for x in query_result.keys()]
             self.assertCountEqual(expected, result)
 
+    def test_retrieve_raw_reads_match_document_reads(self):
+        """APIDocumentViews.retrieve() serializes raw reads like documents
+        """
+        doc = testing.mock.utils.create_mock_data(1, save=True)[0]
+        view = self.make_view(doc.id)
+        view.request.params = {'fields': 'id,name,number,fact'}
+        expected = view.retrieve()
+        view.context.parent._RAW_READS = True
+        result = view.retrieve()
+        self.assertEqual(expected, result)
+
     def test_existing_person_returns_200_OK(self):
         """APIDocumentViews.retrieve() returns 200 OK if found
         """
@@ -351,6 +831,220 @@ class APIDocumentViewsRetrieveTestCase(APIDocumentViewsIntegrationTestCase):
             view.retrieve()
 
 
+class APIDocumentViewsCacheTestCase(APIDocumentViewsIntegrationTestCase):
+
+    def make_view(self, object_id=None, name='documents'):
+        view = super().make_view(object_id, name)
+        view.context.parent._CACHE = self.cache
+        view.request.params = {}
+        return view
+
+    def setUp(self):
+        from stackcite.api.cache import MemoryCache
+        self.cache = MemoryCache()
+        super().setUp()
+
+    def test_retrieve_serves_cached_results(self):
+        """APIDocumentViews.retrieve() serves cached results for the same document
+        """
+        doc = testing.mock.utils.create_mock_data(1, save=True)[0]
+        expected = self.make_view(doc.id).retrieve()
+        testing.mock.MockDocument.objects(id=doc.id).update(set__number=-1)
+        result = self.make_view(doc.id).retrieve()
+        self.assertEqual(expected, result)
+
+    def test_retrieve_version_etag_matches_loaded_document(self):
+        """APIDocumentViews.retrieve() does not pair cached results with a newer version ETag
+        """
+        doc = testing.mock.utils.create_mock_data(1, save=True)[0]
+        view = self.make_view(doc.id)
+        view.context.parent._VERSION_FIELD = 'number'
+        view.retrieve()
+        testing.mock.MockDocument.objects(id=doc.id).update(
+            set__name='Changed', inc__number=1)
+        view = self.make_view(doc.id)
+        view.context.parent._VERSION_FIELD = 'number'
+        result = view.retrieve()
+        self.assertEqual('Changed', result['name'])
+        expected = '"{}"'.format(doc.number + 1)
+        self.assertEqual(expected, view.request.response.headers['ETag'])
+
+    def test_update_invalidates_cached_results(self):
+        """APIDocumentViews.update() invalidates cached results
+        """
+        doc = testing.mock.utils.create_mock_data(1, save=True)[0]
+        self.make_view(doc.id).retrieve()
+        view = self.make_view(doc.id)
+        view.request.json_body = {'number': -1}
+        view.update()
+        result = self.make_view(doc.id).retrieve()
+        self.assertEqual(-1, result['number'])
+
+    def test_delete_invalidates_cached_results(self):
+        """APIDocumentViews.delete() invalidates cached results
+        """
+        doc = testing.mock.utils.create_mock_data(1, save=True)[0]
+        self.make_view(doc.id).retrieve()
+        from stackcite.api import exceptions
+        with self.assertRaises(exceptions.APINoContent):
+            self.make_view(doc.id).delete()
+        with self.assertRaises(exceptions.APINotFound):
+            self.make_view(doc.id).retrieve()
+
+
+class APIDocumentViewsETagTestCase(APIDocumentViewsIntegrationTestCase):
+
+    def make_view(self, object_id=None, name='documents', headers=None):
+        view = super().make_view(object_id, name)
+        view.request.params = {}
+        view.request.headers.update(headers or {})
+        return view
+
+    def setUp(self):
+        super().setUp()
+        self.doc = testing.mock.utils.create_mock_data(1, save=True)[0]
+
+    def test_retrieve_sets_strong_etag(self):
+        """APIDocumentViews.retrieve() sets a strong ETag
+        """
+        view = self.make_view(self.doc.id)
+        view.retrieve()
+        etag = view.request.response.headers['ETag']
+        self.assertTrue(etag.startswith('"'))
+
+    def test_retrieve_matching_etag_raises_304_NOT_MODIFIED(self):
+        """APIDocumentViews.retrieve() raises 304 NOT MODIFIED if If-None-Match matches
+        """
+        view = self.make_view(self.doc.id)
+        view.retrieve()
+        etag = view.request.response.headers['ETag']
+        view = self.make_view(self.doc.id, headers={'If-None-Match': etag})
+        from stackcite.api.exceptions import APINotModified
+        with self.assertRaises(APINotModified):
+            view.retrieve()
+
+    def test_retrieve_changed_document_returns_document(self):
+        """APIDocumentViews.retrieve() returns the document if it changed since If-None-Match
+        """
+        view = self.make_view(self.doc.id)
+        view.retrieve()
+        etag = view.request.response.headers['ETag']
+        self.doc.update(set__name='Changed')
+        view = self.make_view(self.doc.id, headers={'If-None-Match': etag})
+        result = view.retrieve()
+        self.assertEqual('Changed', result['name'])
+        self.assertNotEqual(etag, view.request.response.headers['ETag'])
+
+    def test_retrieve_version_etag_does_not_load_document(self):
+        """APIDocumentViews.retrieve() answers If-None-Match from the version field without loading the document
+        """
+        view = self.make_view(self.doc.id)
+        view.context.parent._VERSION_FIELD = 'number'
+        etag = '"{}"'.format(self.doc.number)
+        view.request.headers['If-None-Match'] = etag
+        from unittest import mock
+        from stackcite.api.exceptions import APINotModified
+        with mock.patch.object(view.context, 'retrieve') as retrieve:
+            with self.assertRaises(APINotModified):
+                view.retrieve()
+        retrieve.assert_not_called()
+
+    def test_retrieve_version_etag_varies_by_fields(self):
+        """APIDocumentViews.retrieve() sets different version ETags for different fields
+        """
+        view = self.make_view(self.doc.id)
+        view.context.parent._VERSION_FIELD = 'number'
+        view.retrieve()
+        etag = view.request.response.headers['ETag']
+        view = self.make_view(self.doc.id)
+        view.context.parent._VERSION_FIELD = 'number'
+        view.request.params = {'fields': 'name'}
+        view.retrieve()
+        self.assertNotEqual(etag, view.request.response.headers['ETag'])
+
+    def test_update_many_changes_version_etag(self):
+        """APIDocumentViews.retrieve() sets a new version ETag after a bulk update
+        """
+        view = self.make_view(self.doc.id)
+        view.context.parent._VERSION_FIELD = 'number'
+        view.retrieve()
+        etag = view.request.response.headers['ETag']
+        view.context.parent.update_many({}, {'name': 'Changed'})
+        view = self.make_view(self.doc.id, headers={'If-None-Match': etag})
+        view.context.parent._VERSION_FIELD = 'number'
+        result = view.retrieve()
+        self.assertEqual('Changed', result['name'])
+        self.assertNotEqual(etag, view.request.response.headers['ETag'])
+
+    def test_update_mismatched_etag_raises_412_PRECONDITION_FAILED(self):
+        """APIDocumentViews.update() raises 412 PRECONDITION FAILED if If-Match does not match
+        """
+        view = self.make_view(self.doc.id, headers={'If-Match': '"stale"'})
+        view.request.json_body = {'name': 'Changed'}
+        from stackcite.api.exceptions import APIPreconditionFailed
+        with self.assertRaises(APIPreconditionFailed):
+            view.update()
+        self.doc.reload()
+        self.assertNotEqual('Changed', self.doc.name)
+
+    def test_update_matching_etag_updates_document(self):
+        """APIDocumentViews.update() updates the document if If-Match matches
+        """
+        view = self.make_view(self.doc.id)
+        view.context.parent._VERSION_FIELD = 'number'
+        view.retrieve()
+        etag = view.request.response.headers['ETag']
+        view = self.make_view(self.doc.id, headers={'If-Match': etag})
+        view.context.parent._VERSION_FIELD = 'number'
+        view.request.json_body = {'name': 'Changed'}
+        result = view.update()
+        self.assertEqual('Changed', result['name'])
+        self.assertNotEqual(etag, view.request.response.headers['ETag'])
+
+    def test_update_etag_without_version_raises_412_PRECONDITION_FAILED(self):
+        """APIDocumentViews.update() raises 412 PRECONDITION FAILED for If-Match tags without a version field
+        """
+        view = self.make_view(self.doc.id)
+        view.retrieve()
+        etag = view.request.response.headers['ETag']
+        view = self.make_view(self.doc.id, headers={'If-Match': etag})
+        view.request.json_body = {'name': 'Changed'}
+        from stackcite.api.exceptions import APIPreconditionFailed
+        with self.assertRaises(APIPreconditionFailed):
+            view.update()
+        self.doc.reload()
+        self.assertNotEqual('Changed', self.doc.name)
+
+    def test_update_wildcard_etag_without_version_updates_document(self):
+        """APIDocumentViews.update() updates the document for If-Match: * without a version field
+        """
+        view = self.make_view(self.doc.id, headers={'If-Match': '*'})
+        view.request.json_body = {'name': 'Changed'}
+        result = view.update()
+        self.assertEqual('Changed', result['name'])
+
+    def test_update_version_etag_increments_version(self):
+        """APIDocumentViews.update() increments the version if If-Match matches the version ETag
+        """
+        etag = '"{}"'.format(self.doc.number)
+        view = self.make_view(self.doc.id, headers={'If-Match': etag})
+        view.context.parent._VERSION_FIELD = 'number'
+        view.request.json_body = {'name': 'Changed'}
+        view.update()
+        expected = '"{}"'.format(self.doc.number + 1)
+        self.assertEqual(expected, view.request.response.headers['ETag'])
+
+    def test_delete_mismatched_etag_raises_412_PRECONDITION_FAILED(self):
+        """APIDocumentViews.delete() raises 412 PRECONDITION FAILED if If-Match does not match
+        """
+        view = self.make_view(self.doc.id, headers={'If-Match': '"stale"'})
+        view.context.parent._VERSION_FIELD = 'number'
+        from stackcite.api.exceptions import APIPreconditionFailed
+        with self.assertRaises(APIPreconditionFailed):
+            view.delete()
+        self.assertEqual(1, testing.mock.MockDocument.objects.count())
+
+
 class APIDocumentViewsUpdateTestCase(APIDocumentViewsIntegrationTestCase):
 
     def test_update_returns_changes(self):